@@ -18,6 +18,7 @@ import { Toaster } from './components/ui/sonner';
 import { toast } from 'sonner';
 import { Menu, Bot, Bell } from 'lucide-react';
 import { AiPreviewDialog } from './components/AiPreviewDialog';
+import { authHeaders, withAccessToken } from './utils/auth';
 import { fetchAiEventPreview } from './utils/notificationApi';
 
 interface Event {
@@ -59,6 +60,14 @@ interface Notification {
   created_at: string;
 }
 
+interface NotificationHandlers {
+  onSnapshot: (notifications: Notification[]) => void;
+  onEvent: (event: string, data: any) => void;
+}
+
+// 서버가 밀어주는 알림 종류 (backend_new.py notification_hub.publish)
+const NOTIFICATION_EVENTS = ['calendar_invite', 'invitation_resolved', 'invitation_response', 'friend_request'];
+
 type AuthView = 'login' | 'signup' | 'regular-signup';
 
 export default function App() {
@@ -92,7 +101,7 @@ export default function App() {
   async function apiLogout() {
     const res = await fetch('http://localhost:5000/logout', {
       method: 'POST',
-      headers: { 'Content-Type': 'application/json' }
+      headers: { 'Content-Type': 'application/json', ...authHeaders() }
     });
     
     if (!res.ok) {
@@ -102,18 +111,49 @@ export default function App() {
     return res.json();
   }
 
-  async function apiGetNotifications(userNum: number) {
-    const res = await fetch(`http://localhost:5000/api/notifications?user_num=${userNum}`);
-    if (!res.ok) {
-      throw new Error(`HTTP error! status: ${res.status}`);
+  // 알림 구독: 서버가 새 알림을 바로 밀어줌 (SSE, EventSource가 없으면 long-poll)
+  // 처음 연결할 때 대기 중인 초대 목록을 snapshot으로 받고, 그 뒤로는 새 알림만 받음
+  function subscribeNotifications(userNum: number, handlers: NotificationHandlers): () => void {
+    const base = 'http://localhost:5000/api/notifications';
+    if (typeof EventSource !== 'undefined') {
+      // EventSource는 헤더를 보낼 수 없어서 토큰을 쿼리로 전달
+      const source = new EventSource(withAccessToken(`${base}/stream?user_num=${userNum}`));
+      source.addEventListener('snapshot', (e) => handlers.onSnapshot(JSON.parse((e as MessageEvent).data)));
+      NOTIFICATION_EVENTS.forEach((name) =>
+        source.addEventListener(name, (e) => handlers.onEvent(name, JSON.parse((e as MessageEvent).data))));
+      return () => source.close();
     }
-    return res.json();
+
+    let stopped = false;
+    // 서버가 준 커서("<epoch>-<seq>")를 그대로 돌려줌 (서버가 재시작했으면 snapshot이 옴)
+    let cursor: string | null = null;
+    const poll = async () => {
+      while (!stopped) {
+        try {
+          const after = cursor === null ? '' : `&after=${encodeURIComponent(cursor)}`;
+          const res = await fetch(`${base}/poll?user_num=${userNum}${after}`, { headers: authHeaders() });
+          if (!res.ok) {
+            throw new Error(`HTTP error! status: ${res.status}`);
+          }
+          const body = await res.json();
+          if (stopped) break;
+          if (body.snapshot) handlers.onSnapshot(body.snapshot);
+          body.events.forEach((item: any) => handlers.onEvent(item.event, item.data));
+          cursor = body.cursor;
+        } catch (error) {
+          console.error('알림 수신 실패:', error);
+          await new Promise((resolve) => setTimeout(resolve, 3000));
+        }
+      }
+    };
+    poll();
+    return () => { stopped = true; };
   }
 
   async function apiRespondToNotification(shareId: string, status: 'accepted' | 'declined') {
     const res = await fetch('http://localhost:5000/api/notifications/respond', {
       method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
+      headers: { 'Content-Type': 'application/json', ...authHeaders() },
       body: JSON.stringify({ share_id: shareId, status: status })
     });
     if (!res.ok) {
@@ -128,7 +168,7 @@ export default function App() {
     
     const res = await fetch('http://localhost:5000/api/events', {
       method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
+      headers: { 'Content-Type': 'application/json', ...authHeaders() },
       body: JSON.stringify(eventData)
     });
     
@@ -142,7 +182,7 @@ export default function App() {
   }
 
   async function apiGetEvents(calendarId: string, userNum: number) {
-    const res = await fetch(`http://localhost:5000/api/events/${calendarId}/${userNum}`);
+    const res = await fetch(`http://localhost:5000/api/events/${calendarId}/${userNum}`, { headers: authHeaders() });
     return res.json();
   }
 
@@ -150,20 +190,20 @@ export default function App() {
   async function apiCreateCalendar(calendarData: any) {
     const res = await fetch('http://localhost:5000/api/calendars', {
       method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
+      headers: { 'Content-Type': 'application/json', ...authHeaders() },
       body: JSON.stringify(calendarData)
     });
     return res.json();
   }
 
   async function apiGetUserCalendars(userNum: number) {
-    const res = await fetch(`http://localhost:5000/api/calendars/${userNum}`);
+    const res = await fetch(`http://localhost:5000/api/calendars/${userNum}`, { headers: authHeaders() });
     return res.json();
   }
 
   // 사용자의 모든 이벤트 가져오기 API
   async function apiGetUserAllEvents(userNum: number) {
-    const res = await fetch(`http://localhost:5000/api/user/${userNum}/events`);
+    const res = await fetch(`http://localhost:5000/api/user/${userNum}/events`, { headers: authHeaders() });
     return res.json();
   }
 
@@ -172,7 +212,7 @@ export default function App() {
     try {
       const res = await fetch(`http://localhost:5000/api/events/${eventId}`, {
         method: 'DELETE',
-        headers: { 'Content-Type': 'application/json' }
+        headers: { 'Content-Type': 'application/json', ...authHeaders() }
       });
       
       if (!res.ok) {
@@ -308,19 +348,6 @@ export default function App() {
             setEvents(fetchedEvents);
             console.log('이벤트 로드 완료:', fetchedEvents);
           }
-          
-          // Fetch notifications
-          try {
-            console.log('Fetching notifications for user_num:', user.user_num);
-            const fetchedNotifications = await apiGetNotifications(user.user_num);
-            setNotifications(fetchedNotifications);
-            if (fetchedNotifications.length > 0) {
-              setCurrentNotification(fetchedNotifications[0]);
-              setShowNotificationToast(true);
-            }
-          } catch (error) {
-            console.error('알림 로드 실패:', error);
-          }
 
         } catch (error) {
           console.error('사용자 데이터 로드 실패:', error);
@@ -331,6 +358,36 @@ export default function App() {
     loadUserData();
   }, [user?.user_num, isAuthenticated]); // selectedCalendarId 제거
 
+  // 알림은 폴링하지 않고 구독 (새 알림이 없으면 서버에서 DB 조회도 없음)
+  useEffect(() => {
+    if (!isAuthenticated || !user?.user_num) return;
+
+    return subscribeNotifications(user.user_num, {
+      onSnapshot: (pending) => {
+        setNotifications(pending);
+        if (pending.length > 0) {
+          setCurrentNotification(pending[0]);
+          setShowNotificationToast(true);
+        }
+      },
+      onEvent: (event, data) => {
+        if (event === 'calendar_invite') {
+          setNotifications(prev => prev.some(n => n.share_id === data.share_id) ? prev : [data, ...prev]);
+          setCurrentNotification(prev => prev ?? data);
+          setShowNotificationToast(true);
+        } else if (event === 'invitation_resolved') {
+          // 다른 탭/기기에서 응답한 초대는 목록에서 제거
+          setNotifications(prev => prev.filter(n => String(n.share_id) !== String(data.share_id)));
+          setCurrentNotification(prev => prev && String(prev.share_id) === String(data.share_id) ? null : prev);
+        } else if (event === 'invitation_response') {
+          toast.info(data.status === 'accepted' ? '보낸 캘린더 초대가 수락되었습니다.' : '보낸 캘린더 초대가 거절되었습니다.');
+        } else if (event === 'friend_request') {
+          toast.info(`${data.user_name || '새 사용자'}님이 친구 요청을 보냈습니다.`);
+        }
+      },
+    });
+  }, [user?.user_num, isAuthenticated]);
+
   const handleLogin = async (email: string, password: string) => {
     console.log('로그인 시도:', email, password); // 디버깅용
     
@@ -355,6 +412,7 @@ export default function App() {
         // localStorage에 사용자 상태 저장
         localStorage.setItem('user', JSON.stringify(userData));
         localStorage.setItem('isAuthenticated', 'true');
+        if (result.token) localStorage.setItem('token', result.token);
         
         toast.success('로그인 성공!');
         
@@ -632,6 +690,7 @@ export default function App() {
             // localStorage에 사용자 상태 저장
             localStorage.setItem('user', JSON.stringify(userData));
             localStorage.setItem('isAuthenticated', 'true');
+            if (loginResult.token) localStorage.setItem('token', loginResult.token);
             
             toast.success('자동 로그인되었습니다!');
           } else {
@@ -663,6 +722,7 @@ export default function App() {
     // localStorage에서 사용자 상태 제거
     localStorage.removeItem('user');
     localStorage.removeItem('isAuthenticated');
+    localStorage.removeItem('token');
     
     // 인증 상태만 초기화 (캘린더와 이벤트는 DB에 저장되므로 유지)
     setIsAuthenticated(false);
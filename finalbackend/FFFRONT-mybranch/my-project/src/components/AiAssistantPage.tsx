@@ -4,13 +4,52 @@ import { Button } from './ui/button';
 import { Input } from './ui/input';
 import { ScrollArea } from './ui/scroll-area';
 import { Upload } from 'lucide-react';
+import { authHeaders, withAccessToken } from '../utils/auth';
 
 interface Message {
+  id?: number;
   sender: 'user' | 'bot';
   text: string;
   schedule_data?: any;
 }
 
+// 스트리밍 진행 단계 표시 문구
+const STAGE_LABELS: Record<string, string> = {
+  accepted: '요청을 받았어요...',
+  intent: '메시지를 분석하고 있어요...',
+  extraction: '일정을 추출하고 있어요...',
+  crawl: '관련 뉴스를 찾아보고 있어요...',
+  job: '관련 뉴스를 찾아보고 있어요. 찾으면 여기에 알려 드릴게요.',
+  reply: '답변을 작성하고 있어요...',
+};
+
+const getUserNum = (): number | undefined => {
+  try {
+    const savedUser = localStorage.getItem('user');
+    return savedUser ? JSON.parse(savedUser).user_num : undefined;
+  } catch {
+    return undefined;
+  }
+};
+
+// 스트리밍/백그라운드 작업 결과를 해당 봇 메시지에 채워 넣기 위한 id
+let nextMessageId = 1;
+
+// 백그라운드 작업(뉴스 크롤링 일정 추출)이 끝나면 작업을 시작한 메시지를 갱신
+const followJob = (jobId: string, update: (patch: Partial<Message>) => void) => {
+  const source = new EventSource(withAccessToken(`http://127.0.0.1:5000/api/jobs/${jobId}/events`));
+  source.addEventListener('done', (e) => {
+    const job = JSON.parse((e as MessageEvent).data);
+    if (job.status === 'done') {
+      update({ text: '관련 뉴스에서 찾은 일정입니다.', schedule_data: job.result });
+    } else {
+      update({ text: '뉴스에서 일정을 찾는 중 오류가 발생했습니다.' });
+    }
+    source.close();
+  });
+  source.addEventListener('error', () => source.close());
+};
+
 const AiAssistantPage: React.FC = () => {
   const [messages, setMessages] = useState<Message[]>([]);
   const [input, setInput] = useState('');
@@ -26,24 +65,75 @@ const AiAssistantPage: React.FC = () => {
     setInput('');
     setIsLoading(true);
 
+    // 스트리밍 응답을 받는 동안 채워 나갈 봇 메시지
+    // (작업 결과는 나중에 도착하므로 마지막 메시지가 아니라 id로 찾아서 갱신)
+    const botMessageId = nextMessageId++;
+    const updateBotMessage = (patch: Partial<Message>) => {
+      setMessages((prev) => prev.map((msg) => (msg.id === botMessageId ? { ...msg, ...patch } : msg)));
+    };
+
     try {
-      const response = await fetch('http://127.0.0.1:5000/api/chat', {
+      const response = await fetch('http://127.0.0.1:5000/api/chat/stream', {
         method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ message: input }),
+        headers: { 'Content-Type': 'application/json', ...authHeaders() },
+        // 대화 기록을 사용자별로 이어가도록 user_num 전달
+        body: JSON.stringify({ message: input, user_num: getUserNum() }),
       });
 
-      if (!response.ok) {
+      if (!response.ok || !response.body) {
         throw new Error(`HTTP error! status: ${response.status}`);
       }
 
-      const data = await response.json();
-      const botMessage: Message = {
-        sender: 'bot',
-        text: data.reply || '일정 데이터를 확인하세요.',
-        schedule_data: data.schedule_data,
-      };
-      setMessages((prev) => [...prev, botMessage]);
+      setMessages((prev) => [...prev, { id: botMessageId, sender: 'bot', text: STAGE_LABELS.accepted }]);
+
+      // SSE 파싱: 빈 줄로 구분된 "event: ...\ndata: ..." 블록
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      let replyText = '';
+
+      while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+          const block = buffer.slice(0, boundary);
+          buffer = buffer.slice(boundary + 2);
+
+          let eventName = 'message';
+          let dataText = '';
+          for (const line of block.split('\n')) {
+            if (line.startsWith('event:')) eventName = line.slice(6).trim();
+            else if (line.startsWith('data:')) dataText += line.slice(5).trim();
+          }
+          if (!dataText) continue;
+          const data = JSON.parse(dataText);
+
+          if (eventName === 'progress' && !replyText) {
+            updateBotMessage({ text: STAGE_LABELS[data.stage] || '처리 중...' });
+          } else if (eventName === 'job') {
+            updateBotMessage({ text: STAGE_LABELS.job });
+          } else if (eventName === 'token') {
+            replyText += data.text;
+            updateBotMessage({ text: replyText });
+          } else if (eventName === 'done') {
+            // 뉴스 크롤링은 백그라운드 작업으로 돌아가므로 끝나면 이 메시지에 결과를 채워 넣음
+            if (data.job && !data.schedule_data) {
+              updateBotMessage({ text: STAGE_LABELS.job });
+              followJob(data.job.id, updateBotMessage);
+            } else {
+              updateBotMessage({
+                text: data.reply || '일정 데이터를 확인하세요.',
+                schedule_data: data.schedule_data,
+              });
+            }
+          } else if (eventName === 'error') {
+            throw new Error(data.error);
+          }
+        }
+      }
     } catch (error) {
       console.error('Error fetching AI response:', error);
       const errorMessage: Message = {
@@ -70,6 +160,7 @@ const AiAssistantPage: React.FC = () => {
     try {
         const response = await fetch('http://127.0.0.1:5000/api/chat/upload', {
             method: 'POST',
+            headers: authHeaders(),
             body: formData,
         });
 
@@ -0,0 +1,14 @@
+// 로그인 때 받은 세션 토큰을 API 요청에 붙이는 유틸리티
+
+// Authorization 헤더 (토큰이 없으면 빈 객체 → 기존처럼 user_num만으로 요청)
+export const authHeaders = (): Record<string, string> => {
+  const token = localStorage.getItem('token');
+  return token ? { 'Authorization': `Bearer ${token}` } : {};
+};
+
+// EventSource는 헤더를 보낼 수 없어서 토큰을 access_token 쿼리로 전달
+export const withAccessToken = (url: string): string => {
+  const token = localStorage.getItem('token');
+  if (!token) return url;
+  return `${url}${url.includes('?') ? '&' : '?'}access_token=${encodeURIComponent(token)}`;
+};
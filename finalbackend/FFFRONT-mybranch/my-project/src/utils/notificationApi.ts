@@ -1,3 +1,5 @@
+import { authHeaders } from './auth';
+
 // 백엔드 API 통신을 위한 유틸리티 함수들
 export const sendNotificationResponse = async (shareId: string, response: 'yes' | 'no') => {
   try {
@@ -6,7 +8,7 @@ export const sendNotificationResponse = async (shareId: string, response: 'yes'
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
-        'Authorization': `Bearer ${localStorage.getItem('token')}` // 인증 토큰
+        ...authHeaders() // 인증 토큰
       },
       body: JSON.stringify({
         share_id: shareId,
@@ -30,9 +32,7 @@ export const fetchNotifications = async (userNum: number) => {
   try {
     // 실제 환경에서는 백엔드에서 알림 목록을 가져옴
     const result = await fetch(`/api/notifications?user_num=${userNum}`, {
-      headers: {
-        'Authorization': `Bearer ${localStorage.getItem('token')}`
-      }
+      headers: authHeaders()
     });
     
     if (!result.ok) {
@@ -60,7 +60,7 @@ export const fetchAiEventPreview = async (userNum: number, calendarId: string) =
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
-        'Authorization': `Bearer ${localStorage.getItem('token')}`
+        ...authHeaders()
       },
       body: JSON.stringify({ user_num: userNum, calendar_id: calendarId })
     });
@@ -4,11 +4,27 @@ Ant Chat GPT - 백엔드 연동용 메인 인터페이스
 """
 
 from __future__ import annotations
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List, Tuple
 import json
+import threading
+import time
 
 # ✅ 내부 모듈
-from .detector import GPTDateDetector
+# detector(openai, 뉴스 크롤러)는 AntChatGPT를 만들 때 불러옵니다.
+# ant_chat_gpt.common만 쓰는 weather 등이 패키지를 import해도 무거운 의존성이 로드되지 않도록.
+from .cache import LRUCache, SQLiteCache, make_key
+from .preclassifier import KoreanDatePreClassifier
+from .conversation import ConversationStore, DEFAULT_SESSION
+from .jobs import JobQueue, FINISHED, DONE
+from .gpt_search.article_cache import get_article_cache
+
+
+def __getattr__(name):
+    # 기존 `from ant_chat_gpt import GPTDateDetector` 호환
+    if name == "GPTDateDetector":
+        from .detector import GPTDateDetector
+        return GPTDateDetector
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class AntChatGPT:
@@ -16,15 +32,43 @@ class AntChatGPT:
     백엔드에서 사용할 수 있는 통합 인터페이스 클래스
     """
 
-    def __init__(self, model: str = "gpt-4o-mini"):
+    # 다단계 경로에서 판별 결과별로 실행되는 LLM 단계
+    MULTI_STAGE_PLAN = {
+        "conversation": ["has_date"],
+        "crawl": ["has_date", "has_date_info"],
+        "schedule": ["has_date", "has_date_info", "extract_schedule"],
+    }
+
+    # 백그라운드 크롤링 작업 이름
+    CRAWL_JOB = "crawl_schedule"
+    CRAWL_JOB_VERSION = 1
+
+    def __init__(self, model: str = "gpt-4o-mini", cache=None, single_call: bool = True,
+                 conversation_store: ConversationStore | None = None, job_queue: JobQueue | None = None):
         """
         AntChatGPT 초기화
 
         Args:
             model: 사용할 GPT 모델명 (기본값: gpt-4o-mini)
+            cache: LLM 응답 캐시 (LRUCache / SQLiteCache, 기본값: 환경 변수 ANT_CHAT_CACHE로 선택)
+            single_call: True면 의도/날짜 판별과 일정 추출을 한 번의 호출로 처리
+                         (실패 시 기존 다단계 경로로 폴백)
+            conversation_store: 사용자별 대화 기록 저장소 (기본값: 환경 변수 ANT_CHAT_HISTORY_*로 설정)
+            job_queue: 주어지면 뉴스 크롤링 기반 추출을 백그라운드 작업으로 실행하고
+                       응답에는 작업 id만 담아 바로 반환
         """
-        self.detector = GPTDateDetector(model=model)
-        self.conversation_history: List[Dict[str, str]] = []
+        from .detector import GPTDateDetector
+        self.detector = GPTDateDetector(model=model, cache=cache)
+        self.single_call = single_call
+        # 세션(사용자)별 대화 기록 - 오래된 턴은 요약으로 접어서 프롬프트 크기를 일정하게 유지
+        self.conversations = conversation_store or ConversationStore.from_env(
+            summarizer=self.detector.summarize_conversation)
+        self.jobs = job_queue
+        if self.jobs is not None:
+            self.jobs.register(self.CRAWL_JOB, self._run_crawl_job)
+        # 요청 스레드마다 누적하므로 락으로 보호
+        self._savings_lock = threading.Lock()
+        self.savings = {"messages": 0, "llm_calls_saved": 0, "tokens_saved": 0.0, "latency_saved_ms": 0.0}
 
     # ──────────────────────────────────────────────────────────────────────
     # 내부 유틸
@@ -61,10 +105,14 @@ class AntChatGPT:
     # ──────────────────────────────────────────────────────────────────────
     # 공개 API
     # ──────────────────────────────────────────────────────────────────────
-    def process_message(self, message: str) -> Dict[str, Any]:
+    def process_message(self, message: str, session_id: str | None = None) -> Dict[str, Any]:
         """
         사용자 메시지를 처리하여 결과를 반환
 
+        Args:
+            message: 사용자 메시지
+            session_id: 대화 기록을 구분할 키 (보통 user_num). 없으면 공용 기본 세션
+
         Returns:
             {
                 "has_schedule": bool,           # 일정 포함 여부
@@ -72,12 +120,69 @@ class AntChatGPT:
                 "reply": str | None,            # GPT 응답 (일정이 없을 때)
                 "schedule_data": dict | None,   # 일정 데이터 (있을 때)
                 "type": "schedule" | "conversation",
+                "pipeline": dict,               # 처리 경로, 호출 수, 절감량
                 "error": str (optional)
             }
         """
-        # 1) 일정 생성 의도 판별
-        has_schedule, tokens = self.detector.has_date(message)
+        result: Dict[str, Any] = {}
+        for event, data in self._run(message, session_id, stream=False):
+            if event == "done":
+                result = data
+        return result
+
+    def process_message_stream(self, message: str, session_id: str | None = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        process_message의 스트리밍 버전. (이벤트 이름, 데이터)를 차례로 내보냅니다.
+
+        - ("progress", {"stage": "intent" | "extraction" | "crawl" | "reply", "elapsed_ms": ...})
+        - ("token", {"text": "..."})   # 일반 대화 답변 조각 (OpenAI 스트리밍)
+        - ("done", {...})              # process_message와 같은 최종 결과
+        """
+        return self._run(message, session_id, stream=True)
+
+    def _run(self, message: str, session_id: str | None, stream: bool) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        started = time.perf_counter()
+
+        def progress(stage: str) -> Tuple[str, Dict[str, Any]]:
+            return "progress", {"stage": stage, "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)}
+
+        yield progress("intent")
+
+        # 0) 인사말/잡담처럼 일정 의도가 없는 게 확실하면 GPT 판별 없이 바로 대화로 처리
+        #    (사전 판별은 메시지당 여기서 한 번만 하고 결과를 다단계 경로에 넘김)
+        pre = self.detector.preclassify(message)
+        if pre is not None and pre.label is False:
+            result: Dict[str, Any] = {
+                "has_schedule": False,
+                "tokens_used": {},
+                "type": "conversation",
+                "reply": None,
+                "schedule_data": None,
+                "pipeline": {"mode": "preclassified", "reason": pre.reason, "confidence": pre.confidence},
+            }
+            yield progress("reply")
+            yield from self._reply_conversation(message, result, session_id, stream)
+            yield "done", result
+            return
 
+        if self.single_call:
+            try:
+                analysis, tokens = self.detector.analyze(message)
+            except Exception as e:
+                print(f"⚠️ 단일 호출 분석 실패 → 다단계 경로로 폴백: {e}")
+            else:
+                latency_ms = (time.perf_counter() - started) * 1000
+                yield from self._process_analysis(message, analysis, tokens, latency_ms,
+                                                  session_id, stream, progress)
+                return
+
+        yield from self._process_multi_stage(message, session_id, stream, progress, pre)
+
+    def _process_analysis(self, message: str, analysis: Dict[str, Any],
+                          tokens: Dict[str, Any], latency_ms: float,
+                          session_id: str | None, stream: bool, progress) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """단일 호출(analyze) 결과로 응답을 구성"""
+        has_schedule = analysis["intent"]
         result: Dict[str, Any] = {
             "has_schedule": has_schedule,
             "tokens_used": tokens or {},
@@ -86,31 +191,156 @@ class AntChatGPT:
             "schedule_data": None,
         }
 
+        if not has_schedule:
+            plan = "conversation"
+        elif analysis["has_date_info"]:
+            plan = "schedule"
+        else:
+            plan = "crawl"
+        result["pipeline"] = self._single_call_report(plan, tokens, latency_ms)
+
         if has_schedule:
-            # 2) 일정 추출 or 크롤링 파이프라인 실행
             try:
-                raw = self.detector.run_pipeline(message)  # ✅ 직접 pipeline 실행
-                result["schedule_data"] = self._normalize_schedule(raw)
+                if analysis["has_date_info"]:
+                    yield progress("extraction")
+                    result["schedule_data"] = self._normalize_schedule({"events": analysis["events"]})
+                else:
+                    yield from self._crawl(message, result, stream, progress)
             except Exception as e:
                 result["error"] = f"schedule pipeline failed: {e}"
                 result["reply"] = "일정 처리 중 오류가 발생했습니다."
                 result["type"] = "conversation"
         else:
-            # 3) 일반 대화 처리
+            yield progress("reply")
+            yield from self._reply_conversation(message, result, session_id, stream)
+
+        yield "done", result
+
+    def _single_call_report(self, plan: str, tokens: Dict[str, Any], latency_ms: float) -> Dict[str, Any]:
+        """
+        단일 호출로 아낀 LLM 호출 수와 토큰/지연시간 추정치.
+        추정치는 다단계 경로에서 측정된 단계별 평균을 기준으로 하고,
+        아직 측정되지 않은 단계는 설정된 기본 비용(ANT_CHAT_STAGE_COST)을 씁니다.
+        baseline 필드에 기준이 측정값인지 기본값인지 표시합니다.
+        """
+        stages = self.MULTI_STAGE_PLAN[plan]
+        calls_saved = len(stages) - 1
+        baseline = self.detector.estimate_stage_cost(stages)
+        tokens_saved = latency_saved = source = None
+        if baseline is not None:
+            source = baseline["source"]
+            tokens_saved = round(baseline["tokens"] - (tokens or {}).get("total_tokens", 0), 1)
+            latency_saved = round(baseline["latency_ms"] - latency_ms, 1)
+
+        with self._savings_lock:
+            self.savings["messages"] += 1
+            self.savings["llm_calls_saved"] += calls_saved
+            if tokens_saved is not None:
+                self.savings["tokens_saved"] += tokens_saved
+                self.savings["latency_saved_ms"] += latency_saved
+
+        return {
+            "mode": "single_call",
+            "llm_calls": 1,
+            "llm_calls_saved": calls_saved,
+            "latency_ms": round(latency_ms, 1),
+            "estimated_tokens_saved": tokens_saved,
+            "estimated_latency_saved_ms": latency_saved,
+            "baseline": source,
+        }
+
+    def _process_multi_stage(self, message: str, session_id: str | None, stream: bool,
+                             progress, pre=None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """기존 다단계 경로 (has_date → has_date_info → extract_schedule / 크롤링)"""
+        # 1) 일정 생성 의도 판별
+        has_schedule, tokens = self.detector.has_date(message, pre=pre)
+
+        result: Dict[str, Any] = {
+            "has_schedule": has_schedule,
+            "tokens_used": tokens or {},
+            "type": "schedule" if has_schedule else "conversation",
+            "reply": None,
+            "schedule_data": None,
+            "pipeline": {"mode": "multi_stage"},
+        }
+
+        if has_schedule:
+            # 2) 일정 추출 or 크롤링 파이프라인 실행 (detector.run_pipeline과 같은 순서)
             try:
-                reply = self.detector.generate_simple_reply(message)
-                result["reply"] = reply
-                # 대화 히스토리 누적
-                self.conversation_history.append({"role": "user", "content": message})
-                self.conversation_history.append({"role": "assistant", "content": reply})
-                # 길이 제한 (최근 10턴)
-                if len(self.conversation_history) > 20:
-                    self.conversation_history = self.conversation_history[-20:]
+                has_info, _ = self.detector.has_date_info(message)
+                if has_info:
+                    yield progress("extraction")
+                    raw, _ = self.detector.extract_schedule(message)
+                    result["schedule_data"] = self._normalize_schedule(raw)
+                else:
+                    yield from self._crawl(message, result, stream, progress)
             except Exception as e:
-                result["error"] = f"chat reply failed: {e}"
-                result["reply"] = "대화 처리 중 오류가 발생했습니다."
+                result["error"] = f"schedule pipeline failed: {e}"
+                result["reply"] = "일정 처리 중 오류가 발생했습니다."
+                result["type"] = "conversation"
+        else:
+            yield progress("reply")
+            yield from self._reply_conversation(message, result, session_id, stream)
 
-        return result
+        yield "done", result
+
+    def _crawl(self, message: str, result: Dict[str, Any], stream: bool,
+               progress) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        뉴스 크롤링 기반 일정 추출.
+        작업 큐가 있으면 백그라운드 작업으로 넘기고(같은 질문은 한 작업으로 합침) 작업 id만 담아 바로 반환합니다.
+        스트리밍도 크롤링이 끝날 때까지 기다리지 않고 job 이벤트를 보낸 뒤 스트림을 닫습니다.
+        (클라이언트는 /api/jobs/<id>/events 로 결과를 받음)
+        """
+        yield progress("crawl")
+        if self.jobs is None:
+            result["schedule_data"] = self._normalize_schedule(self.detector.crawl_schedule(message))
+            return
+
+        today = time.strftime("%Y-%m-%d")
+        dedupe_key = make_key(self.detector.model, self.CRAWL_JOB, self.CRAWL_JOB_VERSION, message, today)
+        job_id = self.jobs.submit(self.CRAWL_JOB, {"message": message}, dedupe_key=dedupe_key)
+
+        job = self.jobs.get(job_id)
+        if job is not None and job["status"] in FINISHED:
+            # 같은 질문의 작업이 이미 끝나 있으면 결과를 바로 사용
+            self._apply_job_result(result, job)
+            return
+        result["job"] = {"id": job_id, "status": job["status"] if job else "unknown"}
+        if stream:
+            yield "job", dict(result["job"])
+
+    def _run_crawl_job(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """작업 큐 워커에서 실행되는 크롤링 추출"""
+        return self._normalize_schedule(self.detector.crawl_schedule(payload["message"]))
+
+    @staticmethod
+    def _apply_job_result(result: Dict[str, Any], job: Dict[str, Any]) -> None:
+        result["job"] = {"id": job["id"], "status": job["status"]}
+        if job["status"] == DONE:
+            result["schedule_data"] = job["result"]
+        else:
+            raise RuntimeError(job.get("error") or "crawl job failed")
+
+    def _reply_conversation(self, message: str, result: Dict[str, Any], session_id: str | None,
+                            stream: bool = False) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """3) 일반 대화 처리 (세션별 대화 기록 사용, stream이면 답변 조각을 token 이벤트로 내보냄)"""
+        try:
+            history = self.conversations.messages(session_id)
+            if stream:
+                parts = []
+                for delta in self.detector.generate_simple_reply_stream(message, history=history):
+                    parts.append(delta)
+                    yield "token", {"text": delta}
+                reply = "".join(parts).strip()
+            else:
+                reply = self.detector.generate_simple_reply(message, history=history)
+            result["reply"] = reply
+            # 대화 히스토리 누적 (버퍼를 넘친 턴은 저장소가 요약으로 접음)
+            self.conversations.append(session_id, message, reply)
+        except Exception as e:
+            result["error"] = f"chat reply failed: {e}"
+            result["reply"] = "대화 처리 중 오류가 발생했습니다."
 
     def process_file(self, file_path: str) -> Dict[str, Any]:
         """
@@ -140,13 +370,52 @@ class AntChatGPT:
         }
 
 
-    def reset_conversation(self) -> None:
+    @property
+    def conversation_history(self) -> List[Dict[str, str]]:
+        """기본 세션의 최근 대화 기록 (이전 버전 호환용)"""
+        return self.conversations.history(DEFAULT_SESSION)
+
+    def reset_conversation(self, session_id: str | None = None) -> None:
         """대화 기록 초기화"""
-        self.conversation_history = []
+        self.conversations.reset(session_id)
 
-    def get_conversation_history(self) -> list:
-        """현재 대화 기록 반환"""
-        return list(self.conversation_history)
+    def get_conversation_history(self, session_id: str | None = None) -> list:
+        """현재 대화 기록 반환 (요약 제외, 최근 턴만)"""
+        return self.conversations.history(session_id)
+
+    def get_job(self, job_id: str, wait: float = 0) -> dict | None:
+        """백그라운드 작업 상태/결과 (wait초 동안 완료를 기다림). 작업 큐가 없으면 None"""
+        if self.jobs is None:
+            return None
+        return self.jobs.wait(job_id, timeout=wait) if wait > 0 else self.jobs.get(job_id)
+
+    def get_job_stats(self) -> dict:
+        """작업 큐 통계"""
+        return self.jobs.stats() if self.jobs is not None else {"enabled": False}
+
+    def get_conversation_stats(self) -> dict:
+        """세션 수, 제거/요약 횟수 등 대화 저장소 통계"""
+        return self.conversations.stats()
+
+    def get_article_stats(self) -> dict:
+        """뉴스 기사 본문 캐시/중복 제거 통계"""
+        return get_article_cache().stats()
+
+    def get_cache_stats(self) -> dict:
+        """LLM 응답 캐시 통계 반환"""
+        return self.detector.cache_stats()
+
+    def get_pipeline_stats(self) -> dict:
+        """단일 호출 모드 누적 절감량, 사전 판별 통계, 단계별 평균 비용 반환"""
+        with self._savings_lock:
+            savings = dict(self.savings)
+        return {
+            "single_call": self.single_call,
+            "savings": savings,
+            "preclassifier": self.detector.preclassifier_stats(),
+            "stages": self.detector.stage_stats_snapshot(),
+            "news_context": self.detector.crawlr.packer.stats(),
+        }
 
 
 # 단독 실행 테스트(선택)
@@ -0,0 +1,32 @@
+"""
+LLM 응답 캐시 설정
+
+캐시 구현(LRUCache, SQLiteCache, make_key)은 weather 등과 함께 쓰는 ant_chat_gpt.common.cache에 있고,
+여기서는 ANT_CHAT_CACHE* 환경 변수로 백엔드를 고르는 부분만 둡니다.
+기존 import 경로(ant_chat_gpt.cache)도 그대로 동작하도록 다시 내보냅니다.
+"""
+
+import os
+
+from .common.cache import LRUCache, SQLiteCache, make_key, normalize_message
+
+__all__ = ["LRUCache", "SQLiteCache", "make_key", "normalize_message", "build_cache_from_env"]
+
+
+def build_cache_from_env():
+    """
+    환경 변수로 캐시 백엔드를 선택합니다.
+
+    ANT_CHAT_CACHE: memory(기본) | sqlite | off
+    ANT_CHAT_CACHE_PATH: sqlite 파일 경로 (기본 ./.cache/llm_cache.sqlite3)
+    ANT_CHAT_CACHE_SIZE: 최대 항목 수
+    ANT_CHAT_CACHE_TTL: 유효 시간(초)
+    """
+    backend = os.getenv("ANT_CHAT_CACHE", "memory").lower()
+    ttl = float(os.getenv("ANT_CHAT_CACHE_TTL", "86400"))
+    if backend == "off":
+        return None
+    if backend == "sqlite":
+        path = os.getenv("ANT_CHAT_CACHE_PATH", os.path.join(".cache", "llm_cache.sqlite3"))
+        return SQLiteCache(path, max_size=int(os.getenv("ANT_CHAT_CACHE_SIZE", "10000")), ttl=ttl)
+    return LRUCache(max_size=int(os.getenv("ANT_CHAT_CACHE_SIZE", "1024")), ttl=ttl)
@@ -0,0 +1,5 @@
+"""
+여러 모듈(ant_chat_gpt, weather, backend)이 함께 쓰는 가벼운 유틸리티.
+openai 같은 무거운 의존성을 끌어오지 않도록 이 패키지는 표준 라이브러리와 requests만 사용합니다.
+(ant_chat_gpt/__init__도 detector를 처음 쓸 때 불러오므로 weather에서 import해도 openai가 로드되지 않음)
+"""
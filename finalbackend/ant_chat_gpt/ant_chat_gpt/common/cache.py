@@ -0,0 +1,193 @@
+"""
+공용 캐시 (LLM 응답, 날씨 조언 등)
+
+temperature가 0에 가까운 판별/추출 호출은 같은 입력이면 같은 결과가 나오므로,
+(모델, 프롬프트 템플릿 버전, 정규화된 메시지, 오늘 날짜)를 키로 결과를 재사용합니다.
+ant_chat_gpt와 weather가 함께 쓰므로 openai 등 무거운 의존성 없이 표준 라이브러리만 사용합니다.
+
+- LRUCache: 프로세스 메모리 캐시 (TTL + 최대 개수 제한)
+- SQLiteCache: 디스크 캐시 (재시작 후에도 유지, TTL + 최대 개수 제한)
+
+두 캐시 모두 get/set/stats/clear 인터페이스가 같아서 서로 바꿔 끼울 수 있습니다.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+def normalize_message(message: str) -> str:
+    """공백/유니코드 정규화 (NFC, 연속 공백 축소, 앞뒤 공백 제거, 소문자)"""
+    text = unicodedata.normalize("NFC", str(message))
+    text = re.sub(r"\s+", " ", text).strip()
+    return text.lower()
+
+
+def make_key(model: str, template: str, version: int, message: str, today: str) -> str:
+    """캐시 키 생성 (내용이 길어도 고정 길이가 되도록 해시)"""
+    raw = "\x1f".join([model, f"{template}@v{version}", normalize_message(message), today])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class _Stats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.evictions = 0
+        self.expired = 0
+
+    def as_dict(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "sets": self.sets,
+            "evictions": self.evictions,
+            "expired": self.expired,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class LRUCache:
+    """
+    스레드 안전한 인메모리 LRU 캐시
+
+    Args:
+        max_size: 최대 항목 수 (넘으면 가장 오래 안 쓴 항목부터 제거)
+        ttl: 항목 유효 시간(초), None이면 만료 없음
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = 86400):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = _Stats()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at and expires_at < time.time():
+                del self._data[key]
+                self._stats.expired += 1
+                self._stats.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._stats.hits += 1
+        # 호출자가 결과를 수정해도 캐시 원본이 바뀌지 않도록 복사본 반환
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl else 0
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            self._stats.sets += 1
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self._stats.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            data = self._stats.as_dict()
+            data.update({"backend": "memory", "size": len(self._data), "max_size": self.max_size})
+            return data
+
+
+class SQLiteCache:
+    """
+    SQLite 파일 기반 캐시. 값은 JSON으로 저장합니다.
+
+    Args:
+        path: DB 파일 경로
+        max_size: 최대 항목 수 (넘으면 가장 오래 안 쓴 항목부터 제거)
+        ttl: 항목 유효 시간(초), None이면 만료 없음
+    """
+
+    def __init__(self, path: str, max_size: int = 10000, ttl: Optional[float] = 86400):
+        self.path = path
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._stats = _Stats()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "  key TEXT PRIMARY KEY,"
+            "  value TEXT NOT NULL,"
+            "  expires_at REAL NOT NULL,"
+            "  last_used REAL NOT NULL"
+            ")")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache (last_used)")
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._stats.misses += 1
+                return None
+            value, expires_at = row
+            if expires_at and expires_at < now:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._stats.expired += 1
+                self._stats.misses += 1
+                return None
+            self._conn.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (now, key))
+            self._stats.hits += 1
+        return json.loads(value)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+        expires_at = now + ttl if ttl else 0
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, payload, expires_at, now))
+            self._stats.sets += 1
+            count = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            overflow = count - self.max_size
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN ("
+                    "  SELECT key FROM llm_cache ORDER BY last_used LIMIT ?)", (overflow,))
+                self._stats.evictions += overflow
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            data = self._stats.as_dict()
+        data.update({"backend": "sqlite", "size": size, "max_size": self.max_size, "path": self.path})
+        return data
+
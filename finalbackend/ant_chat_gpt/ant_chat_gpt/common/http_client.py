@@ -0,0 +1,87 @@
+"""
+공용 HTTP 클라이언트
+
+모듈 수준 requests.get()은 호출할 때마다 새 TCP/TLS 연결을 엽니다.
+여기서는 프로세스 전체가 공유하는 requests.Session 하나를 만들어
+keep-alive 연결 재사용, 호스트별 커넥션 풀, 재시도(backoff), 기본 timeout을 적용합니다.
+
+    from ant_chat_gpt.common.http_client import get_session
+    res = get_session().get(url, params=params)
+"""
+
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# 모든 요청에 적용되는 기본 timeout (연결, 읽기) - 호출 시 timeout=으로 덮어쓸 수 있음
+DEFAULT_TIMEOUT = (3.05, 10)
+
+# 자주 호출하는 API 호스트별 커넥션 풀 크기
+HOST_POOL_SIZES = {
+    "https://openapi.naver.com": 8,
+    "http://apis.data.go.kr": 4,
+    "https://apis.data.go.kr": 4,
+}
+
+# 그 밖의 호스트(뉴스 기사 등)용 기본 풀
+DEFAULT_POOL_CONNECTIONS = 20   # 캐시해 둘 호스트 풀 개수
+DEFAULT_POOL_MAXSIZE = 4        # 호스트당 유지할 연결 수
+
+_session = None
+_session_lock = threading.Lock()
+
+
+class TimeoutSession(requests.Session):
+    """timeout을 지정하지 않은 요청에도 기본 timeout을 적용하는 Session"""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT):
+        super().__init__()
+        self.default_timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.default_timeout)
+        return super().request(method, url, **kwargs)
+
+
+def build_retry(total=None, backoff_factor=None):
+    """GET 요청의 일시적 오류(연결 실패, 429, 5xx)를 지수 backoff로 재시도"""
+    return Retry(
+        total=int(os.getenv("HTTP_RETRY_TOTAL", "2")) if total is None else total,
+        connect=None,
+        read=None,
+        backoff_factor=float(os.getenv("HTTP_RETRY_BACKOFF", "0.3")) if backoff_factor is None else backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        raise_on_status=False,
+        respect_retry_after_header=True,
+    )
+
+
+def create_session(timeout=DEFAULT_TIMEOUT, host_pool_sizes=None, retry=None) -> requests.Session:
+    """설정이 적용된 새 Session 생성 (테스트나 별도 풀이 필요할 때)"""
+    session = TimeoutSession(timeout=timeout)
+    retry = retry or build_retry()
+
+    default_adapter = HTTPAdapter(pool_connections=DEFAULT_POOL_CONNECTIONS,
+                                  pool_maxsize=DEFAULT_POOL_MAXSIZE, max_retries=retry)
+    session.mount("http://", default_adapter)
+    session.mount("https://", default_adapter)
+
+    # requests는 가장 긴 prefix가 일치하는 adapter를 사용
+    for prefix, size in (host_pool_sizes or HOST_POOL_SIZES).items():
+        session.mount(prefix, HTTPAdapter(pool_connections=1, pool_maxsize=size, max_retries=retry))
+
+    return session
+
+
+def get_session() -> requests.Session:
+    """프로세스 전체가 공유하는 Session (최초 호출 시 생성)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
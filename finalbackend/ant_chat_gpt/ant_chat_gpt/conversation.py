@@ -0,0 +1,239 @@
+"""
+사용자별 대화 상태 저장소
+
+AntChatGPT 하나를 여러 사용자가 같이 쓰므로 대화 기록을 세션(사용자) 단위로 나눠 보관합니다.
+
+- 세션마다 최근 max_turns 턴만 담는 링 버퍼
+- 오래된 턴은 summarizer로 요약에 접어 넣어서 프롬프트 크기를 일정하게 유지
+- 오래 안 쓴 세션은 LRU로 메모리에서 제거 (max_sessions, idle_ttl)
+- persist_path를 주면 SQLite에 기록해서 재시작/메모리 제거 후에도 이어서 대화
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_SESSION = "default"
+
+
+class ConversationSession:
+    """한 사용자의 대화 상태 (최근 턴 + 이전 대화 요약)"""
+
+    def __init__(self, session_id: str, turns=None, summary: str = "", updated_at: float = None):
+        self.session_id = session_id
+        self.turns: deque = deque(turns or [])
+        self.summary = summary
+        self.pending: List[Dict[str, str]] = []   # 요약을 기다리는 밀려난 메시지
+        self.updated_at = updated_at or time.time()
+        self.lock = threading.Lock()
+
+    def messages(self) -> List[Dict[str, str]]:
+        """프롬프트에 넣을 메시지 목록 (요약이 있으면 맨 앞에 system 메시지로)"""
+        with self.lock:
+            head = []
+            if self.summary:
+                head.append({"role": "system", "content": f"이전 대화 요약: {self.summary}"})
+            return head + list(self.turns)
+
+
+class ConversationStore:
+    """
+    세션별 대화 기록 저장소
+
+    Args:
+        max_turns: 세션마다 그대로 보관할 최근 턴 수 (1턴 = 사용자 + 어시스턴트 메시지)
+        max_sessions: 메모리에 유지할 최대 세션 수 (넘으면 가장 오래 안 쓴 세션부터 제거)
+        idle_ttl: 이 시간(초) 동안 쓰지 않은 세션은 메모리에서 제거
+        summarizer: summarizer(이전 요약, 밀려난 메시지 목록) -> 새 요약. None이면 밀려난 턴은 버림
+        summarize_every: 밀려난 턴이 이만큼 쌓이면 한 번에 요약 (요약 호출 횟수 절약)
+        persist_path: SQLite 파일 경로 (None이면 메모리만 사용)
+    """
+
+    def __init__(self, max_turns: int = 10, max_sessions: int = 1000, idle_ttl: float = 3600,
+                 summarizer: Optional[Callable[[str, list], str]] = None, summarize_every: int = 4,
+                 persist_path: Optional[str] = None):
+        self.max_turns = max_turns
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.summarizer = summarizer
+        self.summarize_every = summarize_every
+        self.persist_path = persist_path
+        self._lock = threading.Lock()
+        self._sessions: "OrderedDict[str, ConversationSession]" = OrderedDict()
+        self._stats = {"created": 0, "loaded": 0, "evicted": 0, "expired": 0,
+                       "summaries": 0, "summary_failures": 0, "dropped_turns": 0}
+        self._db = None
+        self._db_lock = threading.Lock()
+        if persist_path:
+            os.makedirs(os.path.dirname(os.path.abspath(persist_path)), exist_ok=True)
+            self._db = sqlite3.connect(persist_path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS conversation_sessions ("
+                "  session_id TEXT PRIMARY KEY,"
+                "  summary TEXT NOT NULL,"
+                "  turns TEXT NOT NULL,"
+                "  updated_at REAL NOT NULL"
+                ")")
+
+    # ──────────────────────────────────────────────────────────────────────
+    # SQLite
+    # ──────────────────────────────────────────────────────────────────────
+    def _load(self, session_id: str) -> Optional[ConversationSession]:
+        if self._db is None:
+            return None
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT summary, turns, updated_at FROM conversation_sessions WHERE session_id = ?",
+                (session_id,)).fetchone()
+        if row is None:
+            return None
+        summary, turns, updated_at = row
+        return ConversationSession(session_id, json.loads(turns), summary, updated_at)
+
+    def _save(self, session: ConversationSession) -> None:
+        if self._db is None:
+            return
+        with session.lock:
+            payload = (session.session_id, session.summary,
+                       json.dumps(list(session.turns), ensure_ascii=False), session.updated_at)
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO conversation_sessions (session_id, summary, turns, updated_at) "
+                "VALUES (?, ?, ?, ?)", payload)
+
+    # ──────────────────────────────────────────────────────────────────────
+    # 세션 관리
+    # ──────────────────────────────────────────────────────────────────────
+    def _evict_locked(self, now: float) -> None:
+        # 가장 오래 안 쓴 세션이 앞쪽에 있으므로 앞에서부터 정리
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if now - session.updated_at > self.idle_ttl:
+                self._stats["expired"] += 1
+            elif len(self._sessions) > self.max_sessions:
+                self._stats["evicted"] += 1
+            else:
+                break
+            del self._sessions[session_id]
+
+    def session(self, session_id=None) -> ConversationSession:
+        """세션을 가져오고 (없으면 SQLite에서 불러오거나 새로 만듦) 최근 사용으로 표시"""
+        session_id = str(session_id) if session_id is not None else DEFAULT_SESSION
+        now = time.time()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._sessions.move_to_end(session_id)
+                return session
+
+        loaded = self._load(session_id)
+        with self._lock:
+            # 불러오는 사이 다른 스레드가 만들었으면 그것을 사용
+            session = self._sessions.get(session_id)
+            if session is None:
+                if loaded is not None:
+                    session = loaded
+                    self._stats["loaded"] += 1
+                else:
+                    session = ConversationSession(session_id)
+                    self._stats["created"] += 1
+                session.updated_at = now
+                self._sessions[session_id] = session
+            self._sessions.move_to_end(session_id)
+            self._evict_locked(now)
+        return session
+
+    def messages(self, session_id=None) -> List[Dict[str, str]]:
+        """프롬프트에 넣을 대화 기록 (요약 + 최근 턴)"""
+        return self.session(session_id).messages()
+
+    def history(self, session_id=None) -> List[Dict[str, str]]:
+        """요약을 제외한 최근 턴"""
+        session = self.session(session_id)
+        with session.lock:
+            return list(session.turns)
+
+    def append(self, session_id, user_message: str, reply: str) -> None:
+        """한 턴을 추가하고, 버퍼를 넘친 턴은 요약 대기열로 옮김"""
+        session = self.session(session_id)
+        to_summarize = None
+        with session.lock:
+            session.turns.append({"role": "user", "content": user_message})
+            session.turns.append({"role": "assistant", "content": reply})
+            session.updated_at = time.time()
+            while len(session.turns) > self.max_turns * 2:
+                session.pending.append(session.turns.popleft())
+            if self.summarizer is None:
+                if session.pending:
+                    with self._lock:
+                        self._stats["dropped_turns"] += len(session.pending) // 2
+                    session.pending = []
+            elif len(session.pending) >= self.summarize_every * 2:
+                to_summarize, session.pending = session.pending, []
+                previous = session.summary
+
+        if to_summarize:
+            self._summarize(session, previous, to_summarize)
+        self._save(session)
+
+    def _summarize(self, session: ConversationSession, previous: str, messages: list) -> None:
+        # 요약 호출은 락 밖에서 (같은 세션의 다음 요청을 막지 않도록)
+        try:
+            summary = self.summarizer(previous, messages)
+        except Exception as e:
+            print(f"⚠️ 대화 요약 실패: {e}")
+            with self._lock:
+                self._stats["summary_failures"] += 1
+            with session.lock:
+                # 다음 기회에 다시 요약하도록 되돌림
+                session.pending = messages + session.pending
+            return
+        with session.lock:
+            session.summary = (summary or previous or "").strip()
+        with self._lock:
+            self._stats["summaries"] += 1
+
+    def reset(self, session_id=None) -> None:
+        """세션의 대화 기록과 요약을 모두 삭제"""
+        session_id = str(session_id) if session_id is not None else DEFAULT_SESSION
+        with self._lock:
+            self._sessions.pop(session_id, None)
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute("DELETE FROM conversation_sessions WHERE session_id = ?", (session_id,))
+
+    def stats(self) -> dict:
+        with self._lock:
+            data = dict(self._stats)
+            data["sessions"] = len(self._sessions)
+        data.update({"max_turns": self.max_turns, "max_sessions": self.max_sessions,
+                     "persistent": self._db is not None})
+        return data
+
+    @classmethod
+    def from_env(cls, summarizer=None) -> "ConversationStore":
+        """
+        환경 변수로 설정합니다.
+
+        ANT_CHAT_HISTORY_TURNS: 세션별 최근 턴 수 (기본 10)
+        ANT_CHAT_HISTORY_SESSIONS: 메모리에 유지할 세션 수 (기본 1000)
+        ANT_CHAT_HISTORY_IDLE_TTL: 유휴 세션 제거 시간(초, 기본 3600)
+        ANT_CHAT_HISTORY_PATH: SQLite 파일 경로 (없으면 메모리만)
+        ANT_CHAT_HISTORY_SUMMARY: on(기본) | off - 밀려난 턴 요약 여부
+        """
+        if os.getenv("ANT_CHAT_HISTORY_SUMMARY", "on").lower() == "off":
+            summarizer = None
+        return cls(
+            max_turns=int(os.getenv("ANT_CHAT_HISTORY_TURNS", "10")),
+            max_sessions=int(os.getenv("ANT_CHAT_HISTORY_SESSIONS", "1000")),
+            idle_ttl=float(os.getenv("ANT_CHAT_HISTORY_IDLE_TTL", "3600")),
+            summarizer=summarizer,
+            persist_path=os.getenv("ANT_CHAT_HISTORY_PATH") or None,
+        )
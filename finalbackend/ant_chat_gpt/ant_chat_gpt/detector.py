@@ -1,6 +1,10 @@
+from __future__ import annotations
+
 import os
 import re
 import json
+import threading
+import time
 from datetime import datetime
 from openai import OpenAI
 from dotenv import load_dotenv
@@ -10,6 +14,37 @@ from dotenv import load_dotenv
 
 # ✅ 실제 구현된 NewsScheduleExtractor 사용
 from .gpt_search.naver_text_extract import NewsScheduleExtractor
+from .cache import build_cache_from_env, make_key
+from .preclassifier import KoreanDatePreClassifier
+
+# 캐시에서 꺼낸 응답은 API를 호출하지 않았으므로 토큰 사용량 0으로 보고
+CACHED_USAGE = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0, "cached": True}
+
+# 단계별 토큰/지연시간 이동 평균 가중치
+STAGE_EWMA_ALPHA = 0.2
+
+# 아직 측정되지 않은 단계의 기본 비용 추정치 (gpt-4o-mini, 프롬프트 길이 + 짧은 메시지 기준)
+# ANT_CHAT_STAGE_COST='{"has_date": {"tokens": 300, "latency_ms": 500}}' 처럼 JSON으로 덮어쓸 수 있음
+DEFAULT_STAGE_COST = {
+    "has_date": {"tokens": 320.0, "latency_ms": 600.0},
+    "has_date_info": {"tokens": 320.0, "latency_ms": 600.0},
+    "extract_schedule": {"tokens": 450.0, "latency_ms": 1500.0},
+}
+
+
+def stage_cost_defaults_from_env() -> dict:
+    """DEFAULT_STAGE_COST에 ANT_CHAT_STAGE_COST(JSON)를 덮어쓴 단계별 기본 비용"""
+    defaults = {stage: dict(cost) for stage, cost in DEFAULT_STAGE_COST.items()}
+    raw = os.getenv("ANT_CHAT_STAGE_COST")
+    if not raw:
+        return defaults
+    try:
+        for stage, cost in json.loads(raw).items():
+            defaults[stage] = {"tokens": float(cost["tokens"]), "latency_ms": float(cost["latency_ms"])}
+    except (ValueError, TypeError, KeyError, AttributeError) as e:
+        print(f"⚠️ ANT_CHAT_STAGE_COST 형식 오류, 기본값 사용: {e}")
+        return {stage: dict(cost) for stage, cost in DEFAULT_STAGE_COST.items()}
+    return defaults
 
 
 class GPTDateDetector:
@@ -17,14 +52,133 @@ class GPTDateDetector:
     GPT를 사용해 메시지에 날짜 관련 정보가 포함되어 있는지 판단하는 클래스.
     일정 포함 여부 (True/False)와 토큰 사용량을 반환하며,
     일정이 없을 경우 일반 대화 답변도 생성할 수 있음.
+
+    has_date / has_date_info / extract_schedule 결과는 캐시에 저장되어,
+    같은 날 같은 메시지가 다시 오면 API 호출 없이 바로 반환됩니다.
+    프롬프트를 고치면 PROMPT_VERSIONS의 버전을 올려서 기존 캐시를 무효화하세요.
     """
-    def __init__(self, model="gpt-4o-mini"):
+    PROMPT_VERSIONS = {
+        "has_date": 1,
+        "has_date_info": 1,
+        "extract_schedule": 1,
+        "analyze": 1,
+    }
+
+    def __init__(self, model="gpt-4o-mini", cache=None, preclassifier=None, stage_cost_defaults=None):
         self.model = model
         self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
         self.conversation_history = []
-        self.crawlr = NewsScheduleExtractor(model=model)
+        self.cache = cache if cache is not None else build_cache_from_env()
+        self.crawlr = NewsScheduleExtractor(model=model, cache=self.cache, client=self.client)
+        # 단계별 실제 API 호출 비용 (이동 평균) - 단일 호출 모드의 절감량 추정에 사용
+        self.stage_stats: dict[str, dict] = {}
+        # 측정값이 없는 단계는 이 값으로 추정 (요청 스레드 여러 개가 동시에 갱신하므로 락으로 보호)
+        self.stage_cost_defaults = stage_cost_defaults if stage_cost_defaults is not None \
+            else stage_cost_defaults_from_env()
+        self._stage_lock = threading.Lock()
+        # 확실한 인사말/날짜 표현은 GPT 없이 로컬에서 판별 (ANT_CHAT_PRECLASSIFIER=off 로 끔)
+        if preclassifier is None and os.getenv("ANT_CHAT_PRECLASSIFIER", "on").lower() != "off":
+            preclassifier = KoreanDatePreClassifier(
+                threshold=float(os.getenv("ANT_CHAT_PRECLASSIFIER_THRESHOLD", "0.85")))
+        self.preclassifier = preclassifier
+
+    def _cached_call(self, template: str, message: str, compute) -> tuple:
+        """
+        (결과, 사용량)을 반환하는 compute()를 캐시로 감쌉니다.
+        키: 모델 + 프롬프트 템플릿 버전 + 정규화된 메시지 + 오늘 날짜
+        """
+        if self.cache is None:
+            return self._timed(template, compute)
 
-    def has_date(self, message: str) -> tuple[bool, dict]:
+        today = datetime.now().strftime("%Y-%m-%d")
+        key = make_key(self.model, template, self.PROMPT_VERSIONS[template], message, today)
+        hit = self.cache.get(key)
+        if hit is not None:
+            return hit[0], dict(CACHED_USAGE)
+
+        result, usage = self._timed(template, compute)
+        self.cache.set(key, [result, usage])
+        return result, usage
+
+    def _timed(self, template: str, compute) -> tuple:
+        started = time.perf_counter()
+        result, usage = compute()
+        self._record_stage(template, usage, (time.perf_counter() - started) * 1000)
+        return result, usage
+
+    def _record_stage(self, stage: str, usage: dict, latency_ms: float) -> None:
+        tokens = (usage or {}).get("total_tokens", 0)
+        with self._stage_lock:
+            stat = self.stage_stats.get(stage)
+            if stat is None:
+                self.stage_stats[stage] = {"calls": 1, "avg_tokens": float(tokens), "avg_latency_ms": latency_ms}
+                return
+            stat["calls"] += 1
+            stat["avg_tokens"] += STAGE_EWMA_ALPHA * (tokens - stat["avg_tokens"])
+            stat["avg_latency_ms"] += STAGE_EWMA_ALPHA * (latency_ms - stat["avg_latency_ms"])
+
+    def estimate_stage_cost(self, stages: list[str]) -> dict | None:
+        """
+        다단계 경로에서 stages를 실행했을 때의 평균 토큰/지연시간 추정치.
+        측정된 단계는 이동 평균을, 아직 측정되지 않은 단계는 stage_cost_defaults를 씁니다.
+        source: "measured"(모두 측정값) / "default"(모두 기본값) / "mixed"
+        측정값도 기본값도 없는 단계가 있으면 None.
+        """
+        tokens = latency_ms = 0.0
+        sources = set()
+        with self._stage_lock:
+            for stage in stages:
+                stat = self.stage_stats.get(stage)
+                if stat is not None:
+                    tokens += stat["avg_tokens"]
+                    latency_ms += stat["avg_latency_ms"]
+                    sources.add("measured")
+                elif stage in self.stage_cost_defaults:
+                    tokens += self.stage_cost_defaults[stage]["tokens"]
+                    latency_ms += self.stage_cost_defaults[stage]["latency_ms"]
+                    sources.add("default")
+                else:
+                    return None
+        return {
+            "tokens": tokens,
+            "latency_ms": latency_ms,
+            "source": sources.pop() if len(sources) == 1 else "mixed",
+        }
+
+    def stage_stats_snapshot(self) -> dict:
+        """단계별 이동 평균 복사본 (/health 등에서 읽기용)"""
+        with self._stage_lock:
+            return {stage: dict(stat) for stage, stat in self.stage_stats.items()}
+
+    def cache_stats(self) -> dict:
+        """LLM 응답 캐시 적중률 등 통계"""
+        return self.cache.stats() if self.cache is not None else {"backend": "off"}
+
+    def preclassify(self, message: str):
+        """로컬 사전 판별 결과 (PreClassification). 사전 판별기가 꺼져 있으면 None."""
+        if self.preclassifier is None:
+            return None
+        return self.preclassifier.classify(message)
+
+    def preclassifier_stats(self) -> dict:
+        """사전 판별기 로컬 처리 비율 등 통계"""
+        return self.preclassifier.stats() if self.preclassifier is not None else {"enabled": False}
+
+    def has_date(self, message: str, pre=None) -> tuple[bool, dict]:
+        """
+        일정 생성 의도 판별. 호출자가 이미 사전 판별했으면 그 결과(pre)를 넘겨서
+        같은 메시지를 두 번 판별(통계 중복 집계)하지 않게 합니다.
+        """
+        if pre is None:
+            pre = self.preclassify(message)
+        if pre is not None and pre.is_confident:
+            print(f"[사전 판별] {message} → {pre.label} ({pre.reason}, {pre.confidence})")
+            usage = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0,
+                     "preclassified": True, "confidence": pre.confidence}
+            return pre.label, usage
+        return self._cached_call("has_date", message, lambda: self._has_date(message))
+
+    def _has_date(self, message: str) -> tuple[bool, dict]:
         today = datetime.now().strftime("%Y-%m-%d")
         prompt = f"""
 아래 문장에 '일정을 생성하려는 의도'가 포함되어 있는지만 판단해주세요.
@@ -68,6 +222,9 @@ class GPTDateDetector:
             return False, usage
 
     def has_date_info(self, message: str) -> tuple[bool, dict]:
+        return self._cached_call("has_date_info", message, lambda: self._has_date_info(message))
+
+    def _has_date_info(self, message: str) -> tuple[bool, dict]:
         today = datetime.now().strftime("%Y-%m-%d")
 
         prompt = f"""
@@ -116,6 +273,9 @@ class GPTDateDetector:
         return text.strip()
 
     def extract_schedule(self, message: str) -> tuple[dict, dict]:
+        return self._cached_call("extract_schedule", message, lambda: self._extract_schedule(message))
+
+    def _extract_schedule(self, message: str) -> tuple[dict, dict]:
         today = datetime.now().strftime("%Y-%m-%d")
 
         prompt = f"""
@@ -163,25 +323,170 @@ class GPTDateDetector:
 
         return parsed, usage
 
-    def generate_simple_reply(self, user_input: str) -> str:
-        messages = self.conversation_history + [{"role": "user", "content": user_input}]
+    def analyze(self, message: str) -> tuple[dict, dict]:
+        """
+        일정 의도 판별 + 날짜 정보 판별 + 일정 추출을 한 번의 JSON 응답으로 처리합니다.
+        (has_date → has_date_info → extract_schedule 다단계 호출을 대체)
+
+        Returns:
+            ({"intent": bool, "has_date_info": bool, "events": [...]}, usage)
+        응답 형식이 어긋나면 ValueError를 발생시키므로, 호출자는 다단계 경로로 폴백할 수 있습니다.
+        """
+        return self._cached_call("analyze", message, lambda: self._analyze(message))
+
+    def _analyze(self, message: str) -> tuple[dict, dict]:
+        today = datetime.now().strftime("%Y-%m-%d")
+
+        prompt = f"""
+아래 문장을 분석해서 다음 JSON 형식으로만 답하세요.
+
+{{
+  "intent": true 또는 false,
+  "has_date_info": true 또는 false,
+  "events": [
+    {{
+      "start_date": "YYYY-MM-DD-HH:mm",
+      "end_date": "YYYY-MM-DD-HH:mm",
+      "title": "일정 내용"
+    }}
+  ]
+}}
+
+1. intent: 문장에 '일정을 생성하려는 의도'가 있으면 true.
+   - true 예: 플레이브 콘서트 언제 해?, BTS 콘서트 일정 알려줘, 내일 회의 있어, 3월 2일에 미팅 잡혔어
+   - false 예: 안녕, 잘 지내?, 나는 오늘 피곤해
+   - 날짜 정보(예: 오늘, 내일)가 없어도 일정 생성 의도가 있으면 true
+
+2. has_date_info: intent가 true이고, 날짜 또는 시간이 구체적으로 표현되어 있으면 true.
+   - true 예: 내일 회의 있어, 3월 2일 저녁에 약속 있음, 오늘 오후 2시에 전화하자
+   - false 예: 다음주에 뭐 할까?, 나중에 보자, 시간 정해서 만나자, 오아시스 내한 일정 알려줘
+
+3. events: has_date_info가 true일 때만 채우고, 아니면 빈 배열.
+   - "~부터", "~까지" 등의 표현은 start_date, end_date로 분리
+   - start_date와 end_date는 동일해도 허용
+   - "오늘", "내일", "모레", "다음 주" 등 상대 표현은 오늘 날짜({today})를 기준으로 변환
+
+문장: "{message}"
+"""
 
         response = self.client.chat.completions.create(
             model=self.model,
             messages=[
-                {"role": "system", "content": "너는 간단하고 따뜻하게 대답해주는 대화 파트너야."},
-                *messages
+                {"role": "system", "content": "당신은 사용자의 일정 생성 의도를 판별하고 일정을 추출하는 도우미입니다. JSON만 반환하세요."},
+                {"role": "user", "content": prompt}
             ],
-            temperature=0.7,
+            response_format={"type": "json_object"},
+            temperature=0,
         )
 
-        reply = response.choices[0].message.content.strip()
+        raw_reply = response.choices[0].message.content
+        try:
+            parsed = json.loads(self._clean_json_output(raw_reply))
+        except json.JSONDecodeError as e:
+            raise ValueError(f"analyze returned invalid JSON: {e}")
+
+        if not isinstance(parsed, dict) or not isinstance(parsed.get("intent"), bool):
+            raise ValueError(f"analyze returned unexpected shape: {raw_reply[:200]}")
+
+        events = parsed.get("events")
+        analysis = {
+            "intent": parsed["intent"],
+            "has_date_info": bool(parsed["intent"] and parsed.get("has_date_info")),
+            "events": events if isinstance(events, list) else [],
+        }
+        usage = response.usage.to_dict() if hasattr(response, "usage") else {}
+
+        return analysis, usage
+
+    # history를 넘기지 않을 때(단독 사용) 보관하는 최근 메시지 수
+    MAX_LOCAL_HISTORY = 20
+
+    def _reply_messages(self, user_input: str, history: list | None) -> list:
+        history = self.conversation_history if history is None else history
+        return [
+            {"role": "system", "content": "너는 간단하고 따뜻하게 대답해주는 대화 파트너야."},
+            *history,
+            {"role": "user", "content": user_input},
+        ]
 
+    def _remember_local(self, user_input: str, reply: str) -> None:
         self.conversation_history.append({"role": "user", "content": user_input})
         self.conversation_history.append({"role": "assistant", "content": reply})
+        # 무한히 늘어나지 않도록 최근 메시지만 유지
+        del self.conversation_history[:-self.MAX_LOCAL_HISTORY]
+
+    def generate_simple_reply(self, user_input: str, history: list | None = None) -> str:
+        """
+        일반 대화 답변 생성.
+        history(세션별 대화 기록)를 넘기면 그 기록만 사용하고 내부 기록은 건드리지 않습니다.
+        """
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=self._reply_messages(user_input, history),
+            temperature=0.7,
+        )
+
+        reply = response.choices[0].message.content.strip()
+
+        if history is None:
+            self._remember_local(user_input, reply)
 
         return reply
 
+    def generate_simple_reply_stream(self, user_input: str, history: list | None = None):
+        """generate_simple_reply의 스트리밍 버전. 답변 조각(str)을 생성되는 대로 내보냅니다."""
+        started = time.perf_counter()
+        stream = self.client.chat.completions.create(
+            model=self.model,
+            messages=self._reply_messages(user_input, history),
+            temperature=0.7,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+
+        parts = []
+        usage = None
+        for chunk in stream:
+            if getattr(chunk, "usage", None):
+                usage = chunk.usage.model_dump()
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield delta
+
+        self._record_stage("reply", usage, (time.perf_counter() - started) * 1000)
+        if history is None:
+            self._remember_local(user_input, "".join(parts).strip())
+
+    def summarize_conversation(self, previous_summary: str, messages: list) -> str:
+        """이전 요약에 밀려난 대화 턴을 합쳐 짧은 요약으로 만듭니다. (ConversationStore용)"""
+        transcript = "\n".join(
+            f"{'사용자' if m['role'] == 'user' else '어시스턴트'}: {m['content']}" for m in messages)
+        prompt = f"""
+다음은 이전 대화 요약과 그 이후의 대화입니다. 이어지는 대화에 필요한 사실(약속, 일정, 선호, 언급한 이름 등)만
+남겨서 5문장 이내의 한국어 요약으로 합쳐주세요. 요약만 출력하세요.
+
+[이전 요약]
+{previous_summary or "(없음)"}
+
+[대화]
+{transcript}
+"""
+
+        def compute():
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0,
+                max_tokens=300,
+            )
+            return response.choices[0].message.content.strip(), response.usage.model_dump()
+
+        summary, _ = self._timed("summarize", compute)
+        return summary
+
     def run_pipeline(self, message: str) -> dict | str:
         print(f"n📥 입력 메시지: {message}")
 
@@ -194,25 +499,29 @@ class GPTDateDetector:
             schedule, _ = self.extract_schedule(message)
             return schedule
         else:
-            try:
-                raw_json = self.crawlr.extraction(message)
+            return self.crawl_schedule(message)
 
-                # ✅ 크롤링 기반 추출 결과 출력
-                print("n📡 크롤링 기반 일정 추출 결과:")
-                print(json.dumps(raw_json, indent=2, ensure_ascii=False))
+    def crawl_schedule(self, message: str) -> dict:
+        """메시지에 구체적인 날짜가 없을 때 뉴스 검색 결과에서 일정을 추출"""
+        try:
+            raw_json = self.crawlr.extraction(message)
 
-                if isinstance(raw_json, str):
-                    parsed = json.loads(raw_json)
-                elif isinstance(raw_json, dict):
-                    parsed = raw_json
-                else:
-                    parsed = {"events": []}
+            # ✅ 크롤링 기반 추출 결과 출력
+            print("n📡 크롤링 기반 일정 추출 결과:")
+            print(json.dumps(raw_json, indent=2, ensure_ascii=False))
+
+            if isinstance(raw_json, str):
+                parsed = json.loads(raw_json)
+            elif isinstance(raw_json, dict):
+                parsed = raw_json
+            else:
+                parsed = {"events": []}
 
-                return parsed
+            return parsed
 
-            except Exception as e:
-                print(f"❌ 크롤링 실패: {e}")
-                return {"events": []}
+        except Exception as e:
+            print(f"❌ 크롤링 실패: {e}")
+            return {"events": []}
 
 
 if __name__ == "__main__":
@@ -0,0 +1,191 @@
+"""
+기사 본문 캐시와 중복 기사 제거
+
+인기 있는 주제(콘서트, 컴백)는 여러 사용자가 같은 시간대에 물어보므로 같은 뉴스 URL을
+계속 다시 받아 파싱하게 됩니다. 또 통신사 기사를 여러 언론사가 거의 그대로 싣기 때문에
+같은 내용이 GPT 프롬프트에 여러 번 들어갑니다.
+
+- ArticleCache: URL → 추출된 본문. TTL 안에는 그대로 사용하고, TTL이 지나면
+  ETag/Last-Modified로 조건부 요청(304면 다시 파싱하지 않음)을 보냅니다.
+- simhash/drop_near_duplicates: 본문 글자 shingle로 64비트 simhash를 만들어
+  해밍 거리가 가까운 기사(거의 같은 본문)는 하나만 남깁니다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+SIMHASH_BITS = 64
+# 서로 다른 기사는 해밍 거리가 보통 32 근처(20 아래는 드묾), 바이라인/꼬리말만 다른 전재 기사는 10 이하
+DUPLICATE_DISTANCE = 10
+
+
+class ArticleCache:
+    """
+    URL별 기사 본문 캐시 (스레드 안전, LRU)
+
+    Args:
+        max_size: 최대 보관 기사 수
+        ttl: 이 시간(초) 안에는 요청 없이 캐시된 본문 사용
+        max_age: 이 시간(초)이 지나면 조건부 요청도 하지 않고 새로 받음
+    """
+
+    def __init__(self, max_size: int = 512, ttl: float = 1800, max_age: float = 86400):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.max_age = max_age
+        self._data: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "revalidated": 0, "refetched": 0,
+                       "evictions": 0, "duplicates_dropped": 0, "chars_saved": 0}
+
+    def lookup(self, url: str) -> Tuple[Optional[str], Dict[str, str]]:
+        """
+        (신선한 본문, 조건부 요청 헤더) 반환.
+        본문이 None이면 요청이 필요하고, 헤더가 있으면 조건부 요청으로 보내면 됩니다.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(url)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None, {}
+            age = now - entry["fetched_at"]
+            if age > self.max_age:
+                del self._data[url]
+                self._stats["misses"] += 1
+                return None, {}
+            self._data.move_to_end(url)
+            if age <= self.ttl:
+                self._stats["hits"] += 1
+                return entry["text"], {}
+            headers = {}
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+            if not headers:
+                self._stats["misses"] += 1
+            return None, headers
+
+    def revalidated(self, url: str) -> Optional[str]:
+        """304 Not Modified를 받았을 때: 유효 시간을 갱신하고 캐시된 본문 반환"""
+        with self._lock:
+            entry = self._data.get(url)
+            if entry is None:
+                return None
+            entry["fetched_at"] = time.time()
+            self._stats["revalidated"] += 1
+            return entry["text"]
+
+    def store(self, url: str, text: str, etag: str = None, last_modified: str = None) -> None:
+        with self._lock:
+            if url in self._data:
+                self._stats["refetched"] += 1
+            self._data[url] = {"text": text, "etag": etag, "last_modified": last_modified,
+                               "fetched_at": time.time()}
+            self._data.move_to_end(url)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def record_duplicates(self, dropped: int, chars: int) -> None:
+        with self._lock:
+            self._stats["duplicates_dropped"] += dropped
+            self._stats["chars_saved"] += chars
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            data = dict(self._stats)
+            data["size"] = len(self._data)
+        lookups = data["hits"] + data["misses"] + data["revalidated"]
+        data["hit_ratio"] = round((data["hits"] + data["revalidated"]) / lookups, 4) if lookups else 0.0
+        data.update({"max_size": self.max_size, "ttl": self.ttl})
+        return data
+
+    @classmethod
+    def from_env(cls) -> "ArticleCache":
+        """
+        ARTICLE_CACHE_SIZE: 최대 보관 기사 수 (기본 512)
+        ARTICLE_CACHE_TTL: 요청 없이 재사용하는 시간(초, 기본 1800)
+        ARTICLE_CACHE_MAX_AGE: 조건부 요청으로 재사용할 수 있는 최대 시간(초, 기본 86400)
+        """
+        return cls(
+            max_size=int(os.getenv("ARTICLE_CACHE_SIZE", "512")),
+            ttl=float(os.getenv("ARTICLE_CACHE_TTL", "1800")),
+            max_age=float(os.getenv("ARTICLE_CACHE_MAX_AGE", "86400")),
+        )
+
+
+_cache: Optional[ArticleCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_article_cache() -> ArticleCache:
+    """프로세스 공용 기사 캐시 (NaverCrawler는 요청마다 새로 만들어지므로 캐시는 여기서 공유)"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ArticleCache.from_env()
+    return _cache
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# 중복 기사 제거 (simhash)
+# ──────────────────────────────────────────────────────────────────────────
+def _shingles(text: str, size: int) -> set:
+    # 한국어는 띄어쓰기/조사 차이가 커서 단어보다 글자 n-gram이 안정적
+    text = re.sub(r"\s+", "", text.lower())
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def simhash(text: str, shingle_size: int = 4) -> int:
+    """본문 글자 shingle로 만든 64비트 simhash (비슷한 본문일수록 해밍 거리가 작음)"""
+    weights = [0] * SIMHASH_BITS
+    for shingle in _shingles(text, shingle_size):
+        h = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def drop_near_duplicates(articles: List[Tuple[str, str]], max_distance: int = DUPLICATE_DISTANCE,
+                         shingle_size: int = 4) -> Tuple[List[Tuple[str, str]], List[str]]:
+    """
+    거의 같은 본문을 가진 기사를 제거합니다. 먼저 나온 기사(검색 순위가 높은 기사)를 남깁니다.
+
+    :param articles: [(url, text), ...]
+    :param max_distance: simhash 해밍 거리가 이 값 이하면 같은 기사로 봄
+    :return: (남은 기사 목록, 제거된 url 목록)
+    """
+    kept, dropped = [], []
+    fingerprints = []
+    for url, text in articles:
+        fingerprint = simhash(text, shingle_size)
+        if any(hamming(fingerprint, other) <= max_distance for other in fingerprints):
+            dropped.append(url)
+            continue
+        fingerprints.append(fingerprint)
+        kept.append((url, text))
+    return kept, dropped
@@ -0,0 +1,184 @@
+"""
+토큰 예산 안에서 기사 본문 고르기
+
+extract_from_texts는 수집한 기사 본문을 전부 이어 붙여 GPT에 보내서, 긴 기사가 걸리면
+프롬프트 토큰(비용, 지연시간)이 그만큼 늘어납니다. 일정 추출에 필요한 건 검색어와 관련 있고
+날짜/시간 표현이 들어 있는 문장들이므로, 문장 단위로 점수를 매겨 예산 안에서 높은 순으로 채웁니다.
+
+- 토큰 수: tiktoken이 있으면 모델 인코딩으로 세고, 없으면 글자 종류별 근사치를 씁니다.
+- 점수: 검색어 포함 + 글자 bigram 겹침 + 날짜/시간 표현 수 + 일정 표현(예정, 개최 ...) + 기사 첫 문장 가산
+- 고른 문장은 기사별로 원래 순서대로 다시 이어 붙입니다.
+- 전체가 예산 안이면 아무것도 빼지 않습니다.
+
+    packer = ContextPacker(budget=1500)
+    packed = packer.pack(page_texts, query="플레이브 콘서트")
+    packed.text, packed.tokens_before, packed.tokens_after, packed.tokens_saved
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import re
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional
+
+from ..preclassifier import ISO_DATE_RE, MONTH_DAY_RE, RELATIVE_RE, TIME_RE, WEEKDAY_RE
+
+# 날짜 표현 외에 일정 문장에 자주 나오는 말 ('~예정', '~부터', '~까지' 는 추출 프롬프트의 기준과 같음)
+EVENT_WORD_RE = re.compile(r"예정|개최|열린다|열리는|진행|발매|공개|시작|마감|예매|부터|까지|컴백|공연|발표")
+YEAR_MONTH_RE = re.compile(r"(?<!\d)(\d{4})\s*년|(?<!\d)(\d{1,2})\s*월(?!\s*\d)")
+SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+HANGUL_RE = re.compile(r"[가-힣]")
+
+# 문장 부호 없이 긴 덩어리는 이 길이(글자)로 나눔
+MAX_PASSAGE_CHARS = 400
+
+
+@lru_cache(maxsize=8)
+def _encoder(model: str):
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        # 인코딩 파일을 받을 수 없는 환경 등
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    """토큰 수 (tiktoken이 없으면 한글 1자 ≈ 1토큰, 그 밖의 글자 4자 ≈ 1토큰으로 근사)"""
+    encoder = _encoder(model)
+    if encoder is not None:
+        return len(encoder.encode(text))
+    hangul = len(HANGUL_RE.findall(text))
+    return hangul + math.ceil((len(text) - hangul) / 4)
+
+
+def split_passages(text: str) -> List[str]:
+    """본문을 문장 단위로 나눔 (너무 긴 덩어리는 MAX_PASSAGE_CHARS 근처 공백에서 자름)"""
+    passages = []
+    for sentence in SENTENCE_END_RE.split(text.strip()):
+        while len(sentence) > MAX_PASSAGE_CHARS:
+            cut = sentence.rfind(" ", 0, MAX_PASSAGE_CHARS)
+            cut = cut if cut > MAX_PASSAGE_CHARS // 2 else MAX_PASSAGE_CHARS
+            passages.append(sentence[:cut].strip())
+            sentence = sentence[cut:]
+        if sentence.strip():
+            passages.append(sentence.strip())
+    return passages
+
+
+def _bigrams(text: str) -> set:
+    text = re.sub(r"\s+", "", text.lower())
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+@dataclass
+class PackedContext:
+    text: str
+    tokens_before: int
+    tokens_after: int
+    passages_total: int
+    passages_kept: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+    def as_dict(self) -> dict:
+        return {
+            "tokens_before": self.tokens_before,
+            "tokens_after": self.tokens_after,
+            "tokens_saved": self.tokens_saved,
+            "passages_total": self.passages_total,
+            "passages_kept": self.passages_kept,
+        }
+
+
+class ContextPacker:
+    """
+    기사 본문들을 토큰 예산 안으로 줄이는 패커
+
+    Args:
+        budget: 기사 본문에 쓸 최대 토큰 수
+        model: 토큰 수를 셀 모델 (tiktoken 인코딩 선택용)
+    """
+
+    def __init__(self, budget: int = 1500, model: str = "gpt-4o-mini"):
+        self.budget = budget
+        self.model = model
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "packed": 0, "tokens_before": 0, "tokens_after": 0}
+        self.last: Optional[dict] = None
+
+    def score(self, passage: str, query_terms: List[str], query_bigrams: set, lead: bool) -> float:
+        score = 0.0
+        score += 2.0 * sum(1 for term in query_terms if term in passage)
+        if query_bigrams:
+            score += 3.0 * len(query_bigrams & _bigrams(passage)) / len(query_bigrams)
+        dates = (len(MONTH_DAY_RE.findall(passage)) + len(ISO_DATE_RE.findall(passage))
+                 + len(WEEKDAY_RE.findall(passage)) + len(RELATIVE_RE.findall(passage))
+                 + len(YEAR_MONTH_RE.findall(passage)))
+        score += 1.5 * min(dates, 4) + 0.5 * min(len(TIME_RE.findall(passage)), 2)
+        score += 0.5 * min(len(EVENT_WORD_RE.findall(passage)), 4)
+        if lead:
+            # 기사 첫 문장은 보통 누가/언제/무엇을 요약함
+            score += 1.0
+        return score
+
+    def pack(self, texts: List[str], query: str = "") -> PackedContext:
+        articles = [split_passages(text) for text in texts]
+        passages = [(a, i, p, count_tokens(p, self.model))
+                    for a, article in enumerate(articles) for i, p in enumerate(article)]
+        tokens_before = sum(tokens for *_, tokens in passages)
+
+        if tokens_before <= self.budget:
+            kept = passages
+        else:
+            query_terms = [term for term in (query or "").split() if len(term) >= 2]
+            query_bigrams = _bigrams(query or "")
+            ranked = sorted(passages, key=lambda p: (-self.score(p[2], query_terms, query_bigrams, p[1] == 0),
+                                                     p[0], p[1]))
+            kept, used = [], 0
+            for passage in ranked:
+                if used + passage[3] <= self.budget:
+                    kept.append(passage)
+                    used += passage[3]
+            kept.sort(key=lambda p: (p[0], p[1]))
+
+        by_article: dict = {}
+        for a, _, passage, _ in kept:
+            by_article.setdefault(a, []).append(passage)
+        text = "\n\n".join(" ".join(by_article[a]) for a in sorted(by_article))
+
+        packed = PackedContext(text=text, tokens_before=tokens_before,
+                               tokens_after=sum(p[3] for p in kept),
+                               passages_total=len(passages), passages_kept=len(kept))
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["packed"] += len(kept) < len(passages)
+            self._stats["tokens_before"] += packed.tokens_before
+            self._stats["tokens_after"] += packed.tokens_after
+            self.last = packed.as_dict()
+        return packed
+
+    def stats(self) -> dict:
+        with self._lock:
+            data = dict(self._stats)
+            last = self.last
+        data["tokens_saved"] = data["tokens_before"] - data["tokens_after"]
+        data.update({"budget": self.budget, "last": last,
+                     "tokenizer": "tiktoken" if _encoder(self.model) is not None else "estimate"})
+        return data
+
+    @classmethod
+    def from_env(cls, model: str = "gpt-4o-mini") -> "ContextPacker":
+        """NEWS_CONTEXT_TOKEN_BUDGET: 기사 본문 토큰 예산 (기본 1500)"""
+        return cls(budget=int(os.getenv("NEWS_CONTEXT_TOKEN_BUDGET", "1500")), model=model)
@@ -0,0 +1,266 @@
+"""
+뉴스 기사 HTML → 본문 텍스트 추출 엔진
+
+기사 페이지는 메뉴/광고/스크립트가 본문보다 훨씬 큰 경우가 많아서, 전체를 BeautifulSoup
+(html.parser)로 파싱하면 느리고 본문을 못 찾았을 때 body 전체(메뉴 포함)가 그대로 GPT에 들어갑니다.
+
+- LxmlExtractor: lxml로 파싱해서 네이버 뉴스(div#newsct_article)를 먼저 찾고, 없으면
+  문단 밀도(글자 수, 쉼표, 링크 비율) 점수로 본문 블록을 고릅니다. (readability 방식)
+- SoupExtractor: 기존 BeautifulSoup 방식 (lxml이 없을 때 사용)
+- decode_html: Content-Type, BOM, 앞부분 <meta charset>으로 인코딩을 정하고,
+  없을 때만 앞부분 샘플로 UTF-8/CP949를 판별합니다. (본문 전체에 apparent_encoding을 돌리지 않음)
+
+엔진은 NEWS_HTML_ENGINE=auto(기본)|lxml|bs4 로 고르고, register_extractor로 추가할 수 있습니다.
+"""
+
+from __future__ import annotations
+
+import codecs
+import os
+import re
+from typing import Callable, Dict, Optional
+
+# 다운로드/파싱할 최대 HTML 크기, GPT에 넘길 최대 본문 길이
+MAX_HTML_BYTES = int(os.getenv("NEWS_HTML_MAX_BYTES", str(2 * 1024 * 1024)))
+MAX_TEXT_CHARS = int(os.getenv("NEWS_TEXT_MAX_CHARS", "20000"))
+
+# 인코딩 판별에 보는 앞부분 크기
+SNIFF_BYTES = 4096
+SAMPLE_BYTES = 64 * 1024
+
+NAVER_ARTICLE_ID = "newsct_article"
+
+_CHARSET_HEADER = re.compile(r"charset=[\"']?\s*([\w.:-]+)", re.I)
+_META_CHARSET = re.compile(rb"<meta[^>]+charset\s*=\s*[\"']?\s*([\w.:-]+)", re.I)
+_XML_DECLARATION = re.compile(r"^\s*<\?xml[^>]*\?>")
+_WHITESPACE = re.compile(r"\s+")
+
+# 한국 사이트의 euc-kr 선언은 실제로 cp949(확장 완성형)인 경우가 많음
+_ENCODING_ALIASES = {"euc-kr": "cp949", "euc_kr": "cp949", "ks_c_5601-1987": "cp949", "ksc5601": "cp949"}
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# 인코딩
+# ──────────────────────────────────────────────────────────────────────────
+def _normalize_encoding(name) -> Optional[str]:
+    if not name:
+        return None
+    if isinstance(name, bytes):
+        name = name.decode("ascii", "ignore")
+    name = name.strip().lower()
+    name = _ENCODING_ALIASES.get(name, name)
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+def detect_encoding(content: bytes, content_type: Optional[str] = None) -> str:
+    """
+    HTML 인코딩 판별 (앞부분만 봄)
+
+    BOM → Content-Type charset → 앞 4KB의 <meta charset> → 앞 64KB 샘플이 UTF-8로 읽히면 UTF-8, 아니면 CP949
+    """
+    for bom, name in ((codecs.BOM_UTF8, "utf-8"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16")):
+        if content.startswith(bom):
+            return name
+
+    if content_type:
+        match = _CHARSET_HEADER.search(content_type)
+        encoding = _normalize_encoding(match.group(1)) if match else None
+        if encoding:
+            return encoding
+
+    match = _META_CHARSET.search(content[:SNIFF_BYTES])
+    encoding = _normalize_encoding(match.group(1)) if match else None
+    if encoding:
+        return encoding
+
+    sample = content[:SAMPLE_BYTES]
+    try:
+        sample.decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError as e:
+        # 샘플 끝에서 멀티바이트 문자가 잘린 경우는 UTF-8로 봄
+        if e.start >= len(sample) - 3 and e.reason == "unexpected end of data":
+            return "utf-8"
+    return "cp949"
+
+
+def decode_html(content: bytes, content_type: Optional[str] = None) -> str:
+    """MAX_HTML_BYTES까지만 잘라서 디코딩 (잘못된 바이트는 대체 문자로)"""
+    content = content[:MAX_HTML_BYTES]
+    return content.decode(detect_encoding(content, content_type), errors="replace")
+
+
+def clean_text(text: str) -> str:
+    """연속 공백 정리 + MAX_TEXT_CHARS로 자르기"""
+    return _WHITESPACE.sub(" ", text).strip()[:MAX_TEXT_CHARS]
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# 추출 엔진
+# ──────────────────────────────────────────────────────────────────────────
+class SoupExtractor:
+    """BeautifulSoup(html.parser) 기반 추출 (기존 방식, body 전체 대신 길이 제한 적용)"""
+
+    name = "bs4"
+
+    def extract(self, html: str) -> str:
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(html[:MAX_HTML_BYTES], "html.parser")
+        for tag in soup(["script", "style", "noscript"]):
+            tag.decompose()
+
+        naver_main = soup.select_one(f"div#{NAVER_ARTICLE_ID}")
+        if naver_main:
+            return clean_text(naver_main.get_text(" ", strip=True))
+
+        candidates = [
+            soup.find("article"),
+            soup.find("div", class_="content"),
+            soup.find("main"),
+            soup.find("body")
+        ]
+        for c in candidates:
+            if c and c.get_text(strip=True):
+                return clean_text(c.get_text(" ", strip=True))
+        return ""
+
+
+class LxmlExtractor:
+    """
+    lxml 기반 빠른 추출
+
+    네이버 뉴스는 본문 div를 바로 찾고, 다른 사이트는 문단 밀도로 본문 블록을 고릅니다.
+    """
+
+    name = "lxml"
+
+    # 본문이 아닌 영역 (통째로 제거)
+    BOILERPLATE_TAGS = ("script", "style", "noscript", "nav", "header", "footer", "aside",
+                        "form", "iframe", "button", "select", "svg")
+    # 문단 안에 들어가는 인라인 태그 (글자 수를 문단에 합산)
+    INLINE_TAGS = frozenset(("a", "b", "strong", "i", "em", "span", "font", "u", "mark", "sup", "sub", "br"))
+    # 클래스/id에 이런 단어가 있으면 본문 후보 점수를 깎음
+    NEGATIVE_HINT = re.compile(r"comment|reply|footer|menu|nav|sidebar|aside|banner|ad[-_]|promo|related|rank|"
+                               r"popular|share|sns|copyright", re.I)
+    POSITIVE_HINT = re.compile(r"article|body|content|news|text|view|story|post", re.I)
+    MIN_PARAGRAPH_CHARS = 25
+
+    def __init__(self):
+        import lxml.html  # noqa: F401 - 설치 여부 확인 (없으면 ImportError)
+
+    def extract(self, html: str) -> str:
+        import lxml.html
+        from lxml import etree
+
+        html = _XML_DECLARATION.sub("", html[:MAX_HTML_BYTES], count=1)
+        if not html.strip():
+            return ""
+        try:
+            doc = lxml.html.document_fromstring(html)
+        except (etree.ParserError, ValueError):
+            return ""
+
+        etree.strip_elements(doc, etree.Comment, *self.BOILERPLATE_TAGS, with_tail=False)
+
+        naver_main = doc.xpath(f"//div[@id='{NAVER_ARTICLE_ID}']")
+        if naver_main:
+            return self._text(naver_main[0])
+
+        best = self._best_candidate(doc)
+        if best is not None:
+            return self._text(best)
+
+        for xpath in ("//article", "//div[contains(concat(' ', normalize-space(@class), ' '), ' content ')]",
+                      "//main", "//body"):
+            found = doc.xpath(xpath)
+            if found:
+                text = self._text(found[0])
+                if text:
+                    return text
+        return ""
+
+    @staticmethod
+    def _text(element) -> str:
+        return clean_text(" ".join(t.strip() for t in element.itertext() if t.strip()))
+
+    def _own_text(self, element) -> str:
+        """요소에 직접 속한 텍스트 (인라인 자식 포함, 블록 자식 제외)"""
+        parts = [element.text or ""]
+        for child in element:
+            if isinstance(child.tag, str) and child.tag in self.INLINE_TAGS:
+                parts.append(child.text_content())
+            parts.append(child.tail or "")
+        return "".join(parts).strip()
+
+    def _class_weight(self, element) -> float:
+        hint = f"{element.get('class', '')} {element.get('id', '')}"
+        weight = 0.0
+        if self.NEGATIVE_HINT.search(hint):
+            weight -= 25
+        if self.POSITIVE_HINT.search(hint):
+            weight += 25
+        return weight
+
+    def _best_candidate(self, doc):
+        scores: Dict = {}
+        for element in doc.iter("p", "div", "td", "pre", "section", "article"):
+            own = self._own_text(element)
+            if len(own) < self.MIN_PARAGRAPH_CHARS:
+                continue
+            score = 1 + own.count(",") + own.count("다.") + min(len(own) / 100, 3)
+            # <p>는 부모 블록이 본문, <br>로 줄을 나눈 div/td는 자기 자신이 본문
+            parent = element.getparent()
+            if element.tag == "p":
+                targets = (parent, parent.getparent() if parent is not None else None)
+            else:
+                targets = (element, parent)
+            for target, share in zip(targets, (1.0, 0.5)):
+                if target is None or not isinstance(target.tag, str):
+                    continue
+                if target not in scores:
+                    scores[target] = self._class_weight(target)
+                scores[target] += score * share
+
+        best, best_score = None, 0.0
+        for element, score in scores.items():
+            text_length = len(element.text_content()) or 1
+            link_length = sum(len(a.text_content()) for a in element.iter("a"))
+            score *= 1 - link_length / text_length
+            if score > best_score:
+                best, best_score = element, score
+        return best
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# 엔진 선택
+# ──────────────────────────────────────────────────────────────────────────
+EXTRACTORS: Dict[str, Callable[[], object]] = {
+    "lxml": LxmlExtractor,
+    "bs4": SoupExtractor,
+}
+
+
+def register_extractor(name: str, factory: Callable[[], object]) -> None:
+    """extract(html) -> str 메서드를 가진 엔진 등록"""
+    EXTRACTORS[name] = factory
+
+
+def get_extractor(name: Optional[str] = None):
+    """
+    추출 엔진 생성. name이 없으면 NEWS_HTML_ENGINE (기본 auto: lxml이 있으면 lxml, 없으면 bs4)
+    """
+    name = (name or os.getenv("NEWS_HTML_ENGINE", "auto")).lower()
+    if name == "auto":
+        try:
+            return LxmlExtractor()
+        except ImportError:
+            return SoupExtractor()
+    try:
+        factory = EXTRACTORS[name]
+    except KeyError:
+        raise ValueError(f"unknown html extractor: {name} (choose from {', '.join(EXTRACTORS)})") from None
+    return factory()
@@ -1,8 +1,15 @@
-import requests
-from bs4 import BeautifulSoup
 import os
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlparse
 from dotenv import load_dotenv
 
+from ..common.http_client import get_session
+from .article_cache import get_article_cache
+from .html_extract import MAX_HTML_BYTES, decode_html, get_extractor
+
 # .env에서 API 키 불러오기
 # Environment variables are now loaded globally in backend_new.py
 
@@ -11,14 +18,32 @@ class NaverCrawler:
     """
     네이버 뉴스 검색 및 본문 추출 기능을 제공하는 클래스
     """
-    def __init__(self):
+    # 동시 본문 수집 기본값 (extract_texts)
+    FETCH_DEADLINE = 8.0        # 전체 수집 제한 시간(초)
+    FETCH_MAX_WORKERS = 5       # 동시에 받는 기사 수
+    FETCH_PER_HOST = 2          # 같은 호스트에 동시에 보내는 요청 수
+
+    # 본문을 얻지 못했을 때 extract_text가 돌려주는 문구 (캐시하지 않고 프롬프트에도 넣지 않음)
+    NO_TEXT = "본문 없음"
+    FETCH_FAILED = "본문 추출 실패"
+
+    def __init__(self, article_cache=None, extractor=None):
         self.base_url = "https://openapi.naver.com/v1/search/news.json"
         self.headers = {
             "X-Naver-Client-Id": os.getenv("NAVER_CLIENT_ID"),
             "X-Naver-Client-Secret": os.getenv("NAVER_CLIENT_SECRET")
         }
+        # keep-alive 연결을 재사용하는 공용 세션 (호스트별 풀, 재시도, 기본 timeout)
+        self.http = get_session()
+        # 기사 본문 캐시 (기본: 프로세스 공용, TTL + 조건부 요청)
+        self.article_cache = article_cache or get_article_cache()
+        # 본문 추출 엔진 (기본: lxml이 있으면 lxml, 없으면 BeautifulSoup - NEWS_HTML_ENGINE)
+        self.extractor = extractor or get_extractor()
 
     def search(self, query, display=5):  # ✅ display 기본값을 5개로 증가
+        # bs4는 실제로 검색할 때 불러옴 (서버 시작 시간 단축)
+        from bs4 import BeautifulSoup
+
         params = {
             "query": query,
             "display": display,
@@ -26,7 +51,7 @@ class NaverCrawler:
         }
 
         try:
-            res = requests.get(self.base_url, headers=self.headers, params=params)
+            res = self.http.get(self.base_url, headers=self.headers, params=params)
             res.raise_for_status()
             items = res.json().get("items", [])
 
@@ -49,35 +74,116 @@ class NaverCrawler:
             return []
 
     def extract_text(self, url):
+        cached, conditional = self.article_cache.lookup(url)
+        if cached is not None:
+            print(f"📝 본문 캐시 사용: {url}")
+            return cached
+
         try:
-            headers = {"User-Agent": "Mozilla/5.0"}
-            res = requests.get(url, headers=headers, timeout=5)
-            res.encoding = res.apparent_encoding
-            soup = BeautifulSoup(res.text, "html.parser")
-
-            naver_main = soup.select_one("div#newsct_article")
-            if naver_main:
-                text = naver_main.get_text(" ", strip=True)
-            else:
-                candidates = [
-                    soup.find("article"),
-                    soup.find("div", class_="content"),
-                    soup.find("main"),
-                    soup.find("body")
-                ]
-
-                text = ""
-                for c in candidates:
-                    if c and c.get_text(strip=True):
-                        text = c.get_text(" ", strip=True)
-                        break
+            headers = {"User-Agent": "Mozilla/5.0", **conditional}
+            res = self.http.get(url, headers=headers, timeout=5, stream=True)
+            if res.status_code == 304:
+                res.close()
+                text = self.article_cache.revalidated(url)
+                if text is not None:
+                    print(f"📝 본문 변경 없음(304): {url}")
+                    return text
+                # 그 사이 캐시에서 밀려났으면 조건 없이 다시 받음
+                res = self.http.get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=5, stream=True)
+            if not res.ok:
+                # 404/5xx 오류 페이지는 본문으로 파싱하거나 ETag와 함께 캐시하지 않음
+                res.close()
+                res.raise_for_status()
+            html = decode_html(self._read_capped(res), res.headers.get("Content-Type"))
+            text = self.parse_article(html)
 
             if not text:
-                text = "본문 없음"
+                return self.NO_TEXT
 
+            self.article_cache.store(url, text, etag=res.headers.get("ETag"),
+                                     last_modified=res.headers.get("Last-Modified"))
             print(f"📝 본문 길이: {len(text)}")
             print(f"📝 본문 내용 앞부분: {text[:200]}...")  # ✅ 미리보기 출력
             return text
         except Exception as e:
             print("❌ 본문 추출 실패:", e)
-            return "본문 추출 실패"
+            return self.FETCH_FAILED
+
+    @staticmethod
+    def _read_capped(res, limit=MAX_HTML_BYTES):
+        """응답 본문을 limit 바이트까지만 받음 (너무 큰 페이지는 나머지를 버리고 연결 종료)"""
+        chunks, size = [], 0
+        try:
+            for chunk in res.iter_content(chunk_size=64 * 1024):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= limit:
+                    break
+        finally:
+            res.close()
+        return b"".join(chunks)[:limit]
+
+    def parse_article(self, html):
+        """기사 HTML에서 본문 텍스트 추출 (없으면 빈 문자열)"""
+        return self.extractor.extract(html)
+
+    def extract_texts(self, urls, deadline=None, max_workers=None, per_host=None):
+        """
+        여러 기사 본문을 스레드 풀로 동시에 수집합니다.
+
+        - deadline(초) 안에 끝난 기사만 반환하고, 늦은 기사는 기다리지 않습니다.
+        - 같은 호스트로는 per_host개까지만 동시에 요청합니다.
+
+        :return: [(url, text), ...] - 입력 순서 유지, 시간 안에 끝난 것만
+        """
+        deadline = self.FETCH_DEADLINE if deadline is None else deadline
+        max_workers = max_workers or self.FETCH_MAX_WORKERS
+        per_host = per_host or self.FETCH_PER_HOST
+        if not urls:
+            return []
+
+        host_slots = defaultdict(lambda: threading.BoundedSemaphore(per_host))
+        slots_lock = threading.Lock()
+        expires_at = time.monotonic() + deadline
+
+        def fetch(url):
+            with slots_lock:
+                slot = host_slots[urlparse(url).netloc]
+            remaining = expires_at - time.monotonic()
+            if remaining <= 0 or not slot.acquire(timeout=remaining):
+                return None
+            try:
+                return self.extract_text(url)
+            finally:
+                slot.release()
+
+        started = time.monotonic()
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, len(urls)),
+                                      thread_name_prefix="naver-fetch")
+        futures = {executor.submit(fetch, url): i for i, url in enumerate(urls)}
+        results = {}
+        pending = set(futures)
+        try:
+            while pending:
+                remaining = expires_at - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        text = future.result()
+                    except Exception as e:
+                        print("❌ 본문 추출 실패:", e)
+                        continue
+                    if text is not None:
+                        results[futures[future]] = text
+        finally:
+            # 늦은 요청은 기다리지 않고 버림 (각 요청은 extract_text의 timeout으로 끝남)
+            # 아직 시작하지 않은 요청은 취소 (shutdown(cancel_futures=True)는 3.9+라 직접 취소)
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+        elapsed = time.monotonic() - started
+        print(f"⏱️ 기사 {len(urls)}건 중 {len(results)}건 수집 ({elapsed:.2f}s, 제한 {deadline}s)")
+        return [(urls[i], results[i]) for i in sorted(results)]
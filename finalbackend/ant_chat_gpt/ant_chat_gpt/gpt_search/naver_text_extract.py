@@ -1,4 +1,7 @@
 from .naver_crawler import NaverCrawler
+from .article_cache import drop_near_duplicates
+from .context_packer import ContextPacker
+from ..common.cache import make_key
 from openai import OpenAI
 from datetime import datetime
 from dotenv import load_dotenv
@@ -8,23 +11,32 @@ import re
 
 # ✅ 환경 변수 불러오기
 # Environment variables are now loaded globally in backend_new.py
-print(f"DEBUG: OPENAI_API_KEY from .env: {os.getenv('OPENAI_API_KEY')}")
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 class NewsScheduleExtractor:
     """
     기사 본문들로부터 일정 정보를 추출하는 클래스
     """
-    def __init__(self, model="gpt-4o-mini"):
+    SEARCH_QUERY_PROMPT_VERSION = 1
+
+    def __init__(self, model="gpt-4o-mini", cache=None, client=None, packer=None):
         self.model = model
-        self.client = client
+        # 호출자(GPTDateDetector)의 클라이언트를 공유, 없으면 여기서 생성
+        self.client = client or OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.cache = cache
+        # 기사 본문을 토큰 예산 안으로 줄임 (NEWS_CONTEXT_TOKEN_BUDGET)
+        self.packer = packer or ContextPacker.from_env(model=model)
 
     def _clean_json_output(self, text):
         return re.sub(r"^```json|```$", "", text.strip()).strip()
 
-    def extract_from_texts(self, page_texts):
+    def extract_from_texts(self, page_texts, query=""):
         today = datetime.now().strftime("%Y-%m-%d")
-        content = "nn".join(page_texts)
+        # 검색어 관련도/날짜 표현이 많은 문장부터 예산 안에서 채움
+        packed = self.packer.pack(page_texts, query=query)
+        if packed.tokens_saved:
+            print(f"🧮 기사 본문 토큰 {packed.tokens_before} → {packed.tokens_after} "
+                  f"({packed.tokens_saved} 절약, 문장 {packed.passages_kept}/{packed.passages_total})")
+        content = packed.text
         prompt = f'''
 다음 뉴스 기사 본문 내용에서 일정 정보를 추출해 아래 JSON 형식으로 반환하세요:
 
@@ -74,6 +86,16 @@ start와 end는 동일해도 허용됩니다.
         """
         사용자의 문장에서 웹 검색용 핵심 키워드만 추출
         """
+        cache_key = None
+        if self.cache is not None:
+            today = datetime.now().strftime("%Y-%m-%d")
+            cache_key = make_key(self.model, "extract_search_query",
+                                 self.SEARCH_QUERY_PROMPT_VERSION, user_input, today)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                print(f"🔍 추출된 검색어(캐시): {cached}")
+                return cached
+
         prompt = f"""
 다음 문장에서 웹 검색에 사용할 수 있는 핵심 키워드를 간결하게 뽑아줘.
 날짜, '일정', '알려줘' 같은 일반적인 표현은 제외하고, 핵심 주제만 남겨줘.
@@ -98,6 +120,8 @@ start와 end는 동일해도 허용됩니다.
             )
             keyword = response.choices[0].message.content.strip().strip('"')
             print(f"🔍 추출된 검색어: {keyword}")  # ✅ 키워드 출력
+            if cache_key is not None:
+                self.cache.set(cache_key, keyword)
             return keyword
         except Exception as e:
             print(f"❌ OpenAI 호출 실패: {e}")
@@ -124,14 +148,31 @@ start와 end는 동일해도 허용됩니다.
             print("❌ 뉴스 검색 결과 없음")
             return {"events": []}
 
-        page_texts = []
         for item in search_results:
             print(f"n📰 기사 제목: {item['title']}")
-            text = crawler.extract_text(item["link"])
+
+        # ✅ 기사 본문은 동시에 수집하고, 제한 시간 안에 끝난 것만 사용
+        fetched = crawler.extract_texts([item["link"] for item in search_results])
+        fetched = [(url, text) for url, text in fetched
+                   if text not in (crawler.NO_TEXT, crawler.FETCH_FAILED)]
+
+        # ✅ 여러 언론사에 실린 거의 같은 기사는 하나만 GPT에 보냄
+        texts_by_url = dict(fetched)
+        fetched, dropped = drop_near_duplicates(fetched)
+        if dropped:
+            saved = sum(len(texts_by_url[url]) for url in dropped)
+            crawler.article_cache.record_duplicates(len(dropped), saved)
+            print(f"🧹 중복 기사 {len(dropped)}건 제외 ({saved}자 절약)")
+        page_texts = []
+        for url, text in fetched:
             print(f"📄 본문 길이: {len(text)}, 앞부분: {text[:100]}...")  # ✅ 본문 미리보기
             page_texts.append(text)
 
-        result = self.extract_from_texts(page_texts)
+        if not page_texts:
+            print("❌ 제한 시간 안에 수집된 기사 없음")
+            return {"events": []}
+
+        result = self.extract_from_texts(page_texts, query=extracted_query)
 
         print("n📅 추출된 일정 JSON:n", result)
 
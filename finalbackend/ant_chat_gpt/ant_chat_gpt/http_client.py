@@ -0,0 +1,7 @@
+"""
+공용 HTTP 클라이언트 (구현은 ant_chat_gpt.common.http_client, 기존 import 경로 호환용)
+"""
+
+from .common.http_client import DEFAULT_TIMEOUT, HOST_POOL_SIZES, build_retry, create_session, get_session
+
+__all__ = ["DEFAULT_TIMEOUT", "HOST_POOL_SIZES", "build_retry", "create_session", "get_session"]
@@ -0,0 +1,300 @@
+"""
+백그라운드 작업 큐
+
+뉴스 크롤링 기반 일정 추출(검색어 LLM 호출 → 네이버 검색 → 기사 수집 → 추출 LLM 호출)은
+수십 초가 걸릴 수 있어 요청 스레드에서 돌리지 않고 작업으로 넘깁니다.
+
+- 작업은 SQLite 테이블에 기록되고 프로세스 안의 워커 스레드가 꺼내 실행합니다.
+  실행 중인 작업에는 가져간 큐의 owner id가 붙고, 각 큐는 워커 루프에서 heartbeat를 남깁니다.
+  heartbeat가 끊긴(죽은 프로세스의) 실행 중 작업은 다시 대기 상태로 돌아갑니다.
+  정상 종료(stop)한 큐의 작업은 재시작 즉시, 비정상 종료한 큐의 작업은 heartbeat_timeout 뒤에 복구됩니다.
+- dedupe_key가 같은 작업이 대기/실행 중이면 새로 만들지 않고 그 작업 id를 돌려줍니다.
+  (reuse_ttl 안에 끝난 같은 작업도 결과를 재사용)
+- wait()로 완료를 기다릴 수 있어 long-poll/SSE 엔드포인트에서 사용합니다.
+
+    queue = JobQueue(path="jobs.sqlite3", workers=2)
+    queue.register("crawl_schedule", lambda payload: crawl(payload["message"]))
+    job_id = queue.submit("crawl_schedule", {"message": msg}, dedupe_key=msg)
+    job = queue.wait(job_id, timeout=10)   # {"id", "status", "result", ...}
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+FINISHED = (DONE, FAILED)
+
+
+class JobQueue:
+    """
+    SQLite 기반 작업 큐 + 프로세스 내 워커 풀
+
+    Args:
+        path: SQLite 파일 경로 (":memory:"면 재시작 시 사라짐)
+        workers: 워커 스레드 수
+        result_ttl: 끝난 작업을 보관하는 시간(초)
+        reuse_ttl: 이 시간(초) 안에 끝난 같은 dedupe_key 작업은 결과를 재사용 (0이면 재사용 안 함)
+        stale_after: 다른 큐가 이 시간(초) 넘게 실행 중으로 잡고 있는 작업은 멈춘 것으로 보고 다시 대기열에 넣음
+        heartbeat_timeout: 이 시간(초) 동안 heartbeat가 없는 큐는 죽은 것으로 보고 그 큐의 실행 중 작업을 복구
+    """
+
+    def __init__(self, path: str = ":memory:", workers: int = 2, result_ttl: float = 3600,
+                 reuse_ttl: float = 300, stale_after: float = 600, heartbeat_timeout: float = 30):
+        self.path = path
+        self.workers = workers
+        self.result_ttl = result_ttl
+        self.reuse_ttl = reuse_ttl
+        self.stale_after = stale_after
+        self.heartbeat_timeout = heartbeat_timeout
+        # 이 큐 인스턴스(프로세스)를 구분하는 id. 실행 중 작업에 붙여 누가 잡고 있는지 기록
+        self.owner = uuid.uuid4().hex
+        self._heartbeat_interval = max(heartbeat_timeout / 3, 0.05)
+        self._last_heartbeat = 0.0
+        self._handlers: Dict[str, Callable[[dict], Any]] = {}
+        self._cond = threading.Condition()
+        self._threads = []
+        self._stopped = False
+        self._stats = {"submitted": 0, "deduplicated": 0, "reused": 0,
+                       "completed": 0, "failed": 0, "recovered": 0, "run_time_total": 0.0}
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "  id TEXT PRIMARY KEY,"
+            "  kind TEXT NOT NULL,"
+            "  dedupe_key TEXT,"
+            "  payload TEXT NOT NULL,"
+            "  status TEXT NOT NULL,"
+            "  result TEXT,"
+            "  error TEXT,"
+            "  created_at REAL NOT NULL,"
+            "  started_at REAL,"
+            "  finished_at REAL,"
+            "  owner TEXT"
+            ")")
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(jobs)")}
+        if "owner" not in columns:
+            # owner 컬럼이 없던 이전 버전 파일
+            self._db.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_jobs_dedupe ON jobs (kind, dedupe_key, status)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS job_owners ("
+            "  owner TEXT PRIMARY KEY,"
+            "  heartbeat_at REAL NOT NULL"
+            ")")
+
+        # 이전 프로세스에서 실행하다 멈춘 작업은 다시 대기열로
+        with self._cond:
+            self._heartbeat_locked(time.time())
+
+    # ──────────────────────────────────────────────────────────────────────
+    # 등록 / 제출
+    # ──────────────────────────────────────────────────────────────────────
+    def register(self, kind: str, handler: Callable[[dict], Any]) -> None:
+        """kind 작업을 처리할 함수 등록. handler(payload) 반환값이 JSON으로 저장됩니다."""
+        with self._cond:
+            self._handlers[kind] = handler
+        self.start()
+
+    def submit(self, kind: str, payload: dict, dedupe_key: Optional[str] = None) -> str:
+        """작업을 대기열에 넣고 id 반환 (같은 작업이 이미 있으면 그 id)"""
+        now = time.time()
+        with self._cond:
+            if dedupe_key is not None:
+                # 죽은 큐가 잡고 있던 작업에 합쳐지지 않도록 먼저 복구
+                self._recover_locked(now)
+                row = self._db.execute(
+                    "SELECT id, status, finished_at FROM jobs "
+                    "WHERE kind = ? AND dedupe_key = ? AND status != ? "
+                    "ORDER BY created_at DESC LIMIT 1",
+                    (kind, dedupe_key, FAILED)).fetchone()
+                if row is not None:
+                    job_id, status, finished_at = row
+                    if status in (QUEUED, RUNNING):
+                        self._stats["deduplicated"] += 1
+                        return job_id
+                    if self.reuse_ttl and finished_at and now - finished_at < self.reuse_ttl:
+                        self._stats["reused"] += 1
+                        return job_id
+
+            job_id = uuid.uuid4().hex
+            self._db.execute(
+                "INSERT INTO jobs (id, kind, dedupe_key, payload, status, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, kind, dedupe_key, json.dumps(payload, ensure_ascii=False), QUEUED, now))
+            self._stats["submitted"] += 1
+            self._prune_locked(now)
+            self._cond.notify_all()
+        self.start()
+        return job_id
+
+    # ──────────────────────────────────────────────────────────────────────
+    # 조회
+    # ──────────────────────────────────────────────────────────────────────
+    def _row_to_job(self, row) -> dict:
+        job_id, kind, status, result, error, created_at, started_at, finished_at = row
+        return {
+            "id": job_id,
+            "kind": kind,
+            "status": status,
+            "result": json.loads(result) if result is not None else None,
+            "error": error,
+            "created_at": created_at,
+            "started_at": started_at,
+            "finished_at": finished_at,
+        }
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """작업 상태/결과 (없으면 None)"""
+        with self._cond:
+            row = self._db.execute(
+                "SELECT id, kind, status, result, error, created_at, started_at, finished_at "
+                "FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row is not None else None
+
+    def wait(self, job_id: str, timeout: float = 30.0) -> Optional[dict]:
+        """작업이 끝나거나 timeout이 지날 때까지 기다린 뒤 현재 상태를 반환"""
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None or job["status"] in FINISHED:
+                return job
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return job
+            with self._cond:
+                # 작업이 끝날 때마다 notify_all 되므로 짧게 나눠 기다림
+                self._cond.wait(min(remaining, 1.0))
+
+    # ──────────────────────────────────────────────────────────────────────
+    # 워커
+    # ──────────────────────────────────────────────────────────────────────
+    def start(self) -> None:
+        with self._cond:
+            self._stopped = False
+            self._threads = [t for t in self._threads if t.is_alive()]
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._worker, name=f"job-worker-{len(self._threads)}",
+                                          daemon=True)
+                self._threads.append(thread)
+                thread.start()
+
+    def stop(self) -> None:
+        """워커를 멈추고 heartbeat를 지움 (남은 실행 중 작업은 다음 큐가 바로 복구)"""
+        with self._cond:
+            self._stopped = True
+            self._db.execute("DELETE FROM job_owners WHERE owner = ?", (self.owner,))
+            self._cond.notify_all()
+
+    def _heartbeat_locked(self, now: float) -> None:
+        """이 큐가 살아 있음을 기록하고 죽은 큐의 작업을 복구"""
+        self._db.execute(
+            "INSERT OR REPLACE INTO job_owners (owner, heartbeat_at) VALUES (?, ?)",
+            (self.owner, now))
+        self._last_heartbeat = now
+        self._recover_locked(now)
+
+    def _recover_locked(self, now: float) -> int:
+        """
+        다른 큐가 잡고 있는 실행 중 작업 중
+        - 그 큐의 heartbeat가 heartbeat_timeout 넘게 없거나(owner 없음 포함),
+        - stale_after 넘게 실행 중인 것
+        을 다시 대기열로 돌림. 이 큐가 실행 중인 작업은 워커 스레드가 아직 잡고 있으므로 건드리지 않음
+        """
+        self._db.execute("DELETE FROM job_owners WHERE heartbeat_at < ?", (now - self.heartbeat_timeout,))
+        cur = self._db.execute(
+            "UPDATE jobs SET status = ?, started_at = NULL, owner = NULL "
+            "WHERE status = ? AND (owner IS NULL OR owner != ?) AND ("
+            "  owner IS NULL OR owner NOT IN (SELECT owner FROM job_owners) OR started_at < ?)",
+            (QUEUED, RUNNING, self.owner, now - self.stale_after))
+        if cur.rowcount:
+            self._stats["recovered"] += cur.rowcount
+            self._cond.notify_all()
+        return cur.rowcount
+
+    def _claim_locked(self):
+        kinds = list(self._handlers)
+        if not kinds:
+            return None
+        placeholders = ", ".join("?" for _ in kinds)
+        rows = self._db.execute(
+            f"SELECT id, kind, payload FROM jobs WHERE status = ? AND kind IN ({placeholders}) "
+            "ORDER BY created_at LIMIT 5", (QUEUED, *kinds)).fetchall()
+        for row in rows:
+            # 같은 파일을 쓰는 다른 프로세스가 먼저 가져갔으면 rowcount가 0
+            cur = self._db.execute(
+                "UPDATE jobs SET status = ?, started_at = ?, owner = ? WHERE id = ? AND status = ?",
+                (RUNNING, time.time(), self.owner, row[0], QUEUED))
+            if cur.rowcount == 1:
+                return row
+        return None
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopped:
+                        return
+                    now = time.time()
+                    if now - self._last_heartbeat >= self._heartbeat_interval:
+                        self._heartbeat_locked(now)
+                    claimed = self._claim_locked()
+                    if claimed is not None:
+                        break
+                    self._cond.wait(min(5.0, self._heartbeat_interval))
+                handler = self._handlers[claimed[1]]
+
+            job_id, _, payload = claimed
+            started = time.monotonic()
+            try:
+                result = handler(json.loads(payload))
+                status, result_json, error = DONE, json.dumps(result, ensure_ascii=False, default=str), None
+            except Exception as e:
+                print(f"❌ 작업 실패 ({job_id}): {e}")
+                status, result_json, error = FAILED, None, str(e)
+
+            with self._cond:
+                self._db.execute(
+                    "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+                    (status, result_json, error, time.time(), job_id))
+                self._stats["completed" if status == DONE else "failed"] += 1
+                self._stats["run_time_total"] += time.monotonic() - started
+                self._cond.notify_all()
+
+    def _prune_locked(self, now: float) -> None:
+        self._db.execute("DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+                         (DONE, FAILED, now - self.result_ttl))
+
+    def stats(self) -> dict:
+        with self._cond:
+            data = dict(self._stats)
+            counts = dict(self._db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        data["run_time_total"] = round(data["run_time_total"], 3)
+        data.update({"queued": counts.get(QUEUED, 0), "running": counts.get(RUNNING, 0),
+                     "workers": self.workers, "path": self.path})
+        return data
+
+    @classmethod
+    def from_env(cls) -> "JobQueue":
+        """
+        ANT_CHAT_JOBS_PATH: SQLite 파일 경로 (기본 ./.cache/jobs.sqlite3)
+        ANT_CHAT_JOBS_WORKERS: 워커 스레드 수 (기본 2)
+        ANT_CHAT_JOBS_REUSE_TTL: 같은 질문의 끝난 결과를 재사용하는 시간(초, 기본 300)
+        """
+        return cls(
+            path=os.getenv("ANT_CHAT_JOBS_PATH", os.path.join(".cache", "jobs.sqlite3")),
+            workers=int(os.getenv("ANT_CHAT_JOBS_WORKERS", "2")),
+            reuse_ttl=float(os.getenv("ANT_CHAT_JOBS_REUSE_TTL", "300")),
+        )
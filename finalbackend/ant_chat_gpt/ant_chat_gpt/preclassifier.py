@@ -0,0 +1,234 @@
+"""
+로컬 규칙 기반 일정 의도 사전 판별기
+
+채팅 대부분은 인사말이거나 "오늘/내일/다음주 금요일/3월 2일/오후 3시"처럼
+누가 봐도 분명한 날짜 표현입니다. 이런 메시지는 정규식과 어휘 사전만으로
+확실하게 판별하고, 애매한 메시지만 GPT(has_date)로 넘깁니다.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import List, Optional
+
+WEEKDAYS = {"월": 0, "화": 1, "수": 2, "목": 3, "금": 4, "토": 5, "일": 6}
+
+RELATIVE_DAYS = {"오늘": 0, "금일": 0, "내일": 1, "명일": 1, "모레": 2, "내일모레": 2, "글피": 3}
+
+RELATIVE_RE = re.compile(r"내일모레|오늘|금일|내일|명일|모레|글피")
+WEEKDAY_RE = re.compile(r"(이번\s*주|다음\s*주|담주|다다음\s*주)?\s*([월화수목금토일])요일")
+MONTH_DAY_RE = re.compile(r"(?<!\d)(\d{1,2})\s*월\s*(\d{1,2})\s*일")
+ISO_DATE_RE = re.compile(r"(?<!\d)(\d{4})[-./](\d{1,2})[-./](\d{1,2})(?!\d)")
+DAY_ONLY_RE = re.compile(r"(?<![\d월])(\d{1,2})\s*일(?!\s*(?:동안|간|째|정도))")
+TIME_RE = re.compile(r"(오전|오후|아침|점심|저녁|밤|새벽)?\s*(?<!\d)(\d{1,2})\s*시(?!간)(?:\s*(\d{1,2})\s*분|\s*반)?")
+VAGUE_PERIOD_RE = re.compile(r"이번\s*주|다음\s*주|담주|주말|다음\s*달|이번\s*달|나중에|언젠가|조만간|이따|있다가")
+
+PAST_RE = re.compile(r"어제|그저께|그제|지난\s*(?:주|달|번|해)|했었|었어|았어|였어|했어|했음|었음")
+
+# '있어/해야/가야' 같은 일반 동사는 넣지 않음 ("오늘 피곤해서 집에 있어"가 확정 일정으로 판별됨).
+# 이런 문장은 날짜만 있는 경우(date only, 낮은 신뢰도)로 떨어져 GPT가 판단합니다.
+INTENT_RE = re.compile(
+    r"회의|미팅|약속|일정|스케줄|예약|수업|강의|시험|마감|출장|여행|생일|기념일|"
+    r"콘서트|공연|팬미팅|내한|컴백|전시|경기|회식|모임|면접|병원|진료|데이트|"
+    r"잡혔|잡았|예정|하자|가자|보자|먹자|놀자|만나"
+)
+SCHEDULE_QUESTION_RE = re.compile(r"언제|몇\s*시|일정|날짜")
+
+# 인사말 뒤에는 어미만 허용하고 바로 끝나거나 공백/문장부호가 와야 함
+# ("하이브 데뷔", "감사원 발표"처럼 인사말로 시작하는 다른 단어는 인사말이 아님)
+GREETING_RE = re.compile(
+    r"^\s*(?:안녕(?:하세요|하십니까|히)?|하이|hi|hello|hey|ㅎㅇ|반가워요?|반갑(?:습니다|네요|다)|"
+    r"고마워요?|고맙(?:습니다|네요?)|감사(?:합니다|해요|해)?|좋은\s*아침(?:이에요|입니다)?|굿모닝|"
+    r"잘\s*자요?|잘\s*지내(?:요|세요|니|지)?|뭐\s*해요?|ㅋ+|ㅎ+|ㅠ+|ㅜ+)"
+    r"(?=[\s!?.,~^ㅋㅎㅠㅜ]|$)[\s\S]{0,12}$",
+    re.IGNORECASE,
+)
+SMALL_TALK_RE = re.compile(r"피곤|배고|심심|졸려|졸리|힘들|기분|날씨\s*좋|ㅋㅋ|ㅎㅎ")
+
+
+@dataclass
+class PreClassification:
+    """
+    사전 판별 결과
+
+    label: True(일정 의도 확실) / False(일정 의도 없음 확실) / None(애매 → GPT로 넘김)
+    confidence: 0.0 ~ 1.0
+    """
+    label: Optional[bool]
+    confidence: float
+    reason: str
+    dates: List[date] = field(default_factory=list)
+    times: List[str] = field(default_factory=list)
+
+    @property
+    def is_confident(self) -> bool:
+        return self.label is not None
+
+
+class KoreanDatePreClassifier:
+    """
+    정규식 + 어휘 사전 기반 한국어 날짜/일정 의도 판별기
+
+    Args:
+        threshold: 이 신뢰도 이상일 때만 확정 판정을 내림 (미만이면 label=None)
+    """
+
+    def __init__(self, threshold: float = 0.85):
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._counts = {"total": 0, "positive": 0, "negative": 0, "escalated": 0}
+
+    # ──────────────────────────────────────────────────────────────────────
+    # 날짜 해석
+    # ──────────────────────────────────────────────────────────────────────
+    def resolve_dates(self, message: str, today: Optional[date] = None) -> List[date]:
+        """메시지의 날짜 표현을 today 기준 실제 날짜로 변환 (등장 순서, 중복 제거)"""
+        today = today or date.today()
+        found = []
+
+        for m in RELATIVE_RE.finditer(message):
+            found.append((m.start(), today + timedelta(days=RELATIVE_DAYS[m.group(0)])))
+
+        for m in WEEKDAY_RE.finditer(message):
+            prefix = re.sub(r"\s+", "", m.group(1) or "")
+            weekday = WEEKDAYS[m.group(2)]
+            monday = today - timedelta(days=today.weekday())
+            if prefix in ("다음주", "담주"):
+                monday += timedelta(weeks=1)
+            elif prefix == "다다음주":
+                monday += timedelta(weeks=2)
+            target = monday + timedelta(days=weekday)
+            if not prefix and target < today:
+                # "금요일에 보자"처럼 주 표시가 없으면 다가오는 요일
+                target += timedelta(weeks=1)
+            found.append((m.start(), target))
+
+        for m in ISO_DATE_RE.finditer(message):
+            try:
+                found.append((m.start(), date(int(m.group(1)), int(m.group(2)), int(m.group(3)))))
+            except ValueError:
+                pass
+
+        for m in MONTH_DAY_RE.finditer(message):
+            try:
+                target = date(today.year, int(m.group(1)), int(m.group(2)))
+            except ValueError:
+                continue
+            if target < today:
+                try:
+                    target = target.replace(year=today.year + 1)
+                except ValueError:
+                    continue
+            found.append((m.start(), target))
+
+        if not found:
+            for m in DAY_ONLY_RE.finditer(message):
+                target = self._next_day_of_month(today, int(m.group(1)))
+                if target is not None:
+                    found.append((m.start(), target))
+
+        result = []
+        for _, d in sorted(found, key=lambda x: x[0]):
+            if d not in result:
+                result.append(d)
+        return result
+
+    @staticmethod
+    def _next_day_of_month(today: date, day: int) -> Optional[date]:
+        """'N일' → 오늘 이후 가장 가까운 N일 (지났거나 이번 달에 없는 날이면 다음 달 이후로)"""
+        year, month = today.year, today.month
+        for _ in range(12):
+            try:
+                target = date(year, month, day)
+            except ValueError:
+                target = None
+            if target is not None and target >= today:
+                return target
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return None
+
+    @staticmethod
+    def resolve_times(message: str) -> List[str]:
+        """'오후 3시 30분' → '15:30' 형태로 변환"""
+        times = []
+        for m in TIME_RE.finditer(message):
+            period, hour, minute = m.group(1), int(m.group(2)), m.group(3)
+            if hour > 24:
+                continue
+            if period in ("오후", "저녁", "밤") and hour < 12:
+                hour += 12
+            elif period in ("오전", "새벽", "아침") and hour == 12:
+                hour = 0
+            mins = int(minute) if minute else (30 if m.group(0).rstrip().endswith("반") else 0)
+            if mins >= 60:
+                continue
+            times.append(f"{hour % 24:02d}:{mins:02d}")
+        return times
+
+    # ──────────────────────────────────────────────────────────────────────
+    # 판별
+    # ──────────────────────────────────────────────────────────────────────
+    def _score(self, message: str, today: Optional[date]) -> PreClassification:
+        text = message.strip()
+        dates = self.resolve_dates(text, today)
+        times = self.resolve_times(text)
+        concrete = bool(dates or times)
+        has_intent = bool(INTENT_RE.search(text))
+        is_past = bool(PAST_RE.search(text))
+
+        if not text:
+            return PreClassification(False, 1.0, "empty")
+
+        # 일정 질문이나 시간 표현이 섞여 있으면 인사말로 끝내지 않음
+        if GREETING_RE.match(text) and not concrete and not has_intent \
+                and not SCHEDULE_QUESTION_RE.search(text) and not VAGUE_PERIOD_RE.search(text):
+            return PreClassification(False, 0.95, "greeting")
+
+        if concrete and has_intent and not is_past:
+            return PreClassification(True, 0.95, "date+intent", dates, times)
+
+        if has_intent and SCHEDULE_QUESTION_RE.search(text) and not is_past:
+            return PreClassification(True, 0.9, "schedule question", dates, times)
+
+        if not concrete and not has_intent and SMALL_TALK_RE.search(text) \
+                and not VAGUE_PERIOD_RE.search(text):
+            return PreClassification(False, 0.9, "small talk")
+
+        if concrete and not is_past:
+            return PreClassification(True, 0.7, "date only", dates, times)
+
+        if is_past:
+            return PreClassification(False, 0.6, "past tense", dates, times)
+
+        return PreClassification(None, 0.5, "ambiguous", dates, times)
+
+    def classify(self, message: str, today: Optional[date] = None) -> PreClassification:
+        """
+        메시지를 판별합니다. 신뢰도가 threshold 미만이면 label=None으로 돌려주므로
+        호출자는 GPT로 넘기면 됩니다.
+        """
+        result = self._score(message, today)
+        if result.confidence < self.threshold:
+            result.label = None
+
+        with self._lock:
+            self._counts["total"] += 1
+            if result.label is True:
+                self._counts["positive"] += 1
+            elif result.label is False:
+                self._counts["negative"] += 1
+            else:
+                self._counts["escalated"] += 1
+        return result
+
+    def stats(self) -> dict:
+        """판별 건수와 로컬 처리 비율(hit_rate)"""
+        with self._lock:
+            data = dict(self._counts)
+        decided = data["positive"] + data["negative"]
+        data["hit_rate"] = round(decided / data["total"], 4) if data["total"] else 0.0
+        data["threshold"] = self.threshold
+        return data
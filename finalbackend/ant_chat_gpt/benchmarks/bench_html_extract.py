@@ -0,0 +1,205 @@
+"""
+뉴스 본문 추출 엔진 벤치마크
+
+포털/언론사 기사 페이지를 흉내 낸 HTML(메뉴, 인라인 스크립트/스타일, 추천 영상, 댓글로 부풀린 페이지)을
+실행할 때 만들어서 엔진별 추출 시간과 결과를 비교합니다. (큰 HTML 파일을 저장소에 두지 않음)
+결과 본문에 기사 문장이 들어 있는지(contains), 메뉴/댓글 같은 군더더기가 빠졌는지(excludes)도 확인합니다.
+
+한계: 기본 페이지는 실제 네이버/언론사 HTML이 아니라 그 구조(본문 컨테이너 id, 메뉴/댓글 비율, 크기)를
+흉내 내 직접 만든 것입니다. 추출기를 만든 쪽이 만든 마크업이라 엔진에 유리할 수 있으므로, 여기 나온 속도/정확도는
+"이 구조에서는 이렇다"는 참고값입니다. 실제 기사 페이지는 저작권 때문에 저장소에 넣지 않으니,
+브라우저에서 저장한 기사 HTML로 확인하려면 --pages로 폴더를 넘기세요. (정답 문장이 없으므로 check는 '-')
+
+    cd finalbackend/ant_chat_gpt
+    python benchmarks/bench_html_extract.py            # 설치된 모든 엔진
+    python benchmarks/bench_html_extract.py --engine lxml --repeat 50
+    python benchmarks/bench_html_extract.py --save /tmp/fixtures   # 만든 HTML을 파일로 저장 (브라우저로 확인용)
+    python benchmarks/bench_html_extract.py --pages ~/saved_articles   # 직접 저장한 실제 기사 페이지(*.html)도 비교
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PACKAGE_ROOT)
+
+from ant_chat_gpt.gpt_search.html_extract import EXTRACTORS, decode_html, detect_encoding  # noqa: E402
+
+
+# --- 페이지 조각 (숫자만 바뀌는 반복 요소) ---
+
+def _repeat(template, count):
+    return "".join(template.format(i=i) for i in range(count))
+
+
+def _css(count=1500):
+    return "\n".join(f".c{i}{{margin:{i % 10}px;padding:0}}" for i in range(count))
+
+
+def _ad_script(count=1500):
+    return "\n".join(f"var x{i} = {{'ad': 'slot{i}', 'size': [300, 250]}};" for i in range(count))
+
+
+def _cfg_script(count=2500):
+    return "\n".join(f"window.cfg{i} = {{id: {i}, name: 'module{i}', deps: ['a', 'b', 'c'], enabled: true}};"
+                     for i in range(count))
+
+
+MENU = _repeat('<li class="nav_item"><a href="/section/{i}">섹션메뉴{i}</a></li>', 120)
+RANKING = _repeat('<li><a href="/article/{i}">많이 본 뉴스 제목 {i}번 - 연예계 소식 총정리</a></li>', 60)
+COMMENTS = _repeat('<div class="u_cbox_comment"><span class="u_cbox_contents">댓글 내용 {i} 너무 기대돼요 꼭 갈게요</span></div>',
+                   80)
+PHOTOS = _repeat('<li><a href="/news/{i}.html">[포토] 오늘의 주요 사진 {i}</a></li>', 150)
+CARDS = _repeat('<div class="card"><a href="/v/{i}"><img src="/i/{i}.jpg">'
+                '<span class="card_title">추천 영상 {i} 지금 가장 핫한 클립 모음</span></a></div>', 1200)
+
+
+def naver_news():
+    """네이버 뉴스 본문 구조 (#dic_area), 앞뒤로 큰 광고 스크립트"""
+    return (
+        '<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8">'
+        f'<title>플레이브, 12월 단독 콘서트 개최 : 네이버 뉴스</title><style>{_css()}\n</style>'
+        f'<script>{_ad_script()}\n</script></head>\n'
+        f'<body><div id="wrap"><header><ul class="Nlnb_menu">{MENU}</ul></header>\n'
+        '<div id="ct" class="newsct"><div class="media_end_head"><h2 id="title_area">'
+        '<span>플레이브, 12월 KSPO DOME 단독 콘서트 개최</span></h2></div>\n'
+        '<div id="contents" class="newsct_body"><div id="newsct_article" class="newsct_article _article_body">\n'
+        '<article id="dic_area" class="go_trans _article_content">'
+        '플레이브(PLAVE)가 오는 12월 13일부터 15일까지 서울 송파구 KSPO DOME에서 단독 콘서트를 개최한다.<br><br>'
+        '소속사 블래스트는 17일 공식 SNS를 통해 콘서트 포스터를 공개하며 이같이 밝혔다.<br><br>'
+        '이번 공연은 지난 3월 첫 단독 콘서트 이후 약 9개월 만에 열리는 것으로, 새 앨범 수록곡 무대가 처음 공개될 예정이다.<br><br>'
+        '티켓 선예매는 11월 4일 오후 8시, 일반 예매는 11월 6일 오후 8시 NOL 티켓을 통해 진행된다.<br><br>'
+        '소속사 관계자는 "팬들과 연말을 함께 보내기 위해 준비한 공연"이라며 "다양한 무대를 준비하고 있다"고 전했다.'
+        '</article></div>\n'
+        '<div class="byline"><p class="byline_p"><span>홍길동 기자</span></p></div></div></div>\n'
+        f'<aside><div class="ranking"><ul>{RANKING}</ul></div></aside>\n'
+        f'<div id="cbox_module">{COMMENTS}</div>\n'
+        '<footer><p>Copyright ⓒ 네이버. All rights reserved. 무단 전재 및 재배포 금지</p></footer></div>'
+        f'<script>{_ad_script()}\n</script></body></html>'
+    ).encode("utf-8")
+
+
+def portal_heavy():
+    """본문 컨테이너 id가 없는 포털 페이지 (추천 영상 카드, 큰 설정 스크립트)"""
+    return (
+        '<!doctype html><html><head><meta charset="UTF-8"><title>뉴진스 11월 컴백</title>'
+        f'<style>{_css()}\n</style><script>{_cfg_script()}\n</script></head><body>\n'
+        f'<nav class="gnb"><ul>{MENU}</ul></nav><div class="layout"><div class="recommend">{CARDS}</div>\n'
+        '<section class="story-body"><h1 class="headline">뉴진스, 11월 20일 미니 3집으로 컴백</h1>\n'
+        '<p>뉴진스가 다음 달 20일 새 미니앨범을 발매하며 컴백한다.</p>'
+        '<p>소속사는 18일 "뉴진스가 11월 20일 오후 6시 미니 3집을 발매한다"며 "타이틀곡 뮤직비디오 촬영을 마쳤다"고 밝혔다.</p>'
+        '<p>이번 앨범은 지난해 발표한 싱글 이후 약 1년 만의 신보로, 멤버들이 작사에 참여한 곡이 다수 수록됐다.</p>'
+        '<p>컴백에 앞서 11월 1일부터 순차적으로 콘셉트 사진과 트랙리스트가 공개될 예정이다.</p>'
+        '<p>뉴진스는 발매 당일 오후 8시 팬 쇼케이스를 열고 신곡 무대를 처음 선보인다.</p>\n'
+        '<p class="reporter">이영희 기자</p></section>\n'
+        f'<div class="related_news"><ul>{RANKING}</ul></div>\n'
+        f'<div class="comment_area">{COMMENTS}</div></div>\n'
+        f'<footer class="site-footer"><ul>{MENU}</ul></footer><script>{_cfg_script()}\n</script></body></html>'
+    ).encode("utf-8")
+
+
+def press_article_euckr():
+    """EUC-KR로 인코딩된 옛 언론사 테이블 레이아웃 (charset은 meta http-equiv에만 있음)"""
+    return (
+        '<html><head><meta http-equiv="Content-Type" content="text/html; charset=euc-kr">'
+        f'<title>삼성전자 3분기 실적 발표</title><style>{_css()}\n</style></head>\n'
+        f'<body><div id="top_menu"><ul>{MENU}</ul></div>\n'
+        '<table width="100%"><tr>'
+        f'<td class="left_area" valign="top"><ul class="side_list">{PHOTOS}</ul></td>\n'
+        '<td valign="top"><div class="view_title"><h1>삼성전자, 31일 3분기 확정 실적 발표…HBM 전략 주목</h1></div>\n'
+        '<div class="article_txt">삼성전자가 오는 10월 31일 3분기 확정 실적을 발표하고 컨퍼런스콜을 연다.<br/><br/>'
+        '앞서 삼성전자는 잠정 실적 공시를 통해 3분기 매출 79조원, 영업이익 9조1천억원을 기록했다고 밝혔다.<br/><br/>'
+        '업계에서는 메모리 가격 상승에 힘입어 반도체 부문 영업이익이 전 분기 대비 크게 늘었을 것으로 보고 있다.<br/><br/>'
+        '컨퍼런스콜에서는 고대역폭메모리(HBM) 공급 계획과 파운드리 사업 전략이 주요 관심사가 될 전망이다.<br/><br/>'
+        '한편 SK하이닉스는 이보다 앞선 10월 24일 실적을 발표할 예정이다.<br/><br/>'
+        '김철수 기자 kim@example.co.kr</div>\n'
+        '<div class="copyright">저작권자 ⓒ 예시경제 무단전재 및 재배포 금지</div></td>\n'
+        f'<td class="right_area"><div class="rank_news"><ul>{RANKING}</ul></div></td></tr></table>\n'
+        '<div class="footer_info">회사소개 | 광고문의 | 개인정보처리방침 | 청소년보호정책</div></body></html>'
+    ).encode("euc-kr")
+
+
+# 이름 → (HTML 생성 함수, 본문에 있어야 할 문장 / 없어야 할 군더더기)
+FIXTURES = {
+    "naver_news.html": (naver_news, {
+        "contains": ["KSPO DOME에서 단독 콘서트를 개최한다", "일반 예매는 11월 6일 오후 8시"],
+        "excludes": ["섹션메뉴", "많이 본 뉴스", "댓글 내용", "window.__DATA__", "var x1"],
+    }),
+    "press_article_euckr.html": (press_article_euckr, {
+        "contains": ["오는 10월 31일 3분기 확정 실적을 발표", "10월 24일 실적을 발표할 예정"],
+        "excludes": ["섹션메뉴", "오늘의 주요 사진", "많이 본 뉴스", "광고문의"],
+    }),
+    "portal_heavy.html": (portal_heavy, {
+        "contains": ["11월 20일 오후 6시 미니 3집을 발매한다", "팬 쇼케이스를 열고"],
+        "excludes": ["섹션메뉴", "추천 영상", "많이 본 뉴스", "댓글 내용", "window.cfg"],
+    }),
+}
+
+
+def timed(func, repeat):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return result, statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--engine", action="append", help="비교할 엔진 (여러 번 지정 가능, 기본: 모두)")
+    parser.add_argument("--repeat", type=int, default=20, help="파일/엔진별 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--strict", action="store_true", help="결과 확인에 실패한 엔진이 있으면 종료 코드 1")
+    parser.add_argument("--save", metavar="DIR", help="만든 HTML을 DIR에 파일로 저장")
+    parser.add_argument("--pages", metavar="DIR", help="DIR의 *.html(직접 저장한 실제 기사 페이지)도 함께 측정")
+    args = parser.parse_args()
+
+    pages = [(filename, build, checks, True) for filename, (build, checks) in FIXTURES.items()]
+    if args.pages:
+        for filename in sorted(os.listdir(args.pages)):
+            if filename.lower().endswith((".html", ".htm")):
+                path = os.path.join(args.pages, filename)
+                pages.append((filename, lambda path=path: open(path, "rb").read(), None, False))
+
+    engines = {}
+    for name in args.engine or list(EXTRACTORS):
+        try:
+            engines[name] = EXTRACTORS[name]()
+        except ImportError as e:
+            print(f"⚠️ {name} 엔진 건너뜀: {e}")
+
+    failures = 0
+    print(f"{'fixture':<28}{'KB':>7}{'decode ms':>11}  {'engine':<6}{'extract ms':>12}{'chars':>8}  check")
+    for filename, build, checks, generated in pages:
+        content = build()
+        if args.save and generated:
+            os.makedirs(args.save, exist_ok=True)
+            with open(os.path.join(args.save, filename), "wb") as f:
+                f.write(content)
+        html, decode_ms = timed(lambda: decode_html(content), args.repeat)
+        encoding = detect_encoding(content)
+
+        for name, engine in engines.items():
+            text, extract_ms = timed(lambda: engine.extract(html), args.repeat)
+            if checks is None:
+                status = "-"
+            else:
+                missing = [s for s in checks.get("contains", []) if s not in text]
+                leaked = [s for s in checks.get("excludes", []) if s in text]
+                ok = not missing and not leaked
+                failures += not ok
+                status = "ok" if ok else f"missing={missing} leaked={leaked}"
+            print(f"{filename:<28}{len(content) / 1024:>7.0f}{decode_ms:>11.2f}  {name:<6}{extract_ms:>12.2f}"
+                  f"{len(text):>8}  {status} ({encoding})")
+
+    if failures:
+        print(f"결과 확인 실패 {failures}건")
+    return 1 if failures and args.strict else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
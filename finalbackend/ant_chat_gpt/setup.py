@@ -13,5 +13,9 @@ setup(
         "beautifulsoup4",
         "selenium"
     ],
+    extras_require={
+        # 뉴스 본문 빠른 추출 (없으면 BeautifulSoup으로 동작)
+        "fast": ["lxml"],
+    },
     python_requires=">=3.8",
 )
@@ -0,0 +1,17 @@
+import os
+import sys
+
+import pytest
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PACKAGE_ROOT)
+
+# OpenAI 클라이언트는 생성만 하고 테스트에서 호출하지 않음
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+
+@pytest.fixture
+def ant_chat():
+    from ant_chat_gpt import AntChatGPT
+    from ant_chat_gpt.common.cache import LRUCache
+    return AntChatGPT(cache=LRUCache(max_size=16), single_call=False)
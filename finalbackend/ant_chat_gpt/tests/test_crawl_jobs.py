@@ -0,0 +1,55 @@
+import threading
+
+import pytest
+
+from ant_chat_gpt import AntChatGPT, JobQueue
+from ant_chat_gpt.common.cache import LRUCache
+
+
+@pytest.fixture
+def crawl_chat(monkeypatch):
+    jobs = JobQueue(workers=1)
+    chat = AntChatGPT(cache=LRUCache(max_size=16), single_call=False, job_queue=jobs)
+    release = threading.Event()
+
+    def crawl_schedule(message):
+        release.wait(5)
+        return {"events": [{"start_date": "2025-10-20", "end_date": "2025-10-20", "title": "실적 발표"}]}
+
+    # 날짜 정보가 없는 일정 질문 → 뉴스 크롤링 경로
+    monkeypatch.setattr(chat.detector, "has_date", lambda message, pre=None: (True, {}))
+    monkeypatch.setattr(chat.detector, "has_date_info", lambda message: (False, {}))
+    monkeypatch.setattr(chat.detector, "crawl_schedule", crawl_schedule)
+    yield chat, release
+    release.set()
+    jobs.stop()
+
+
+def test_stream_returns_job_without_waiting_for_crawl(crawl_chat):
+    chat, release = crawl_chat
+
+    events = list(chat.process_message_stream("삼성전자 실적 발표 언제야"))
+
+    names = [name for name, _ in events]
+    assert names[-2:] == ["job", "done"]
+    job_event, result = events[-2][1], events[-1][1]
+    assert result["job"] == job_event
+    assert result["schedule_data"] is None
+    assert job_event["status"] in ("queued", "running")
+
+    release.set()
+    job = chat.get_job(job_event["id"], wait=5)
+    assert job["status"] == "done"
+    assert job["result"]["events"][0]["title"] == "실적 발표"
+
+
+def test_finished_job_result_is_used_directly(crawl_chat):
+    chat, release = crawl_chat
+    release.set()
+    first = chat.process_message("삼성전자 실적 발표 언제야")
+    chat.get_job(first["job"]["id"], wait=5)
+
+    # 같은 질문은 끝난 작업 결과를 재사용
+    events = list(chat.process_message_stream("삼성전자 실적 발표 언제야"))
+    assert "job" not in [name for name, _ in events]
+    assert events[-1][1]["schedule_data"]["events"][0]["title"] == "실적 발표"
@@ -0,0 +1,90 @@
+import threading
+import time
+
+import pytest
+
+from ant_chat_gpt import JobQueue
+
+
+def wait_for_status(queue, job_id, status, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job is not None and job["status"] == status:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"{job_id} did not reach {status}: {queue.get(job_id)}")
+
+
+@pytest.fixture
+def job_path(tmp_path):
+    return str(tmp_path / "jobs.sqlite3")
+
+
+@pytest.fixture
+def blocked():
+    release = threading.Event()
+    yield release
+    release.set()
+
+
+def start_stuck_job(path, blocked, **kwargs):
+    queue = JobQueue(path, workers=1, **kwargs)
+    queue.register("crawl", lambda payload: blocked.wait(10))
+    job_id = queue.submit("crawl", {"message": "실적 발표 언제야"}, dedupe_key="실적 발표 언제야")
+    wait_for_status(queue, job_id, "running")
+    return queue, job_id
+
+
+def test_restart_after_clean_stop_recovers_running_jobs_immediately(job_path, blocked):
+    old, job_id = start_stuck_job(job_path, blocked)
+    old.stop()
+
+    # stale_after(기본 600초)보다 훨씬 빨리 재시작
+    new = JobQueue(job_path, workers=1)
+    try:
+        assert new.stats()["recovered"] == 1
+        new.register("crawl", lambda payload: {"events": []})
+        assert new.submit("crawl", {"message": "실적 발표 언제야"}, dedupe_key="실적 발표 언제야") == job_id
+        assert new.wait(job_id, timeout=5)["status"] == "done"
+    finally:
+        new.stop()
+
+
+def test_restart_after_crash_recovers_once_heartbeat_expires(job_path, blocked):
+    # 유일한 워커가 핸들러 안에서 멈춰 heartbeat가 끊긴 상태 = 죽은 프로세스
+    start_stuck_job(job_path, blocked, heartbeat_timeout=0.5)
+
+    new = JobQueue(job_path, workers=1, heartbeat_timeout=0.5)
+    try:
+        assert new.stats()["recovered"] == 0
+        time.sleep(0.7)
+        new.register("crawl", lambda payload: {"events": []})
+        job_id = new.submit("crawl", {"message": "실적 발표 언제야"}, dedupe_key="실적 발표 언제야")
+        assert new.stats()["recovered"] == 1
+        assert new.wait(job_id, timeout=5)["status"] == "done"
+    finally:
+        new.stop()
+
+
+def test_live_queue_keeps_its_running_jobs(job_path, blocked):
+    old, job_id = start_stuck_job(job_path, blocked, heartbeat_timeout=5)
+    try:
+        new = JobQueue(job_path, workers=1, heartbeat_timeout=5)
+        assert new.stats()["recovered"] == 0
+        assert new.get(job_id)["status"] == "running"
+        new.stop()
+    finally:
+        old.stop()
+
+
+def test_rows_without_owner_from_older_files_are_recovered(job_path, blocked):
+    old, job_id = start_stuck_job(job_path, blocked)
+    old.stop()
+    old._db.execute("UPDATE jobs SET owner = NULL")
+
+    new = JobQueue(job_path, workers=1)
+    try:
+        assert new.get(job_id)["status"] == "queued"
+    finally:
+        new.stop()
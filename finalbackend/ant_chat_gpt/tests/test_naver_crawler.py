@@ -0,0 +1,90 @@
+import threading
+import time
+
+import pytest
+
+from ant_chat_gpt.gpt_search.article_cache import ArticleCache
+from ant_chat_gpt.gpt_search.naver_crawler import NaverCrawler
+
+ARTICLE = "<html><body><article id='dic_area'>" + "삼성전자는 10월 30일 3분기 실적을 발표한다. " * 5 + "</article></body></html>"
+
+
+class FakeResponse:
+    def __init__(self, status, body=b"", headers=None):
+        self.status_code = status
+        self.ok = status < 400
+        self.headers = {"Content-Type": "text/html; charset=utf-8", **(headers or {})}
+        self._body = body
+        self.closed = False
+
+    def iter_content(self, chunk_size=1):
+        yield self._body
+
+    def close(self):
+        self.closed = True
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise RuntimeError(f"{self.status_code} error")
+
+
+class FakeSession:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.requests.append(headers or {})
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def crawler():
+    return NaverCrawler(article_cache=ArticleCache())
+
+
+@pytest.mark.parametrize("status", [404, 500, 503])
+def test_error_pages_are_not_parsed_or_cached(crawler, status):
+    error = FakeResponse(status, ARTICLE.encode(), {"ETag": '"err"'})
+    crawler.http = FakeSession(error)
+
+    assert crawler.extract_text("https://n.news.naver.com/a/1") == NaverCrawler.FETCH_FAILED
+    assert error.closed
+    assert crawler.article_cache.lookup("https://n.news.naver.com/a/1") == (None, {})
+
+
+def test_error_after_success_keeps_revalidating_against_the_good_copy(crawler):
+    url = "https://n.news.naver.com/a/2"
+    crawler.http = FakeSession(FakeResponse(200, ARTICLE.encode(), {"ETag": '"v1"'}))
+    text = crawler.extract_text(url)
+    assert "3분기 실적" in text
+
+    crawler.article_cache.ttl = 0   # 다음 조회는 조건부 요청
+    crawler.http = FakeSession(FakeResponse(500, b"<html>Internal Error</html>", {"ETag": '"err"'}))
+    assert crawler.extract_text(url) == NaverCrawler.FETCH_FAILED
+
+    crawler.http = FakeSession(FakeResponse(304))
+    assert crawler.extract_text(url) == text
+    assert crawler.http.requests[0].get("If-None-Match") == '"v1"'
+
+
+def test_deadline_cancels_queued_fetches(crawler, monkeypatch):
+    release = threading.Event()
+    calls = []
+
+    def slow_extract(url):
+        calls.append(url)
+        release.wait(5)
+        return "본문"
+
+    monkeypatch.setattr(crawler, "extract_text", slow_extract)
+    urls = [f"https://example.com/{n}" for n in range(4)]
+    started = time.monotonic()
+    try:
+        assert crawler.extract_texts(urls, deadline=0.2, max_workers=1) == []
+    finally:
+        release.set()
+    assert time.monotonic() - started < 2
+    # 워커 1개가 첫 기사에 묶인 동안 대기하던 나머지는 취소되어 실행되지 않음
+    time.sleep(0.1)
+    assert calls == urls[:1]
@@ -0,0 +1,73 @@
+from datetime import date
+
+import pytest
+
+from ant_chat_gpt.preclassifier import KoreanDatePreClassifier
+
+TODAY = date(2025, 10, 15)   # 수요일
+
+
+@pytest.fixture
+def classifier():
+    return KoreanDatePreClassifier(threshold=0.85)
+
+
+@pytest.mark.parametrize("message, label, reason", [
+    ("안녕하세요", False, "greeting"),
+    ("내일 오후 3시에 회의 있어", True, "date+intent"),
+    ("다음주 금요일에 약속 있음", True, "date+intent"),
+    ("플레이브 콘서트 언제 해?", True, "schedule question"),
+    ("요즘 너무 피곤해", False, "small talk"),
+    # 일반 동사('있어')만으로는 일정 의도가 아님 → GPT로 넘김
+    ("오늘 피곤해서 집에 있어", None, "date only"),
+    ("오늘 기분 좋은 일 있어", None, "date only"),
+    ("어제 회의 했어", None, "past tense"),
+    ("고마워요!", False, "greeting"),
+    ("ㅎㅇ ㅋㅋ", False, "greeting"),
+    # 인사말로 시작하는 다른 단어 / 일정 질문 / 시간 표현은 인사말로 끝내지 않음
+    ("하이브 신인 데뷔 언제야", None, "ambiguous"),
+    ("감사원 발표 언제야", None, "ambiguous"),
+    ("뭐해 이따 밥먹을래", None, "ambiguous"),
+])
+def test_labels(classifier, message, label, reason):
+    result = classifier.classify(message, today=TODAY)
+    assert (result.label, result.reason) == (label, reason)
+
+
+def test_resolves_dates_and_times(classifier):
+    result = classifier.classify("다음주 금요일 오후 3시 반에 미팅", today=TODAY)
+    assert result.dates == [date(2025, 10, 24)]
+    assert result.times == ["15:30"]
+
+
+def test_stats_count_each_call(classifier):
+    classifier.classify("안녕", today=TODAY)
+    classifier.classify("모레 회의", today=TODAY)
+    classifier.classify("음...", today=TODAY)
+    stats = classifier.stats()
+    assert (stats["total"], stats["negative"], stats["positive"], stats["escalated"]) == (3, 1, 1, 1)
+
+
+def test_message_is_preclassified_once_per_request(ant_chat):
+    detector = ant_chat.detector
+    detector.has_date_info = lambda message: (True, {})
+    detector.extract_schedule = lambda message: ({"events": [{"start_date": "2025-10-16", "title": "회의"}]}, {})
+
+    result = ant_chat.process_message("내일 오후 3시에 회의 있어")
+
+    assert result["has_schedule"] is True
+    assert result["tokens_used"]["preclassified"] is True
+    assert detector.preclassifier.stats()["total"] == 1
+
+
+@pytest.mark.parametrize("today, message, expected", [
+    (date(2026, 10, 17), "12일에 만나자", date(2026, 11, 12)),
+    (date(2026, 10, 17), "20일에 만나자", date(2026, 10, 20)),
+    (date(2026, 10, 17), "17일에 만나자", date(2026, 10, 17)),
+    (date(2026, 12, 20), "5일에 만나자", date(2027, 1, 5)),
+    # 지난 달 말일 → 다음 달에 그 날이 없으면 그다음 달
+    (date(2026, 1, 31), "30일에 만나자", date(2026, 3, 30)),
+    (date(2026, 2, 10), "31일에 만나자", date(2026, 3, 31)),
+])
+def test_day_only_rolls_over_to_next_month(classifier, today, message, expected):
+    assert classifier.resolve_dates(message, today=today) == [expected]
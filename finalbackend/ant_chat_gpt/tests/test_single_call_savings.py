@@ -0,0 +1,58 @@
+import threading
+
+import pytest
+
+from ant_chat_gpt.detector import DEFAULT_STAGE_COST, stage_cost_defaults_from_env
+
+
+def test_baseline_uses_defaults_before_any_measurement(ant_chat):
+    report = ant_chat._single_call_report("schedule", {"total_tokens": 500}, 900.0)
+
+    expected = sum(DEFAULT_STAGE_COST[s]["tokens"] for s in ("has_date", "has_date_info", "extract_schedule"))
+    assert report["llm_calls_saved"] == 2
+    assert report["baseline"] == "default"
+    assert report["estimated_tokens_saved"] == pytest.approx(expected - 500)
+    assert report["estimated_latency_saved_ms"] is not None
+
+
+def test_measured_stages_replace_defaults(ant_chat):
+    detector = ant_chat.detector
+    detector._record_stage("has_date", {"total_tokens": 100}, 200.0)
+
+    assert ant_chat._single_call_report("conversation", {"total_tokens": 40}, 50.0)["baseline"] == "measured"
+    report = ant_chat._single_call_report("crawl", {"total_tokens": 40}, 50.0)
+    assert report["baseline"] == "mixed"
+    assert report["estimated_tokens_saved"] == pytest.approx(100 + DEFAULT_STAGE_COST["has_date_info"]["tokens"] - 40)
+
+
+def test_unknown_stage_without_default_has_no_estimate(ant_chat):
+    ant_chat.detector.stage_cost_defaults = {}
+    report = ant_chat._single_call_report("conversation", {"total_tokens": 40}, 50.0)
+    assert report["estimated_tokens_saved"] is None
+    assert report["baseline"] is None
+
+
+def test_stage_cost_env_override(monkeypatch):
+    monkeypatch.setenv("ANT_CHAT_STAGE_COST", '{"has_date": {"tokens": 10, "latency_ms": 20}}')
+    defaults = stage_cost_defaults_from_env()
+    assert defaults["has_date"] == {"tokens": 10.0, "latency_ms": 20.0}
+    assert defaults["extract_schedule"] == DEFAULT_STAGE_COST["extract_schedule"]
+
+    monkeypatch.setenv("ANT_CHAT_STAGE_COST", "not json")
+    assert stage_cost_defaults_from_env() == DEFAULT_STAGE_COST
+
+
+def test_savings_are_counted_once_per_report_across_threads(ant_chat):
+    def worker():
+        for _ in range(200):
+            ant_chat._single_call_report("crawl", {"total_tokens": 100}, 10.0)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    savings = ant_chat.get_pipeline_stats()["savings"]
+    assert savings["messages"] == 1600
+    assert savings["llm_calls_saved"] == 1600
@@ -1,40 +1,52 @@
-import mysql.connector
-from mysql.connector import errorcode
-from flask import Flask, request, jsonify
-from flask_cors import CORS
-import os
-from werkzeug.security import generate_password_hash, check_password_hash
+import time
+_STARTUP_T0 = time.perf_counter()
+
 import os
-from werkzeug.security import generate_password_hash, check_password_hash
-from datetime import date, timedelta
+import sys # Import sys here
+from datetime import date, datetime, timedelta
 import random
+import base64
+import json
+import tempfile
 
-import sys # Import sys here
-from dotenv import load_dotenv # Import load_dotenv here
+from services import ServiceRegistry, StartupProfiler
+from schedule_index import window_schedules
+from notifications import NotificationHub
+from resource_versions import ResourceVersions
+from password_hasher import HasherBusy, PasswordHasher
+from session_tokens import InvalidToken, SessionTokens
+
+# import/초기화 구간별 소요 시간 기록 (/health 의 startup 항목)
+startup = StartupProfiler(started_at=_STARTUP_T0)
 
-# Load .env at the very beginning
-load_dotenv(r'C:\checkmate\.env') # Fixed escape sequence
-# Directly set environment variables from the .env content provided by the user
+with startup.phase("import flask"):
+    from flask import Flask, Response, g, request, jsonify, stream_with_context
+    from flask_cors import CORS
 
-os.environ["NAVER_CLIENT_SECRET"] = 'ha_Z6kFUxn'
+with startup.phase("import mysql.connector"):
+    import mysql.connector
+
+with startup.phase("load .env"):
+    from dotenv import load_dotenv # Import load_dotenv here
+
+    # Load .env at the very beginning
+    load_dotenv(r'C:\checkmate\.env') # Fixed escape sequence
+    # Directly set environment variables from the .env content provided by the user
+
+    os.environ["NAVER_CLIENT_SECRET"] = 'ha_Z6kFUxn'
 
 # Add the package to the Python path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), 'ant_chat_gpt')))
 
-from weather.weather_alarm import WeatherCommentator
-from calendar_comment.calendar_commentor import CalendarCommentator
-from mediator import ScheduleMediator
-from ant_chat_gpt import AntChatGPT
-import tempfile
+with startup.phase("import db_pool, migrations"):
+    from db_pool import ConnectionPool
+    import migrations
 
 
 
 app = Flask(__name__)
 CORS(app)
 
-# Initialize AntChatGPT
-ant_chat = AntChatGPT()
-
 # ==============================================================================
 # TODO: MySQL 데이터베이스 접속 정보를 여기에 입력하세요.
 # ==============================================================================
@@ -47,153 +59,178 @@ db_config = {
 }
 # ==============================================================================
 
-# Initialize AI modules
-weather_commentator = WeatherCommentator()
-calendar_commentator = CalendarCommentator()
-schedule_mediator = ScheduleMediator()
+# ==============================================================================
+# AI 모듈 (처음 사용할 때 생성, 프로세스 안에서 한 인스턴스를 공유)
+# openai/bs4 등 무거운 import도 팩토리 안에서 처음 필요할 때 일어납니다.
+# ==============================================================================
+services = ServiceRegistry(startup)
+
+
+def _build_ant_chat():
+    from ant_chat_gpt import AntChatGPT, JobQueue
+    # 뉴스 크롤링 기반 추출은 백그라운드 작업으로 (ANT_CHAT_ASYNC_CRAWL=0 이면 요청 안에서 실행)
+    job_queue = JobQueue.from_env() if os.getenv("ANT_CHAT_ASYNC_CRAWL", "1") != "0" else None
+    # ANT_CHAT_SINGLE_CALL=0 이면 기존 다단계(has_date → has_date_info → extract_schedule) 경로 사용
+    return AntChatGPT(single_call=os.getenv("ANT_CHAT_SINGLE_CALL", "1") != "0", job_queue=job_queue)
+
+
+def _build_weather_commentator():
+    from weather.weather_alarm import WeatherCommentator
+    commentator = WeatherCommentator()
+    if os.getenv("WEATHER_PREFETCH", "1") != "0":
+        # 발표 직후 최근 조회된 격자의 예보를 미리 받아 둠 (사용자 요청은 캐시에서 응답)
+        commentator.start_prefetcher()
+    return commentator
+
+
+def _build_calendar_commentator():
+    from calendar_comment.calendar_commentor import CalendarCommentator
+    return CalendarCommentator()
+
+
+def _build_schedule_mediator():
+    from mediator import ScheduleMediator
+    # 중복 생성하지 않고 공유 인스턴스를 넘겨서 예보/조언 캐시를 같이 씀
+    return ScheduleMediator(weather_commentator=services.weather_commentator,
+                            calendar_commentator=services.calendar_commentator)
+
+
+services.register("ant_chat", _build_ant_chat)
+# 비밀번호 해시/검증 프로세스 풀 (요청 스레드에서 CPU를 잡아먹지 않도록)
+services.register("password_hasher", PasswordHasher.from_env)
+services.register("weather_commentator", _build_weather_commentator)
+services.register("calendar_commentator", _build_calendar_commentator)
+services.register("schedule_mediator", _build_schedule_mediator)
+
+# MySQL 커넥션 풀 (요청마다 새로 접속하지 않고 연결을 재사용)
+db_pool = ConnectionPool(
+    db_config,
+    size=int(os.getenv("DB_POOL_SIZE", "10")),
+    idle_timeout=float(os.getenv("DB_POOL_IDLE_TIMEOUT", "300")),
+    checkout_timeout=float(os.getenv("DB_POOL_CHECKOUT_TIMEOUT", "5")),
+    health_check_interval=float(os.getenv("DB_POOL_HEALTH_CHECK_INTERVAL", "5")),
+)
+
+# 초대/친구 요청 알림 pub/sub (쓰기 라우트가 커밋 후 발행, SSE/long-poll이 구독)
+notification_hub = NotificationHub(
+    backlog=int(os.getenv("NOTIFICATION_BACKLOG", "100")),
+    retention=float(os.getenv("NOTIFICATION_RETENTION", "3600")),
+)
+
+# 조회 응답 ETag용 리소스 버전 (쓰기 라우트가 커밋 후 bump)
+# 버전이 프로세스 메모리에만 있으므로 단일 프로세스로 띄울 때만 RESOURCE_ETAGS=1 로 켬 (기본 꺼짐)
+resource_versions = ResourceVersions.from_env()
+
+# 로그인 세션 토큰 (HMAC 서명, 요청마다 DB 조회 없이 메모리에서 검증)
+session_tokens = SessionTokens.from_env()
+# SESSION_REQUIRED=1 이면 /api/* 요청에 토큰 필수 (기본은 user_num만 보내는 기존 클라이언트도 허용)
+SESSION_REQUIRED = os.getenv("SESSION_REQUIRED", "0") == "1"
 
 def get_db():
-    """데이터베이스 연결 함수"""
-    try:
-        conn = mysql.connector.connect(**db_config)
-        return conn
-    except mysql.connector.Error as err:
-        if err.errno == errorcode.ER_ACCESS_DENIED_ERROR:
-            print("Something is wrong with your user name or password")
-        elif err.errno == errorcode.ER_BAD_DB_ERROR:
-            print("Database does not exist")
-        else:
-            print(err)
-        return None
+    """
+    데이터베이스 연결 컨텍스트 매니저.
+    블록을 벗어나면 커서가 닫히고 연결은 풀로 반납됩니다.
+
+        with get_db() as conn:
+            cursor = conn.cursor(dictionary=True)
+    """
+    return db_pool.connection()
+
+def versioned_json(resource, key, load):
+    """
+    resource_versions 기반 조건부 GET.
+    클라이언트의 If-None-Match가 현재 버전의 ETag와 같으면 load()(DB 조회)를 하지 않고 304를 돌려줍니다.
+    load에서 난 mysql.connector.Error는 호출한 라우트가 처리합니다.
+    """
+    if not resource_versions.enabled:
+        return jsonify(load())
+    # 버전은 조회 전에 읽음 (조회 중 쓰기가 끼어들면 다음 요청에서 다시 읽게 됨)
+    etag = resource_versions.etag(resource, key, request.args)
+    hit = request.if_none_match.contains_weak(etag)
+    resource_versions.record(resource, hit)
+    response = Response(status=304) if hit else jsonify(load())
+    response.set_etag(etag)
+    # 브라우저가 저장은 하되 쓸 때마다 재검증하도록
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
 
 def create_tables():
-    """MySQL에 필요한 테이블들을 생성"""
-    conn = None
+    """MySQL 스키마를 최신 마이그레이션 버전까지 올림 (migrations.py)"""
     try:
-        conn = get_db()
-        if conn is None:
-            print("Database connection failed. Tables not created.")
-            return
-            
-        cursor = conn.cursor()
-        
-        TABLES = {}
-
-        # users 테이블
-        TABLES['users'] = (
-            "CREATE TABLE IF NOT EXISTS `users` ("
-            "  `user_num` INT AUTO_INCREMENT PRIMARY KEY,"
-            "  `user_id` VARCHAR(255) NOT NULL UNIQUE,"
-            "  `user_mail` VARCHAR(255) NOT NULL,"
-            "  `user_name` VARCHAR(255) NOT NULL,"
-            "  `user_phone` VARCHAR(50),"
-            "  `user_pass` VARCHAR(255) NOT NULL"
-            ") ENGINE=InnoDB")
-
-        # calendars 테이블
-        TABLES['calendars'] = (
-            "CREATE TABLE IF NOT EXISTS `calendars` ("
-            "  `calendar_id` INT AUTO_INCREMENT PRIMARY KEY,"
-            "  `calendar_name` VARCHAR(255) NOT NULL,"
-            "  `calendar_purpose` TEXT,"
-            "  `calendar_color` VARCHAR(50),"
-            "  `user_num` INT NOT NULL,"
-            "  `member_count` INT DEFAULT 1,"
-            "  `created_at` DATETIME DEFAULT CURRENT_TIMESTAMP,"
-            "  FOREIGN KEY (`user_num`) REFERENCES `users`(`user_num`) ON DELETE CASCADE"
-            ") ENGINE=InnoDB")
-
-        # events 테이블
-        TABLES['events'] = (
-            "CREATE TABLE IF NOT EXISTS `events` ("
-            "  `event_id` INT AUTO_INCREMENT PRIMARY KEY,"
-            "  `title` VARCHAR(255) NOT NULL,"
-            "  `content` TEXT,"
-            "  `start_date` DATE NOT NULL,"
-            "  `end_date` DATE NOT NULL,"
-            "  `start_time` TIME NOT NULL,"
-            "  `end_time` TIME NOT NULL,"
-            "  `color` VARCHAR(50),"
-            "  `calendar_id` INT NOT NULL,"
-            "  `user_num` INT NOT NULL,"
-            "  `created_at` DATETIME DEFAULT CURRENT_TIMESTAMP,"
-            "  FOREIGN KEY (`calendar_id`) REFERENCES `calendars`(`calendar_id`) ON DELETE CASCADE,"
-            "  FOREIGN KEY (`user_num`) REFERENCES `users`(`user_num`) ON DELETE CASCADE"
-            ") ENGINE=InnoDB")
-
-        # friends 테이블
-        TABLES['friends'] = (
-            "CREATE TABLE IF NOT EXISTS `friends` ("
-            "  `id` INT AUTO_INCREMENT PRIMARY KEY,"
-            "  `user_id` INT NOT NULL,"
-            "  `friend_id` INT NOT NULL,"
-            "  `status` ENUM('pending', 'accepted', 'declined') NOT NULL DEFAULT 'pending',"
-            "  `created_at` DATETIME DEFAULT CURRENT_TIMESTAMP,"
-            "  `updated_at` DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,"
-            "  FOREIGN KEY (`user_id`) REFERENCES `users`(`user_num`) ON DELETE CASCADE,"
-            "  FOREIGN KEY (`friend_id`) REFERENCES `users`(`user_num`) ON DELETE CASCADE"
-            ") ENGINE=InnoDB")
-
-        # calendar_share 테이블
-        TABLES['calendar_share'] = (
-            "CREATE TABLE IF NOT EXISTS `calendar_share` ("
-            "  `share_id` INT AUTO_INCREMENT PRIMARY KEY,"
-            "  `calendar_id` INT NOT NULL,"
-            "  `inviter_id` INT NOT NULL,"
-            "  `invitee_id` INT NOT NULL,"
-            "  `role` VARCHAR(50) NOT NULL DEFAULT 'viewer',"
-            "  `status` ENUM('pending', 'accepted', 'declined') NOT NULL DEFAULT 'pending',"
-            "  `created_at` DATETIME DEFAULT CURRENT_TIMESTAMP,"
-            "  FOREIGN KEY (`calendar_id`) REFERENCES `calendars`(`calendar_id`) ON DELETE CASCADE,"
-            "  FOREIGN KEY (`inviter_id`) REFERENCES `users`(`user_num`) ON DELETE CASCADE,"
-            "  FOREIGN KEY (`invitee_id`) REFERENCES `users`(`user_num`) ON DELETE CASCADE"
-            ") ENGINE=InnoDB")
-
-        # posts 테이블
-        TABLES['posts'] = (
-            "CREATE TABLE IF NOT EXISTS `posts` ("
-            "  `post_num` INT AUTO_INCREMENT PRIMARY KEY,"
-            "  `user_id` INT NOT NULL,"
-            "  `calendar_num` INT NOT NULL,"
-            "  `post_title` VARCHAR(255) NOT NULL,"
-            "  `post_content` TEXT,"
-            "  `created_at` DATETIME DEFAULT CURRENT_TIMESTAMP,"
-            "  FOREIGN KEY (`user_id`) REFERENCES `users`(`user_num`) ON DELETE CASCADE,"
-            "  FOREIGN KEY (`calendar_num`) REFERENCES `calendars`(`calendar_id`) ON DELETE CASCADE"
-            ") ENGINE=InnoDB")
-
-        # comments 테이블
-        TABLES['comments'] = (
-            "CREATE TABLE IF NOT EXISTS `comments` ("
-            "  `comment_num` INT AUTO_INCREMENT PRIMARY KEY,"
-            "  `user_id` INT NOT NULL,"
-            "  `post_num` INT NOT NULL,"
-            "  `comment_content` TEXT,"
-            "  `created_at` DATETIME DEFAULT CURRENT_TIMESTAMP,"
-            "  FOREIGN KEY (`user_id`) REFERENCES `users`(`user_num`) ON DELETE CASCADE,"
-            "  FOREIGN KEY (`post_num`) REFERENCES `posts`(`post_num`) ON DELETE CASCADE"
-            ") ENGINE=InnoDB")
-
-        for table_name in TABLES:
-            table_description = TABLES[table_name]
-            try:
-                print(f"Creating table {table_name}: ", end='')
-                cursor.execute(table_description)
-                print("OK")
-            except mysql.connector.Error as err:
-                if err.errno == errorcode.ER_TABLE_EXISTS_ERROR:
-                    print("already exists.")
-                else:
-                    print(err.msg)
-        
-        cursor.close()
-        print("MySQL tables created/verified.")
-        
+        with get_db() as conn:
+            applied = migrations.migrate(conn)
+        if applied:
+            print(f"MySQL schema migrated: {applied}")
+        else:
+            print("MySQL schema is up to date.")
     except Exception as e:
         print(f"Table creation error: {e}")
-    finally:
-        if conn and conn.is_connected():
-            conn.close()
+
+# ==============================================================================
+# Session
+# ==============================================================================
+SESSION_EXEMPT_PATHS = {'/login', '/register', '/test', '/health'}
+# 요청 본문에서 "누가 하는 요청인지"를 나타내는 필드 (모두 users.user_num 값)
+SESSION_IDENTITY_FIELDS = ('user_num', 'user_id', 'inviter_id')
+
+def session_token_from_request():
+    """
+    Authorization: Bearer <token>, 없으면 access_token 쿼리 파라미터 (EventSource는 헤더를 보낼 수 없음).
+    토큰을 저장하지 않은 클라이언트가 보내는 'Bearer null' 같은 값은 토큰 없음으로 취급합니다.
+    """
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    if scheme.lower() != 'bearer':
+        token = ''
+    token = token.strip() or request.args.get('access_token', '')
+    return None if token in ('', 'null', 'undefined') else token
+
+def claimed_user_nums():
+    """
+    요청이 자기 것이라고 주장하는 사용자 번호들: 경로/쿼리의 user_num, JSON 본문의 SESSION_IDENTITY_FIELDS,
+    일괄 생성(events 목록) 항목의 user_num.
+    """
+    claimed = [(request.view_args or {}).get('user_num'), request.args.get('user_num')]
+    body = request.get_json(silent=True) if request.is_json else None
+    if isinstance(body, dict):
+        claimed.extend(body.get(field) for field in SESSION_IDENTITY_FIELDS)
+        items = body.get('events')
+        if isinstance(items, list):
+            claimed.extend(item.get('user_num') for item in items if isinstance(item, dict))
+    return {str(value) for value in claimed if value not in (None, '')}
+
+@app.before_request
+def load_session():
+    """요청의 세션 토큰을 검증해 g.session(claims 또는 None)에 둡니다. DB 조회 없음."""
+    g.session = None
+    if request.method == 'OPTIONS' or request.path in SESSION_EXEMPT_PATHS:
+        return None
+    token = session_token_from_request()
+    if token is None:
+        if SESSION_REQUIRED and request.path.startswith('/api/'):
+            return jsonify({'message': 'Authentication required'}), 401
+        return None
+    try:
+        g.session = session_tokens.verify(token)
+    except InvalidToken as e:
+        return jsonify({'message': f'Invalid session token ({e.reason})'}), 401
+
+    # 토큰이 있으면 경로/쿼리/본문 어디에서도 다른 사용자 번호로 요청할 수 없음
+    if claimed_user_nums() - {str(g.session['sub'])}:
+        return jsonify({'message': 'user_num does not match session'}), 403
+    return None
+
+@app.route('/logout', methods=['POST'])
+def logout():
+    if g.session:
+        session_tokens.revoke(g.session)
+    return jsonify({'message': '로그아웃 성공'}), 200
+
+@app.route('/api/session', methods=['GET'])
+def get_session():
+    """현재 토큰의 사용자 (DB 조회 없음)"""
+    if not g.session:
+        return jsonify({'message': 'Authentication required'}), 401
+    return jsonify({'user_num': g.session['sub'], 'expires_at': g.session['exp']}), 200
 
 @app.route('/test', methods=['GET'])
 def test():
@@ -207,34 +244,35 @@ def register():
         missing = [f for f in required_fields if not data.get(f)]
         return jsonify({'message': f'Missing fields: {", ".join(missing)}'}), 400
     
-    conn = None
     try:
-        conn = get_db()
-        cursor = conn.cursor(dictionary=True)
-        
-        sql = "SELECT * FROM users WHERE user_id = %s OR user_mail = %s"
-        cursor.execute(sql, (data['email'], data['email']))
-        if cursor.fetchone():
-            return jsonify({'message': 'User already exists'}), 409
-
-        print(f"Registering user: {data['email']}, Username: {data['username']}, Phone: {data['phone']}") # Debugging
-        print(f"Plain password (before hashing): {data['password']}") # Debugging
-        hashed_password = generate_password_hash(data['password'])
-        print(f"Hashed password (to be saved): {hashed_password}") # Debugging
-
-        sql = "INSERT INTO users (user_id, user_mail, user_name, user_pass, user_phone) VALUES (%s, %s, %s, %s, %s)"
-        cursor.execute(sql, (data['email'], data['email'], data['username'], hashed_password, data['phone']))
-        conn.commit()
-        user_num = cursor.lastrowid
+        with get_db() as conn:
+            cursor = conn.cursor(dictionary=True)
+            sql = "SELECT user_num FROM users WHERE user_id = %s OR user_mail = %s"
+            cursor.execute(sql, (data['email'], data['email']))
+            if cursor.fetchone():
+                return jsonify({'message': 'User already exists'}), 409
+    except mysql.connector.Error as e:
+        return jsonify({'message': f'Database error: {str(e)}'}), 500
+
+    # 해시를 계산하는 동안에는 DB 연결을 잡고 있지 않음
+    try:
+        hashed_password = services.password_hasher.hash(data['password'])
+    except HasherBusy:
+        return password_hasher_busy()
+
+    try:
+        with get_db() as conn:
+            cursor = conn.cursor(dictionary=True)
+            print(f"Registering user: {data['email']}, Username: {data['username']}, Phone: {data['phone']}") # Debugging
+            sql = "INSERT INTO users (user_id, user_mail, user_name, user_pass, user_phone) VALUES (%s, %s, %s, %s, %s)"
+            cursor.execute(sql, (data['email'], data['email'], data['username'], hashed_password, data['phone']))
+            conn.commit()
+            user_num = cursor.lastrowid
         
-        return jsonify({'message': '가입 성공', 'user_num': user_num}), 201
+            return jsonify({'message': '가입 성공', 'user_num': user_num}), 201
             
     except mysql.connector.Error as e:
         return jsonify({'message': f'Database error: {str(e)}'}), 500
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
 
 @app.route('/login', methods=['POST'])
 def login():
@@ -243,49 +281,66 @@ def login():
         return jsonify({'message': 'Email and password are required'}), 400
     
     print(f"Login attempt for email: {data['email']}") # Debugging
-    print(f"Password provided: {data['password']}") # Debugging
-    conn = None
     try:
-        conn = get_db()
-        cursor = conn.cursor(dictionary=True)
-        
-        # Retrieve user by email/user_id
-        sql = "SELECT * FROM users WHERE user_id = %s OR user_mail = %s"
-        cursor.execute(sql, (data['email'], data['email']))
-        user = cursor.fetchone()
+        with get_db() as conn:
+            cursor = conn.cursor(dictionary=True)
         
-        if user:
-            print(f"User found: {user['user_mail']}") # Debugging
-            print(f"Stored hashed password: {user['user_pass']}") # Debugging
-            # Verify the password
-            if check_password_hash(user['user_pass'], data['password']):
-                print(f"check_password_hash result: True") # Debugging
-                print(f"Login successful for user: {user['user_mail']}") # Debugging
-                
-                # Frontend-compatible user object
-                user_data = {
-                    'user_num': user['user_num'],
-                    'id': user['user_num'],
-                    'username': user['user_name'],
-                    'email': user['user_mail'],
-                    'phone': user['user_phone']
-                }
-                return jsonify({'message': '로그인 성공', 'user': user_data}), 200
-            else:
-                print(f"check_password_hash result: False") # Debugging
-                print(f"Password mismatch for user: {data['email']}") # Debugging
-                return jsonify({'message': 'Invalid email or password'}), 401
-        else:
-            print(f"User not found: {data['email']}") # Debugging
-            return jsonify({'message': 'Invalid email or password'}), 401
-                
+            # Retrieve user by email/user_id
+            sql = "SELECT * FROM users WHERE user_id = %s OR user_mail = %s"
+            cursor.execute(sql, (data['email'], data['email']))
+            user = cursor.fetchone()
     except mysql.connector.Error as e:
         print(f"Database error during login: {e}") # Debugging
         return jsonify({'message': f'Database error: {str(e)}'}), 500
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
+
+    if not user:
+        print(f"User not found: {data['email']}") # Debugging
+        return jsonify({'message': 'Invalid email or password'}), 401
+
+    # Verify the password (작업 풀에서, DB 연결을 반납한 뒤)
+    try:
+        ok, upgraded_hash = services.password_hasher.verify(user['user_pass'], data['password'])
+    except HasherBusy:
+        return password_hasher_busy()
+    if not ok:
+        print(f"Password mismatch for user: {data['email']}") # Debugging
+        return jsonify({'message': 'Invalid email or password'}), 401
+
+    if upgraded_hash:
+        rehash_password(user, upgraded_hash)
+    print(f"Login successful for user: {user['user_mail']}") # Debugging
+
+    # Frontend-compatible user object
+    user_data = {
+        'user_num': user['user_num'],
+        'id': user['user_num'],
+        'username': user['user_name'],
+        'email': user['user_mail'],
+        'phone': user['user_phone']
+    }
+    token, claims = session_tokens.issue(user['user_num'])
+    return jsonify({'message': '로그인 성공', 'user': user_data,
+                    'token': token, 'expires_at': claims['exp']}), 200
+
+def password_hasher_busy():
+    """해시 작업 풀이 꽉 찼을 때의 응답 (클라이언트는 잠시 후 재시도)"""
+    response = jsonify({'message': 'Server is busy, please retry shortly'})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
+def rehash_password(user, new_hash):
+    """
+    오래된 방식/비용의 해시를 로그인 시 새 해시로 교체.
+    그 사이 비밀번호가 바뀌었으면 덮어쓰지 않고, 실패해도 로그인은 그대로 성공시킵니다.
+    """
+    try:
+        with get_db() as conn:
+            cursor = conn.cursor()
+            sql = "UPDATE users SET user_pass = %s WHERE user_num = %s AND user_pass = %s"
+            cursor.execute(sql, (new_hash, user['user_num'], user['user_pass']))
+            conn.commit()
+    except mysql.connector.Error as e:
+        print(f"Password rehash failed for user {user['user_num']}: {e}")
 
 # Calendar Routes
 @app.route('/api/calendars', methods=['POST'])
@@ -295,21 +350,17 @@ def create_calendar():
     if not all(data.get(f) for f in required):
         return jsonify({'message': 'user_num and calendar_name are required'}), 400
 
-    conn = None
     try:
-        conn = get_db()
-        cursor = conn.cursor()
-        sql = "INSERT INTO calendars (user_num, calendar_name, calendar_purpose, calendar_color) VALUES (%s, %s, %s, %s)"
-        cursor.execute(sql, (data['user_num'], data['calendar_name'], data.get('calendar_purpose'), data.get('calendar_color')))
-        conn.commit()
-        calendar_id = cursor.lastrowid
-        return jsonify({'message': 'Calendar created successfully', 'calendar_id': calendar_id}), 201
+        with get_db() as conn:
+            cursor = conn.cursor()
+            sql = "INSERT INTO calendars (user_num, calendar_name, calendar_purpose, calendar_color) VALUES (%s, %s, %s, %s)"
+            cursor.execute(sql, (data['user_num'], data['calendar_name'], data.get('calendar_purpose'), data.get('calendar_color')))
+            conn.commit()
+            resource_versions.bump('user_calendars', data['user_num'])
+            calendar_id = cursor.lastrowid
+            return jsonify({'message': 'Calendar created successfully', 'calendar_id': calendar_id}), 201
     except mysql.connector.Error as e:
         return jsonify({'message': f'Database error: {str(e)}'}), 500
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
 
 @app.route('/api/calendars', methods=['GET'])
 def get_calendars():
@@ -317,40 +368,32 @@ def get_calendars():
     if not user_num:
         return jsonify({'message': 'user_num query parameter is required'}), 400
     
-    conn = None
+    def load():
+        with get_db() as conn:
+            cursor = conn.cursor(dictionary=True)
+            sql = "SELECT * FROM calendars WHERE user_num = %s"
+            cursor.execute(sql, (user_num,))
+            return cursor.fetchall()
+
     try:
-        conn = get_db()
-        cursor = conn.cursor(dictionary=True)
-        sql = "SELECT * FROM calendars WHERE user_num = %s"
-        cursor.execute(sql, (user_num,))
-        calendars = cursor.fetchall()
-        return jsonify(calendars), 200
+        return versioned_json('user_calendars', user_num, load)
     except mysql.connector.Error as e:
         return jsonify({'message': f'Database error: {str(e)}'}), 500
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
 
 @app.route('/api/calendars/<int:calendar_id>', methods=['GET'])
 def get_calendar(calendar_id):
-    conn = None
     try:
-        conn = get_db()
-        cursor = conn.cursor(dictionary=True)
-        sql = "SELECT * FROM calendars WHERE calendar_id = %s"
-        cursor.execute(sql, (calendar_id,))
-        calendar = cursor.fetchone()
-        if calendar:
-            return jsonify(calendar), 200
-        else:
-            return jsonify({'message': 'Calendar not found'}), 404
+        with get_db() as conn:
+            cursor = conn.cursor(dictionary=True)
+            sql = "SELECT * FROM calendars WHERE calendar_id = %s"
+            cursor.execute(sql, (calendar_id,))
+            calendar = cursor.fetchone()
+            if calendar:
+                return jsonify(calendar), 200
+            else:
+                return jsonify({'message': 'Calendar not found'}), 404
     except mysql.connector.Error as e:
         return jsonify({'message': f'Database error: {str(e)}'}), 500
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
 
 # Event Routes
 @app.route('/api/events', methods=['POST'])
@@ -360,59 +403,288 @@ def create_event():
     if not all(data.get(f) for f in required):
         return jsonify({'message': 'Missing required fields'}), 400
 
-    conn = None
-    try:
-        conn = get_db()
-        cursor = conn.cursor()
-        sql = "INSERT INTO events (title, content, start_date, end_date, start_time, end_time, color, calendar_id, user_num) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)"
-        cursor.execute(sql, (
-            data['title'], data.get('content'), data['start_date'], data['end_date'],
-            data['start_time'], data['end_time'], data.get('color'),
-            data['calendar_id'], data['user_num']
-        ))
-        conn.commit()
-        event_id = cursor.lastrowid
-        return jsonify({'message': '이벤트 생성 성공', 'event_id': event_id}), 201
+    try:
+        with get_db() as conn:
+            cursor = conn.cursor()
+            sql = "INSERT INTO events (title, content, start_date, end_date, start_time, end_time, color, calendar_id, user_num) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)"
+            cursor.execute(sql, (
+                data['title'], data.get('content'), data['start_date'], data['end_date'],
+                data['start_time'], data['end_time'], data.get('color'),
+                data['calendar_id'], data['user_num']
+            ))
+            conn.commit()
+            resource_versions.bump('calendar_events', data['calendar_id'])
+            resource_versions.bump('user_events', data['user_num'])
+            event_id = cursor.lastrowid
+            return jsonify({'message': '이벤트 생성 성공', 'event_id': event_id}), 201
     except mysql.connector.Error as e:
         return jsonify({'message': f'Database error: {str(e)}'}), 500
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
+
+# ==============================================================================
+# Bulk event creation
+# ==============================================================================
+MAX_BULK_EVENTS = 500
+
+def parse_time(value):
+    """'HH:MM' 또는 'HH:MM:SS'를 'HH:MM:SS'로 정규화. 잘못된 값은 ValueError"""
+    value = str(value).strip()
+    fmt = '%H:%M:%S' if len(value) > 5 else '%H:%M'
+    return datetime.strptime(value, fmt).strftime('%H:%M:%S')
+
+def split_date_time(value):
+    """
+    'YYYY-MM-DD', 'YYYY-MM-DD-HH:mm', 'YYYY-MM-DDTHH:mm[:ss]' 형태를 (date, time|None)으로 분리.
+    AI 어시스턴트(_normalize_schedule)가 돌려주는 형식도 그대로 받을 수 있습니다.
+    """
+    value = str(value).strip()
+    day, time_part = value[:10], value[11:]
+    parsed_day = date.fromisoformat(day).isoformat()
+    return parsed_day, (parse_time(time_part) if time_part else None)
+
+def normalize_bulk_event(item, defaults):
+    """
+    벌크 요청의 이벤트 하나를 검증하고 INSERT 파라미터 튜플로 변환합니다.
+    calendar_id / user_num / color는 요청 최상위 값을 기본값으로 사용합니다.
+    시간이 전혀 없으면 종일 일정(00:00:00 ~ 23:59:59)으로 저장합니다.
+    잘못된 항목은 ValueError를 발생시킵니다.
+    """
+    if not isinstance(item, dict):
+        raise ValueError('Event must be an object')
+    ev = dict(defaults)
+    ev.update({k: v for k, v in item.items() if v not in (None, '')})
+
+    if not ev.get('title') or not ev.get('start_date'):
+        raise ValueError('title and start_date are required')
+    ev.setdefault('end_date', ev['start_date'])
+
+    try:
+        start_date, start_time = split_date_time(ev['start_date'])
+        end_date, end_time = split_date_time(ev['end_date'])
+    except ValueError:
+        raise ValueError('start_date/end_date must be YYYY-MM-DD or YYYY-MM-DD-HH:mm')
+    try:
+        if ev.get('start_time'):
+            start_time = parse_time(ev['start_time'])
+        if ev.get('end_time'):
+            end_time = parse_time(ev['end_time'])
+    except ValueError:
+        raise ValueError('start_time/end_time must be HH:MM or HH:MM:SS')
+    start_time = start_time or '00:00:00'
+    end_time = end_time or ('23:59:59' if start_time == '00:00:00' else start_time)
+
+    if (end_date, end_time) < (start_date, start_time):
+        raise ValueError('end must not be before start')
+
+    missing = [f for f in ('calendar_id', 'user_num') if not ev.get(f)]
+    if missing:
+        raise ValueError(f'Missing fields: {", ".join(missing)}')
+
+    return (
+        str(ev['title'])[:255], ev.get('content'), start_date, end_date,
+        start_time, end_time, ev.get('color'), ev['calendar_id'], ev['user_num']
+    )
+
+EVENT_INSERT_SQL = "INSERT INTO events (title, content, start_date, end_date, start_time, end_time, color, calendar_id, user_num) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)"
+
+# innodb_autoinc_lock_mode=2(interleaved, MySQL 8 기본값): 동시에 실행된 INSERT들과 AUTO_INCREMENT 값이 섞일 수 있음
+AUTOINC_INTERLEAVED = 2
+
+def find_missing_ids(cursor, table, column, ids):
+    """ids 중 table에 없는 값 (JSON의 1 과 "1"은 같은 값으로 취급)"""
+    ids = list({str(i) for i in ids})
+    placeholders = ', '.join(['%s'] * len(ids))
+    cursor.execute(f"SELECT `{column}` FROM `{table}` WHERE `{column}` IN ({placeholders})", ids)
+    found = {str(row[0]) for row in cursor.fetchall()}
+    return set(ids) - found
+
+def insert_bulk_rows(cursor, pending):
+    """
+    pending [(index, row)]를 INSERT하고 {index: event_id 또는 오류 문자열}을 반환합니다.
+
+    lock mode 0/1에서는 multi-row INSERT 한 문장으로 보내고 id를 계산합니다.
+    (행 수가 정해진 "simple insert"는 연속된 AUTO_INCREMENT 값을 받음)
+    interleaved 모드이거나 한 문장 INSERT가 실패하면 한 행씩 INSERT해서 실제 id(lastrowid)를 받고,
+    제약 위반/너무 긴 값 같은 행 단위 오류는 그 항목의 오류로 돌려줍니다. (InnoDB는 실패한 문장만 되돌림)
+    """
+    cursor.execute("SELECT @@auto_increment_increment, @@innodb_autoinc_lock_mode")
+    step, lock_mode = cursor.fetchone()
+    rows = [row for _, row in pending]
+
+    if int(lock_mode) != AUTOINC_INTERLEAVED and len(rows) > 1:
+        cursor.execute("SAVEPOINT bulk_insert")
+        try:
+            # mysql.connector는 INSERT ... VALUES의 executemany를 multi-row INSERT 한 문장으로 보냄
+            cursor.executemany(EVENT_INSERT_SQL, rows)
+            first_id = cursor.lastrowid
+            return {index: first_id + offset * step for offset, (index, _) in enumerate(pending)}
+        except (mysql.connector.IntegrityError, mysql.connector.DataError):
+            cursor.execute("ROLLBACK TO SAVEPOINT bulk_insert")
+
+    outcome = {}
+    for index, row in pending:
+        try:
+            cursor.execute(EVENT_INSERT_SQL, row)
+            outcome[index] = cursor.lastrowid
+        except (mysql.connector.IntegrityError, mysql.connector.DataError) as e:
+            outcome[index] = f'Database error: {e.msg}'
+    return outcome
+
+@app.route('/api/events/bulk', methods=['POST'])
+def create_events_bulk():
+    """
+    여러 이벤트를 한 트랜잭션으로 생성합니다.
+
+    요청: {"calendar_id": 1, "user_num": 2, "events": [{...}, ...]}
+    응답: results는 요청 순서 그대로 {"index", "event_id"} 또는 {"index", "error"}
+    검증 오류, 없는 캘린더/사용자, 행 단위 DB 오류는 해당 항목의 error로만 보고하고 나머지는 저장합니다.
+    """
+    data = request.get_json() or {}
+    items = data.get('events')
+    if not isinstance(items, list) or not items:
+        return jsonify({'message': 'events must be a non-empty list'}), 400
+    if len(items) > MAX_BULK_EVENTS:
+        return jsonify({'message': f'At most {MAX_BULK_EVENTS} events per request'}), 400
+
+    defaults = {k: data[k] for k in ('calendar_id', 'user_num', 'color') if data.get(k)}
+    results = []
+    pending = []
+    for index, item in enumerate(items):
+        try:
+            pending.append((index, normalize_bulk_event(item, defaults)))
+            results.append({'index': index})
+        except ValueError as e:
+            results.append({'index': index, 'error': str(e)})
+
+    if not pending:
+        return jsonify({'message': 'No valid events', 'results': results}), 400
+
+    try:
+        with get_db() as conn:
+            cursor = conn.cursor()
+            # FK 위반 하나로 배치 전체가 실패하지 않도록, 없는 캘린더/사용자를 참조하는 항목은 미리 걸러냄
+            missing_calendars = find_missing_ids(cursor, 'calendars', 'calendar_id', [row[7] for _, row in pending])
+            missing_users = find_missing_ids(cursor, 'users', 'user_num', [row[8] for _, row in pending])
+            valid = []
+            for index, row in pending:
+                if str(row[7]) in missing_calendars:
+                    results[index]['error'] = f'Calendar {row[7]} not found'
+                elif str(row[8]) in missing_users:
+                    results[index]['error'] = f'User {row[8]} not found'
+                else:
+                    valid.append((index, row))
+            pending = valid
+
+            if pending:
+                outcome = insert_bulk_rows(cursor, pending)
+                conn.commit()
+                for index, value in outcome.items():
+                    results[index]['event_id' if isinstance(value, int) else 'error'] = value
+    except mysql.connector.Error as e:
+        return jsonify({'message': f'Database error: {str(e)}', 'results': results}), 500
+
+    created_rows = [row for index, row in pending if 'event_id' in results[index]]
+    if not created_rows:
+        return jsonify({'message': 'No valid events', 'results': results}), 400
+    # 항목마다 calendar_id/user_num이 다를 수 있음
+    resource_versions.bump('calendar_events', *{row[7] for row in created_rows})
+    resource_versions.bump('user_events', *{row[8] for row in created_rows})
+
+    created = len(created_rows)
+    return jsonify({
+        'message': f'{created}개 이벤트 생성 성공',
+        'created': created,
+        'failed': len(results) - created,
+        'event_ids': [r['event_id'] for r in results if 'event_id' in r],
+        'results': results,
+    }), 201
+
+# 조회 시 선택할 수 있는 events 컬럼 (fields 쿼리 파라미터 화이트리스트)
+EVENT_COLUMNS = (
+    'event_id', 'title', 'content', 'start_date', 'end_date', 'start_time',
+    'end_time', 'color', 'calendar_id', 'user_num', 'created_at'
+)
+
+def build_event_query(owner_column, owner_id, args):
+    """
+    이벤트 목록 조회 SQL을 만듭니다.
+
+    - from / to (YYYY-MM-DD): 이 기간과 겹치는 일정만 조회.
+      start_date <= to AND end_date >= from 조건은 (owner, start_date, ...) /
+      (owner, end_date, ...) 인덱스의 범위 조건으로 처리됩니다.
+    - fields: 반환할 컬럼 목록 (예: fields=event_id,title,start_date,end_date,color)
+      월간 그리드처럼 content TEXT가 필요 없는 화면에서 사용합니다.
+
+    잘못된 파라미터는 ValueError를 발생시킵니다.
+    """
+    fields = args.get('fields')
+    if fields:
+        columns = [f.strip() for f in fields.split(',') if f.strip()]
+        unknown = [c for c in columns if c not in EVENT_COLUMNS]
+        if unknown or not columns:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        projection = ', '.join(f'`{c}`' for c in columns)
+    else:
+        projection = '*'
+
+    sql = f"SELECT {projection} FROM events WHERE {owner_column} = %s"
+    params = [owner_id]
+
+    range_from = args.get('from')
+    range_to = args.get('to')
+    try:
+        range_from = date.fromisoformat(range_from) if range_from else None
+        range_to = date.fromisoformat(range_to) if range_to else None
+    except ValueError:
+        raise ValueError('from/to must be YYYY-MM-DD')
+    if range_from and range_to and range_from > range_to:
+        raise ValueError('from must not be after to')
+
+    if range_to:
+        sql += " AND start_date <= %s"
+        params.append(range_to)
+    if range_from:
+        sql += " AND end_date >= %s"
+        params.append(range_from)
+    if range_from or range_to:
+        sql += " ORDER BY start_date, start_time"
+
+    return sql, tuple(params)
 
 @app.route('/api/calendars/<int:calendar_id>/events', methods=['GET'])
 def get_events_for_calendar(calendar_id):
-    conn = None
     try:
-        conn = get_db()
-        cursor = conn.cursor(dictionary=True)
-        sql = "SELECT * FROM events WHERE calendar_id = %s"
-        cursor.execute(sql, (calendar_id,))
-        events = cursor.fetchall()
-        return jsonify(events), 200
+        sql, params = build_event_query('calendar_id', calendar_id, request.args)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+
+    def load():
+        with get_db() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    try:
+        return versioned_json('calendar_events', calendar_id, load)
     except mysql.connector.Error as e:
         return jsonify({'message': f'Database error: {str(e)}'}), 500
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
 
 @app.route('/api/user/<int:user_num>/events', methods=['GET'])
 def get_events_for_user(user_num):
-    conn = None
     try:
-        conn = get_db()
-        cursor = conn.cursor(dictionary=True)
-        sql = "SELECT * FROM events WHERE user_num = %s"
-        cursor.execute(sql, (user_num,))
-        events = cursor.fetchall()
-        return jsonify(events), 200
+        sql, params = build_event_query('user_num', user_num, request.args)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+
+    def load():
+        with get_db() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    try:
+        return versioned_json('user_events', user_num, load)
     except mysql.connector.Error as e:
         return jsonify({'message': f'Database error: {str(e)}'}), 500
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
 
 # ==============================================================================
 # Friends API Routes
@@ -426,21 +698,25 @@ def send_friend_request():
     if not user_id or not friend_id:
         return jsonify({'message': 'user_id and friend_id are required'}), 400
 
-    conn = None
     try:
-        conn = get_db()
-        cursor = conn.cursor()
-        # TODO: Check for existing friendship/request
-        sql = "INSERT INTO friends (user_id, friend_id, status) VALUES (%s, %s, 'pending')"
-        cursor.execute(sql, (user_id, friend_id))
-        conn.commit()
-        return jsonify({'message': 'Friend request sent'}), 201
+        with get_db() as conn:
+            cursor = conn.cursor()
+            # TODO: Check for existing friendship/request
+            sql = "INSERT INTO friends (user_id, friend_id, status) VALUES (%s, %s, 'pending')"
+            cursor.execute(sql, (user_id, friend_id))
+            conn.commit()
+            request_id = cursor.lastrowid
+
+            cursor.execute("SELECT user_name FROM users WHERE user_num = %s", (user_id,))
+            requester = cursor.fetchone()
+            notification_hub.publish(friend_id, 'friend_request', {
+                'id': request_id,
+                'user_id': user_id,
+                'user_name': requester[0] if requester else None,
+            })
+            return jsonify({'message': 'Friend request sent'}), 201
     except mysql.connector.Error as e:
         return jsonify({'message': f'Database error: {str(e)}'}), 500
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
 
 @app.route('/api/friends/request/<int:request_id>', methods=['PUT'])
 def respond_to_friend_request(request_id):
@@ -450,44 +726,34 @@ def respond_to_friend_request(request_id):
     if not status or status not in ['accepted', 'declined']:
         return jsonify({'message': 'A valid status (accepted, declined) is required'}), 400
 
-    conn = None
     try:
-        conn = get_db()
-        cursor = conn.cursor()
-        sql = "UPDATE friends SET status = %s WHERE id = %s"
-        cursor.execute(sql, (status, request_id))
-        conn.commit()
-        if cursor.rowcount == 0:
-            return jsonify({'message': 'Request not found'}), 404
-        return jsonify({'message': f'Friend request {status}'}), 200
+        with get_db() as conn:
+            cursor = conn.cursor()
+            sql = "UPDATE friends SET status = %s WHERE id = %s"
+            cursor.execute(sql, (status, request_id))
+            conn.commit()
+            if cursor.rowcount == 0:
+                return jsonify({'message': 'Request not found'}), 404
+            return jsonify({'message': f'Friend request {status}'}), 200
     except mysql.connector.Error as e:
         return jsonify({'message': f'Database error: {str(e)}'}), 500
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
 
 @app.route('/api/users/<int:user_num>/friends', methods=['GET'])
 def get_user_friends(user_num):
-    conn = None
     try:
-        conn = get_db()
-        cursor = conn.cursor(dictionary=True)
-        # Get friends where the friendship is accepted
-        sql = """ 
-            SELECT u.* FROM users u JOIN friends f ON u.user_num = f.friend_id WHERE f.user_id = %s AND f.status = 'accepted'
-            UNION
-            SELECT u.* FROM users u JOIN friends f ON u.user_num = f.user_id WHERE f.friend_id = %s AND f.status = 'accepted'
-        """
-        cursor.execute(sql, (user_num, user_num))
-        friends = cursor.fetchall()
-        return jsonify(friends), 200
+        with get_db() as conn:
+            cursor = conn.cursor(dictionary=True)
+            # Get friends where the friendship is accepted
+            sql = """ 
+                SELECT u.* FROM users u JOIN friends f ON u.user_num = f.friend_id WHERE f.user_id = %s AND f.status = 'accepted'
+                UNION
+                SELECT u.* FROM users u JOIN friends f ON u.user_num = f.user_id WHERE f.friend_id = %s AND f.status = 'accepted'
+            """
+            cursor.execute(sql, (user_num, user_num))
+            friends = cursor.fetchall()
+            return jsonify(friends), 200
     except mysql.connector.Error as e:
         return jsonify({'message': f'Database error: {str(e)}'}), 500
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
 
 # ==============================================================================
 # Calendar Invitation API Routes
@@ -499,59 +765,58 @@ def invite_user_to_calendar():
     if not all(data.get(f) for f in required):
         return jsonify({'message': 'Missing required fields'}), 400
 
-    conn = None
     try:
-        conn = get_db()
-        cursor = conn.cursor(dictionary=True)
-
-        # Find invitee by email
-        cursor.execute("SELECT user_num FROM users WHERE user_mail = %s", (data['invitee_email'],))
-        invitee = cursor.fetchone()
-        if not invitee:
-            return jsonify({'message': 'User with that email not found'}), 404
-        invitee_id = invitee['user_num']
-
-        # Check if already invited
-        sql = "SELECT * FROM calendar_share WHERE calendar_id = %s AND invitee_id = %s"
-        cursor.execute(sql, (data['calendar_id'], invitee_id))
-        if cursor.fetchone():
-            return jsonify({'message': 'User already invited to this calendar'}), 409
-
-        # Create invitation
-        sql = "INSERT INTO calendar_share (calendar_id, inviter_id, invitee_id, role) VALUES (%s, %s, %s, %s)"
-        cursor.execute(sql, (data['calendar_id'], data['inviter_id'], invitee_id, data['role']))
-        conn.commit()
-        
-        return jsonify({'message': 'Invitation sent successfully'}), 201
+        with get_db() as conn:
+            cursor = conn.cursor(dictionary=True)
+
+            # Find invitee by email
+            cursor.execute("SELECT user_num FROM users WHERE user_mail = %s", (data['invitee_email'],))
+            invitee = cursor.fetchone()
+            if not invitee:
+                return jsonify({'message': 'User with that email not found'}), 404
+            invitee_id = invitee['user_num']
+
+            # Check if already invited
+            sql = "SELECT * FROM calendar_share WHERE calendar_id = %s AND invitee_id = %s"
+            cursor.execute(sql, (data['calendar_id'], invitee_id))
+            if cursor.fetchone():
+                return jsonify({'message': 'User already invited to this calendar'}), 409
+
+            # Create invitation
+            sql = "INSERT INTO calendar_share (calendar_id, inviter_id, invitee_id, role) VALUES (%s, %s, %s, %s)"
+            cursor.execute(sql, (data['calendar_id'], data['inviter_id'], invitee_id, data['role']))
+            conn.commit()
+            share_id = cursor.lastrowid
+            # 알림 발행보다 먼저 올려서, 알림을 받고 다시 읽은 목록이 304가 되지 않게 함
+            resource_versions.bump('notifications', invitee_id)
+
+            # GET /api/notifications 와 같은 모양으로 초대받은 사용자에게 바로 전달
+            cursor.execute(NOTIFICATION_SELECT + " WHERE cs.share_id = %s", (share_id,))
+            notification = cursor.fetchone()
+            if notification:
+                notification_hub.publish(invitee_id, 'calendar_invite', notification)
+
+            return jsonify({'message': 'Invitation sent successfully'}), 201
     except mysql.connector.Error as e:
         return jsonify({'message': f'Database error: {str(e)}'}), 500
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
 
 @app.route('/api/users/<int:user_num>/invitations', methods=['GET'])
 def get_user_invitations(user_num):
-    conn = None
     try:
-        conn = get_db()
-        cursor = conn.cursor(dictionary=True)
-        sql = """
-            SELECT cs.share_id, cs.calendar_id, c.calendar_name, u.user_name as inviter_name, cs.role
-            FROM calendar_share cs
-            JOIN calendars c ON cs.calendar_id = c.calendar_id
-            JOIN users u ON cs.inviter_id = u.user_num
-            WHERE cs.invitee_id = %s AND cs.status = 'pending'
-        """
-        cursor.execute(sql, (user_num,))
-        invitations = cursor.fetchall()
-        return jsonify(invitations), 200
+        with get_db() as conn:
+            cursor = conn.cursor(dictionary=True)
+            sql = """
+                SELECT cs.share_id, cs.calendar_id, c.calendar_name, u.user_name as inviter_name, cs.role
+                FROM calendar_share cs
+                JOIN calendars c ON cs.calendar_id = c.calendar_id
+                JOIN users u ON cs.inviter_id = u.user_num
+                WHERE cs.invitee_id = %s AND cs.status = 'pending'
+            """
+            cursor.execute(sql, (user_num,))
+            invitations = cursor.fetchall()
+            return jsonify(invitations), 200
     except mysql.connector.Error as e:
         return jsonify({'message': f'Database error: {str(e)}'}), 500
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
 
 @app.route('/api/invitations/<int:share_id>', methods=['PUT'])
 def respond_to_invitation(share_id):
@@ -561,53 +826,142 @@ def respond_to_invitation(share_id):
     if not status or status not in ['accepted', 'declined']:
         return jsonify({'message': 'A valid status (accepted, declined) is required'}), 400
 
-    conn = None
     try:
-        conn = get_db()
-        cursor = conn.cursor()
-        sql = "UPDATE calendar_share SET status = %s WHERE share_id = %s"
-        cursor.execute(sql, (status, share_id))
-        conn.commit()
-        if cursor.rowcount == 0:
-            return jsonify({'message': 'Invitation not found'}), 404
-        return jsonify({'message': f'Invitation {status}'}), 200
+        with get_db() as conn:
+            cursor = conn.cursor()
+            sql = "UPDATE calendar_share SET status = %s WHERE share_id = %s"
+            cursor.execute(sql, (status, share_id))
+            conn.commit()
+            if cursor.rowcount == 0:
+                return jsonify({'message': 'Invitation not found'}), 404
+            publish_invitation_response(cursor, share_id, status)
+            return jsonify({'message': f'Invitation {status}'}), 200
     except mysql.connector.Error as e:
         return jsonify({'message': f'Database error: {str(e)}'}), 500
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
 
 # ==============================================================================
 # Notification API Routes
 # ==============================================================================
+NOTIFICATION_SELECT = """
+    SELECT cs.share_id, cs.calendar_id, c.calendar_name, u.user_name as inviter_name, cs.role, cs.created_at
+    FROM calendar_share cs
+    JOIN calendars c ON cs.calendar_id = c.calendar_id
+    JOIN users u ON cs.inviter_id = u.user_num
+"""
+
+# long-poll 최대 대기 시간, SSE 연결 하나의 최대 유지 시간(초, 끝나면 클라이언트가 Last-Event-ID로 재접속)
+NOTIFICATION_POLL_MAX_WAIT = 25.0
+NOTIFICATION_STREAM_MAX_AGE = 300.0
+NOTIFICATION_HEARTBEAT = 15.0
+
+def fetch_pending_notifications(user_num):
+    """대기 중인 캘린더 초대 목록 (최신순)"""
+    with get_db() as conn:
+        cursor = conn.cursor(dictionary=True)
+        sql = NOTIFICATION_SELECT + """
+            WHERE cs.invitee_id = %s AND cs.status = 'pending'
+            ORDER BY cs.created_at DESC
+        """
+        cursor.execute(sql, (user_num,))
+        return cursor.fetchall()
+
+def publish_invitation_response(cursor, share_id, status):
+    """초대 수락/거절을 초대받은 사용자(다른 탭 정리)와 초대한 사용자에게 알림"""
+    cursor.execute("SELECT calendar_id, inviter_id, invitee_id FROM calendar_share WHERE share_id = %s",
+                   (share_id,))
+    row = cursor.fetchone()
+    if not row:
+        return
+    if isinstance(row, dict):
+        calendar_id, inviter_id, invitee_id = row['calendar_id'], row['inviter_id'], row['invitee_id']
+    else:
+        calendar_id, inviter_id, invitee_id = row
+    resource_versions.bump('notifications', invitee_id)
+    payload = {'share_id': share_id, 'calendar_id': calendar_id, 'status': status}
+    notification_hub.publish(invitee_id, 'invitation_resolved', payload)
+    notification_hub.publish(inviter_id, 'invitation_response', dict(payload, invitee_id=invitee_id))
+
 @app.route('/api/notifications', methods=['GET'])
 def get_notifications():
     user_num = request.args.get('user_num')
     if not user_num:
         return jsonify({'message': 'user_num query parameter is required'}), 400
 
-    conn = None
+    # 조회 전에 커서를 잡아 두면 조회와 구독 사이에 발행된 알림도 놓치지 않음
+    # (버전도 커서 다음에 읽으므로, 304여도 이 커서 이전 알림은 클라이언트 목록에 반영되어 있음)
+    cursor_id = notification_hub.cursor
     try:
-        conn = get_db()
-        cursor = conn.cursor(dictionary=True)
-        sql = """
-            SELECT cs.share_id, cs.calendar_id, c.calendar_name, u.user_name as inviter_name, cs.role, cs.created_at
-            FROM calendar_share cs
-            JOIN calendars c ON cs.calendar_id = c.calendar_id
-            JOIN users u ON cs.inviter_id = u.user_num
-            WHERE cs.invitee_id = %s AND cs.status = 'pending'
-            ORDER BY cs.created_at DESC
-        """
-        cursor.execute(sql, (user_num,))
-        notifications = cursor.fetchall()
-        return jsonify(notifications), 200
+        response = versioned_json('notifications', user_num, lambda: fetch_pending_notifications(user_num))
     except mysql.connector.Error as e:
         return jsonify({'message': f'Database error: {str(e)}'}), 500
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
+    response.headers['X-Notification-Cursor'] = str(cursor_id)
+    return response
+
+@app.route('/api/notifications/poll', methods=['GET'])
+def poll_notifications():
+    """
+    long-poll: after 이후 알림이 생길 때까지 최대 wait초(최대 25초) 기다렸다가 응답.
+    after가 없거나 너무 오래되어 알림을 놓쳤으면 DB의 대기 중 목록을 snapshot으로 함께 보냅니다.
+    """
+    user_num = request.args.get('user_num')
+    if not user_num:
+        return jsonify({'message': 'user_num query parameter is required'}), 400
+    try:
+        wait = min(max(float(request.args.get('wait', NOTIFICATION_POLL_MAX_WAIT)), 0.0), NOTIFICATION_POLL_MAX_WAIT)
+    except ValueError:
+        return jsonify({'message': 'wait must be a number'}), 400
+
+    # after가 없거나 재시작 전 프로세스의 커서면 complete=False → snapshot
+    after = request.args.get('after')
+    snapshot = None
+    events, complete = notification_hub.wait(user_num, after, timeout=wait)
+    if not complete:
+        after = notification_hub.cursor
+        try:
+            snapshot = fetch_pending_notifications(user_num)
+        except mysql.connector.Error as e:
+            return jsonify({'message': f'Database error: {str(e)}'}), 500
+        events = []
+
+    cursor_id = events[-1]['id'] if events else after
+    return jsonify({'events': events, 'snapshot': snapshot, 'cursor': cursor_id}), 200
+
+@app.route('/api/notifications/stream', methods=['GET'])
+def stream_notifications():
+    """
+    SSE 알림 채널. 처음 접속(또는 놓친 알림이 있을 때)에만 DB에서 snapshot을 읽고,
+    그 뒤로는 발행된 알림을 바로 밀어줍니다. 재접속 시 브라우저가 보내는 Last-Event-ID로 이어 받습니다.
+    """
+    user_num = request.args.get('user_num')
+    if not user_num:
+        return jsonify({'message': 'user_num query parameter is required'}), 400
+    after = request.headers.get('Last-Event-ID') or request.args.get('after')
+
+    def generate():
+        nonlocal after
+        # 재접속 간격(ms)
+        yield "retry: 3000\n\n"
+        # 처음 접속, 놓친 알림이 있거나 서버 재시작 전 커서면 snapshot부터
+        if not notification_hub.events_after(user_num, after)[1]:
+            after = notification_hub.cursor
+            yield sse_event('snapshot', fetch_pending_notifications(user_num), event_id=after)
+
+        expires_at = time.monotonic() + NOTIFICATION_STREAM_MAX_AGE
+        while time.monotonic() < expires_at:
+            events, complete = notification_hub.wait(user_num, after, timeout=NOTIFICATION_HEARTBEAT)
+            if not complete:
+                after = notification_hub.cursor
+                yield sse_event('snapshot', fetch_pending_notifications(user_num), event_id=after)
+                continue
+            if not events:
+                # 연결 유지용 주석 (프록시/브라우저 타임아웃 방지)
+                yield ": keepalive\n\n"
+                continue
+            for item in events:
+                after = item['id']
+                yield sse_event(item['event'], item['data'], event_id=item['id'])
+
+    return sse_response(generate())
 
 @app.route('/api/notifications/respond', methods=['POST'])
 def respond_to_notification():
@@ -618,34 +972,30 @@ def respond_to_notification():
     if not share_id or not status or status not in ['accepted', 'declined']:
         return jsonify({'message': 'share_id and a valid status (accepted, declined) are required'}), 400
 
-    conn = None
     try:
-        conn = get_db()
-        cursor = conn.cursor()
+        with get_db() as conn:
+            cursor = conn.cursor()
 
-        # Update the status in calendar_share table
-        sql = "UPDATE calendar_share SET status = %s WHERE share_id = %s"
-        cursor.execute(sql, (status, share_id))
-        conn.commit()
+            # Update the status in calendar_share table
+            sql = "UPDATE calendar_share SET status = %s WHERE share_id = %s"
+            cursor.execute(sql, (status, share_id))
+            conn.commit()
 
-        if cursor.rowcount == 0:
-            return jsonify({'message': 'Notification not found or already responded'}), 404
+            if cursor.rowcount == 0:
+                return jsonify({'message': 'Notification not found or already responded'}), 404
+            publish_invitation_response(cursor, share_id, status)
         
-        # If accepted, add the invitee to the calendar's member count (optional, based on your schema)
-        if status == 'accepted':
-            # You might want to add the user to a calendar_members table if you have one
-            # For now, let's assume the calendar_share entry itself signifies membership
-            # Or, if you have a member_count in calendars table, you might increment it here
-            # For simplicity, I'm not adding member count logic here, as it's not explicitly in your schema for this flow.
-            pass
-
-        return jsonify({'message': f'Notification {status} successfully'}), 200
+            # If accepted, add the invitee to the calendar's member count (optional, based on your schema)
+            if status == 'accepted':
+                # You might want to add the user to a calendar_members table if you have one
+                # For now, let's assume the calendar_share entry itself signifies membership
+                # Or, if you have a member_count in calendars table, you might increment it here
+                # For simplicity, I'm not adding member count logic here, as it's not explicitly in your schema for this flow.
+                pass
+
+            return jsonify({'message': f'Notification {status} successfully'}), 200
     except mysql.connector.Error as e:
         return jsonify({'message': f'Database error: {str(e)}'}), 500
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
 
 # ==============================================================================
 # Posts API Routes
@@ -657,38 +1007,99 @@ def create_post():
     if not all(data.get(f) for f in required):
         return jsonify({'message': 'Missing required fields'}), 400
 
-    conn = None
     try:
-        conn = get_db()
-        cursor = conn.cursor()
-        sql = "INSERT INTO posts (user_id, calendar_num, post_title, post_content) VALUES (%s, %s, %s, %s)"
-        cursor.execute(sql, (data['user_id'], data['calendar_num'], data['post_title'], data['post_content']))
-        conn.commit()
-        post_id = cursor.lastrowid
-        return jsonify({'message': 'Post created successfully', 'post_num': post_id}), 201
+        with get_db() as conn:
+            cursor = conn.cursor()
+            sql = "INSERT INTO posts (user_id, calendar_num, post_title, post_content) VALUES (%s, %s, %s, %s)"
+            cursor.execute(sql, (data['user_id'], data['calendar_num'], data['post_title'], data['post_content']))
+            conn.commit()
+            resource_versions.bump('calendar_posts', data['calendar_num'])
+            post_id = cursor.lastrowid
+            return jsonify({'message': 'Post created successfully', 'post_num': post_id}), 201
     except mysql.connector.Error as e:
         return jsonify({'message': f'Database error: {str(e)}'}), 500
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
+
+# ==============================================================================
+# Keyset 페이지네이션 헬퍼
+# ==============================================================================
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+def encode_cursor(created_at, row_id):
+    """마지막 행의 (created_at, id)를 불투명한 커서 토큰으로 인코딩"""
+    payload = json.dumps({'c': created_at.isoformat(), 'id': row_id})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def decode_cursor(token):
+    """커서 토큰을 (created_at, id)로 디코딩. 잘못된 토큰은 ValueError"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload['c']), int(payload['id'])
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+def parse_page_args(args):
+    """
+    limit / cursor 쿼리 파라미터를 해석합니다.
+    둘 다 없으면 None을 반환하고, 라우트는 기존처럼 전체 목록을 돌려줍니다.
+    """
+    if 'limit' not in args and 'cursor' not in args:
+        return None
+    try:
+        limit = int(args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise ValueError('limit must be an integer')
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    token = args.get('cursor')
+    after = decode_cursor(token) if token else None
+    return limit, after
+
+def fetch_keyset_page(cursor, base_sql, params, page, order, id_column, alias):
+    """
+    (created_at, id) 기준 keyset 페이지를 조회합니다.
+    OFFSET 대신 마지막으로 본 키 다음부터 읽으므로 깊은 페이지도 첫 페이지와 비용이 같습니다.
+    """
+    limit, after = page
+    op = '<' if order == 'DESC' else '>'
+    sql = base_sql
+    params = list(params)
+    if after:
+        sql += (f" AND ({alias}.created_at {op} %s"
+                f" OR ({alias}.created_at = %s AND {alias}.{id_column} {op} %s))")
+        params += [after[0], after[0], after[1]]
+    sql += f" ORDER BY {alias}.created_at {order}, {alias}.{id_column} {order} LIMIT %s"
+    params.append(limit + 1)
+
+    cursor.execute(sql, tuple(params))
+    rows = cursor.fetchall()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last['created_at'], last[id_column])
+    return {'items': rows, 'next_cursor': next_cursor}
 
 @app.route('/api/calendars/<int:calendar_num>/posts', methods=['GET'])
 def get_posts_for_calendar(calendar_num):
-    conn = None
     try:
-        conn = get_db()
-        cursor = conn.cursor(dictionary=True)
-        sql = "SELECT p.*, u.user_name FROM posts p JOIN users u ON p.user_id = u.user_num WHERE p.calendar_num = %s ORDER BY p.created_at DESC"
-        cursor.execute(sql, (calendar_num,))
-        posts = cursor.fetchall()
-        return jsonify(posts), 200
+        page = parse_page_args(request.args)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+
+    def load():
+        with get_db() as conn:
+            cursor = conn.cursor(dictionary=True)
+            sql = "SELECT p.*, u.user_name FROM posts p JOIN users u ON p.user_id = u.user_num WHERE p.calendar_num = %s"
+            if page:
+                return fetch_keyset_page(cursor, sql, (calendar_num,), page, 'DESC', 'post_num', 'p')
+            cursor.execute(sql + " ORDER BY p.created_at DESC", (calendar_num,))
+            return cursor.fetchall()
+
+    try:
+        return versioned_json('calendar_posts', calendar_num, load)
     except mysql.connector.Error as e:
         return jsonify({'message': f'Database error: {str(e)}'}), 500
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
 
 # ==============================================================================
 # Comments API Routes
@@ -700,38 +1111,39 @@ def create_comment():
     if not all(data.get(f) for f in required):
         return jsonify({'message': 'Missing required fields'}), 400
 
-    conn = None
     try:
-        conn = get_db()
-        cursor = conn.cursor()
-        sql = "INSERT INTO comments (user_id, post_num, comment_content) VALUES (%s, %s, %s)"
-        cursor.execute(sql, (data['user_id'], data['post_num'], data['comment_content']))
-        conn.commit()
-        comment_id = cursor.lastrowid
-        return jsonify({'message': 'Comment created successfully', 'comment_num': comment_id}), 201
+        with get_db() as conn:
+            cursor = conn.cursor()
+            sql = "INSERT INTO comments (user_id, post_num, comment_content) VALUES (%s, %s, %s)"
+            cursor.execute(sql, (data['user_id'], data['post_num'], data['comment_content']))
+            conn.commit()
+            comment_id = cursor.lastrowid
+            return jsonify({'message': 'Comment created successfully', 'comment_num': comment_id}), 201
     except mysql.connector.Error as e:
         return jsonify({'message': f'Database error: {str(e)}'}), 500
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
 
 @app.route('/api/posts/<int:post_num>/comments', methods=['GET'])
 def get_comments_for_post(post_num):
-    conn = None
     try:
-        conn = get_db()
-        cursor = conn.cursor(dictionary=True)
-        sql = "SELECT c.*, u.user_name FROM comments c JOIN users u ON c.user_id = u.user_num WHERE c.post_num = %s ORDER BY c.created_at ASC"
-        cursor.execute(sql, (post_num,))
-        comments = cursor.fetchall()
-        return jsonify(comments), 200
+        page = parse_page_args(request.args)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+
+    try:
+        with get_db() as conn:
+            cursor = conn.cursor(dictionary=True)
+            sql = "SELECT c.*, u.user_name FROM comments c JOIN users u ON c.user_id = u.user_num WHERE c.post_num = %s"
+            if page:
+                result = fetch_keyset_page(cursor, sql, (post_num,), page, 'ASC', 'comment_num', 'c')
+                return jsonify(result), 200
+            cursor.execute(sql + " ORDER BY c.created_at ASC", (post_num,))
+            comments = cursor.fetchall()
+            return jsonify(comments), 200
     except mysql.connector.Error as e:
         return jsonify({'message': f'Database error: {str(e)}'}), 500
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
+
+# AI 미리보기 이벤트가 참고하는 일정 기간(일)
+PREVIEW_DAYS = 3
 
 @app.route('/api/ai-assistant/preview-event', methods=['POST'])
 def preview_ai_event():
@@ -742,82 +1154,95 @@ def preview_ai_event():
     if not user_num or not calendar_id:
         return jsonify({'message': 'user_num and calendar_id are required'}), 400
 
-    conn = None
+    # 조회가 끝나면 바로 연결을 반납해서 GPT 호출 동안 풀 연결을 붙잡고 있지 않음
     try:
-        conn = get_db()
-        cursor = conn.cursor(dictionary=True)
-
-        # 향후 3일간의 일정 확인
-        sql = """
-            SELECT * FROM events 
-            WHERE user_num = %s AND start_date BETWEEN CURDATE() AND DATE_ADD(CURDATE(), INTERVAL 3 DAY)
-            ORDER BY start_date, start_time
-        """
-        cursor.execute(sql, (user_num,))
-        schedules = cursor.fetchall()
-
-        # Generate a random date within the next 7 days (including today)
-        random_days = random.randint(0, 6)
-        event_date = date.today() + timedelta(days=random_days)
-
-        title = ""
-        comment = ""
-        color = ""
-
-        if schedules:
-            # 일정이 있을 경우 (분류된 제목과 색상 사용)
-            try:
-                comment, _ = calendar_commentator.generate_comment(schedules)
-                title = random.choice(["급한 일정", "중요한 일정", "루틴 일정"])
-                
-                if title == "루틴 일정":
-                    color = "#28a745"  # Green
-                elif title == "중요한 일정":
-                    color = "#ffc0cb"  # Pink
-                else: # 급한 일정
-                    color = "#ADD8E6"  # Light Blue
-            except Exception as e:
-                return jsonify({"message": f"Calendar commentator error: {str(e)}"}), 500
-        else:
-            # 일정이 없을 경우 (고정된 제목과 색상 사용)
-            try:
-                comment = weather_commentator.generate_comment()
-                title = "오늘의 날씨 정보"
-                color = "#87CEFA"  # LightSkyBlue
-            except Exception as e:
-                return jsonify({"message": f"Weather commentator error: {str(e)}"}), 500
-
-        event_data = {
-            "calendar_id": calendar_id,
-            "user_num": user_num,
-            "start_date": event_date.isoformat(),
-            "end_date": event_date.isoformat(),
-            "start_time": "09:00:00",
-            "end_time": "09:30:00",
-            "color": color,
-            "title": title,
-            "content": comment
-        }
-        
-        return jsonify(event_data), 200
-
+        with get_db() as conn:
+            cursor = conn.cursor(dictionary=True)
+
+            # 향후 3일과 겹치는 일정 (이미 시작해서 진행 중인 일정 포함)
+            # 기간 조건은 idx_events_user_start / idx_events_user_end 인덱스로 걸러서 k개만 가져옴
+            sql = """
+                SELECT * FROM events
+                WHERE user_num = %s AND start_date <= DATE_ADD(CURDATE(), INTERVAL %s DAY) AND end_date >= CURDATE()
+                ORDER BY start_date, start_time
+            """
+            cursor.execute(sql, (user_num, PREVIEW_DAYS))
+            rows = cursor.fetchall()
     except mysql.connector.Error as e:
         return jsonify({'message': f'Database error: {str(e)}'}), 500
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
 
-if __name__ == '__main__':
-    print("Starting Flask server with MySQL connection...")
-    create_tables()
-    app.run(debug=True, host='127.0.0.1', port=5000)
+    # DB가 날짜 단위로 걸러 온 k개 중 시각 단위로 아직 끝나지 않은 일정만 사용
+    # (한 번만 묻는 목록이라 정렬 인덱스를 만들지 않고 한 번 훑음, 순서는 ORDER BY 그대로)
+    schedules = window_schedules(rows, datetime.now(), date.today() + timedelta(days=PREVIEW_DAYS))
 
+    # Generate a random date within the next 7 days (including today)
+    random_days = random.randint(0, 6)
+    event_date = date.today() + timedelta(days=random_days)
 
+    title = ""
+    comment = ""
+    color = ""
+
+    if schedules:
+        # 일정이 있을 경우 (분류된 제목과 색상 사용)
+        try:
+            comment, _ = services.calendar_commentator.generate_comment(schedules)
+            title = random.choice(["급한 일정", "중요한 일정", "루틴 일정"])
+        
+            if title == "루틴 일정":
+                color = "#28a745"  # Green
+            elif title == "중요한 일정":
+                color = "#ffc0cb"  # Pink
+            else: # 급한 일정
+                color = "#ADD8E6"  # Light Blue
+        except Exception as e:
+            return jsonify({"message": f"Calendar commentator error: {str(e)}"}), 500
+    else:
+        # 일정이 없을 경우 (고정된 제목과 색상 사용)
+        try:
+            comment = services.weather_commentator.generate_comment()
+            title = "오늘의 날씨 정보"
+            color = "#87CEFA"  # LightSkyBlue
+        except Exception as e:
+            return jsonify({"message": f"Weather commentator error: {str(e)}"}), 500
+
+    event_data = {
+        "calendar_id": calendar_id,
+        "user_num": user_num,
+        "start_date": event_date.isoformat(),
+        "end_date": event_date.isoformat(),
+        "start_time": "09:00:00",
+        "end_time": "09:30:00",
+        "color": color,
+        "title": title,
+        "content": comment
+    }
+
+    return jsonify(event_data), 200
 
 @app.route('/health', methods=['GET'])
 def health_check():
-    return jsonify({'status': 'healthy'}), 200
+    # 헬스 체크가 AI 모듈을 생성하지 않도록 이미 만들어진 것만 보고
+    ant_chat = services.peek("ant_chat")
+    weather_commentator = services.peek("weather_commentator")
+    password_hasher = services.peek("password_hasher")
+    return jsonify({
+        'status': 'healthy',
+        'db_pool': db_pool.stats(),
+        'llm_cache': ant_chat.get_cache_stats() if ant_chat else None,
+        'llm_pipeline': ant_chat.get_pipeline_stats() if ant_chat else None,
+        'conversations': ant_chat.get_conversation_stats() if ant_chat else None,
+        'jobs': ant_chat.get_job_stats() if ant_chat else None,
+        'news_articles': ant_chat.get_article_stats() if ant_chat else None,
+        'notifications': notification_hub.stats(),
+        'password_hasher': password_hasher.stats() if password_hasher else None,
+        'etag': resource_versions.stats(),
+        'sessions': session_tokens.stats(),
+        'weather_forecast': weather_commentator.get_forecast_stats() if weather_commentator else None,
+        'weather_advice': weather_commentator.get_advice_stats() if weather_commentator else None,
+        'services': services.report(),
+        'startup': startup.report(),
+    }), 200
 
 @app.route('/api/smart-comment', methods=['POST'])
 def get_smart_comment():
@@ -827,7 +1252,7 @@ def get_smart_comment():
         return jsonify({'success': False, 'error': 'Schedules are required'}), 400
 
     try:
-        comment = schedule_mediator.run(schedules)
+        comment = services.schedule_mediator.run(schedules)
         # Assuming schedule_mediator.run returns a simple string for now
         # You might need to adjust this based on the actual return type of run()
         return jsonify({'success': True, 'comment': comment}), 200
@@ -837,7 +1262,7 @@ def get_smart_comment():
 @app.route('/api/weather-comment', methods=['GET'])
 def get_weather_comment_route():
     try:
-        comment = weather_commentator.generate_comment()
+        comment = services.weather_commentator.generate_comment()
         return jsonify({'success': True, 'weather_comment': comment}), 200
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -850,7 +1275,7 @@ def get_calendar_comment_route():
         return jsonify({'success': False, 'error': 'Schedules are required'}), 400
 
     try:
-        comment, usage = calendar_commentator.generate_comment(schedules)
+        comment, usage = services.calendar_commentator.generate_comment(schedules)
         return jsonify({'success': True, 'calendar_comment': comment, 'token_usage': usage}), 200
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -858,20 +1283,109 @@ def get_calendar_comment_route():
 # ==============================================================================
 # AI Chatbot API Routes
 # ==============================================================================
+def chat_session_id(data):
+    """대화 기록을 나눌 키: 세션 토큰의 사용자 → 본문의 user_num → session_id"""
+    if g.session:
+        return g.session['sub']
+    return data.get('user_num') or data.get('session_id')
+
 @app.route('/api/chat', methods=['POST'])
 def chat():
     data = request.get_json()
     message = data.get('message')
+    # 대화 기록은 사용자별로 분리 (토큰이 있으면 토큰의 사용자, user_num도 없으면 공용 기본 세션)
+    session_id = chat_session_id(data)
 
     if not message:
         return jsonify({'error': 'Message is required'}), 400
 
     try:
-        response = ant_chat.process_message(message)
+        response = services.ant_chat.process_message(message, session_id=session_id)
         return jsonify(response), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def sse_event(event, data, event_id=None):
+    """Server-Sent Events 한 건 (event 이름 + JSON data, event_id를 주면 재접속 시 Last-Event-ID로 돌아옴)"""
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    prefix = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{prefix}event: {event}\ndata: {payload}\n\n"
+
+
+def sse_response(events):
+    """제너레이터를 text/event-stream 응답으로 (프록시 버퍼링 끔)"""
+    return Response(stream_with_context(events), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@app.route('/api/chat/stream', methods=['POST'])
+def chat_stream():
+    """
+    /api/chat의 스트리밍 버전 (SSE).
+    progress(단계) → token(답변 조각) → done(/api/chat과 같은 최종 결과) 순으로 보냅니다.
+    뉴스 크롤링이 필요하면 기다리지 않고 job(작업 id) → done으로 닫으며,
+    클라이언트는 /api/jobs/<id>/events 로 결과를 받습니다.
+    """
+    data = request.get_json()
+    message = data.get('message')
+    session_id = chat_session_id(data)
+
+    if not message:
+        return jsonify({'error': 'Message is required'}), 400
+
+    def generate():
+        # 첫 바이트를 바로 보내서 클라이언트가 처리 중임을 알 수 있게 함
+        yield sse_event('progress', {'stage': 'accepted'})
+        try:
+            for event, payload in services.ant_chat.process_message_stream(message, session_id=session_id):
+                yield sse_event(event, payload)
+        except Exception as e:
+            yield sse_event('error', {'error': str(e)})
+
+    return sse_response(generate())
+
+# 작업 상태 long-poll 최대 대기 시간(초)
+JOB_POLL_MAX_WAIT = 25.0
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """
+    백그라운드 작업(뉴스 크롤링 일정 추출) 상태/결과 조회.
+    ?wait=초 를 주면 작업이 끝날 때까지 최대 그만큼 기다렸다가 응답합니다. (long-poll)
+    """
+    try:
+        wait = min(max(float(request.args.get('wait', 0)), 0.0), JOB_POLL_MAX_WAIT)
+    except ValueError:
+        return jsonify({'error': 'wait must be a number'}), 400
+
+    job = services.ant_chat.get_job(job_id, wait=wait)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job), 200
+
+
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def get_job_events(job_id):
+    """작업 상태를 SSE로 전달 (status 이벤트 반복 → 끝나면 done 한 번)"""
+    ant_chat = services.ant_chat
+    if ant_chat.get_job(job_id) is None:
+        return jsonify({'error': 'Job not found'}), 404
+
+    def generate():
+        while True:
+            job = ant_chat.get_job(job_id, wait=JOB_POLL_MAX_WAIT)
+            if job is None:
+                yield sse_event('error', {'error': 'Job not found'})
+                return
+            if job['status'] in ('done', 'failed'):
+                yield sse_event('done', job)
+                return
+            # 대기 중에도 주기적으로 보내서 연결이 끊기지 않게 함
+            yield sse_event('status', {'id': job_id, 'status': job['status']})
+
+    return sse_response(generate())
+
 @app.route('/api/chat/upload', methods=['POST'])
 def chat_upload():
     if 'file' not in request.files:
@@ -888,7 +1402,7 @@ def chat_upload():
         
         try:
             # Process the file
-            response = ant_chat.process_file(temp_path)
+            response = services.ant_chat.process_file(temp_path)
             return jsonify(response), 200
         except Exception as e:
             return jsonify({'error': str(e)}), 500
@@ -898,3 +1412,26 @@ def chat_upload():
                 os.remove(temp_path)
     
     return jsonify({'error': 'File processing failed'}), 500
+
+
+startup.ready()
+
+if os.getenv("SERVICES_WARMUP", "0") == "1":
+    # 첫 요청이 초기화 비용을 내지 않도록 백그라운드에서 미리 생성
+    services.warm_up()
+
+def main():
+    """개발 서버 실행 (run.py 또는 python backend_new.py)"""
+    print("Starting Flask server with MySQL connection...")
+    print(f"⏱️ 모듈 로드 {startup.ready_ms}ms: "
+          + ", ".join(f"{p['name']} {p['ms']}ms" for p in startup.report()["slowest"]))
+    create_tables()
+    app.run(debug=True, host='127.0.0.1', port=5000)
+
+
+if __name__ == '__main__':
+    import multiprocessing
+    if multiprocessing.get_start_method() != 'fork':
+        # spawn 방식(Windows/macOS)에서는 해시 작업 프로세스마다 이 파일 전체(앱, DB 풀...)를 다시 import함
+        print("⚠️ 이 플랫폼에서는 python run.py 로 실행하세요. (비밀번호 해시 작업 프로세스가 backend_new를 다시 불러옴)")
+    main()
@@ -0,0 +1,77 @@
+"""
+비밀번호 해시 처리량 벤치마크
+
+로그인 요청처럼 여러 스레드가 동시에 PasswordHasher.verify()를 호출할 때 초당 로그인 수를
+작업 프로세스 수별로 잽니다. workers=0은 기존처럼 요청 스레드에서 바로 계산하는 경우입니다.
+로그인이 몰리는 동안 다른 라우트가 얼마나 밀리는지 보려고, 가벼운 작업(ping)의 지연시간도 함께 잽니다.
+
+    cd finalbackend
+    python benchmarks/bench_password_hash.py                       # workers 0, 1, CPU 수
+    python benchmarks/bench_password_hash.py --method pbkdf2:sha256:600000 --workers 2 --logins 40
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from password_hasher import DEFAULT_METHOD, PasswordHasher  # noqa: E402
+
+
+def ping_latencies(stop, samples):
+    """다른 라우트 대신: 10ms마다 아주 가벼운 작업을 하고 실제로 걸린 시간을 기록 (GIL 대기 포함)"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        sum(range(1000))
+        samples.append((time.perf_counter() - started) * 1000)
+        time.sleep(0.01)
+
+
+def run(method, workers, logins, concurrency):
+    hasher = PasswordHasher(method=method, workers=workers, max_pending=max(concurrency, 1), queue_timeout=60)
+    stored = hasher.hash("correct horse battery staple")
+
+    stop, pings = threading.Event(), []
+    pinger = threading.Thread(target=ping_latencies, args=(stop, pings), daemon=True)
+    pinger.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: hasher.verify(stored, "correct horse battery staple"), range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    pinger.join()
+    hasher.shutdown()
+
+    assert all(ok for ok, _ in results)
+    rate = logins / elapsed
+    cores = max(workers, 1)
+    ping_p95 = statistics.quantiles(pings, n=20)[-1] if len(pings) >= 20 else max(pings or [0.0])
+    return rate, rate / cores, ping_p95
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--method", default=DEFAULT_METHOD, help="werkzeug 해시 방식 (기본: %(default)s)")
+    parser.add_argument("--workers", type=int, action="append", help="작업 프로세스 수 (여러 번 지정 가능)")
+    parser.add_argument("--logins", type=int, default=0, help="측정할 로그인 수 (기본: 작업 프로세스 수 * 10, 최소 20)")
+    parser.add_argument("--concurrency", type=int, default=16, help="동시에 로그인하는 요청 스레드 수")
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    worker_counts = args.workers or sorted({0, 1, cpus})
+    print(f"method={args.method} cpus={cpus} concurrency={args.concurrency}")
+    print(f"{'workers':>8}{'logins':>8}{'logins/s':>11}{'per core':>11}{'ping p95 ms':>13}")
+    for workers in worker_counts:
+        logins = args.logins or max(20, workers * 10)
+        rate, per_core, ping_p95 = run(args.method, workers, logins, args.concurrency)
+        print(f"{workers:>8}{logins:>8}{rate:>11.1f}{per_core:>11.1f}{ping_p95:>13.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
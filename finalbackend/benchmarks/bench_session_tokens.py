@@ -0,0 +1,82 @@
+"""
+세션 토큰 발급/검증 지연시간 벤치마크
+
+SessionTokens.issue()와 verify()(정상, 폐기된 토큰, 서명이 틀린 토큰)의 호출당 지연시간을 잽니다.
+비교용으로 로그인 때마다 하던 비밀번호 검증(check_password_hash) 한 번의 시간도 함께 보여줍니다.
+
+    cd finalbackend
+    python benchmarks/bench_session_tokens.py
+    python benchmarks/bench_session_tokens.py --iterations 200000 --revoked 10000
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from password_hasher import DEFAULT_METHOD  # noqa: E402
+from session_tokens import InvalidToken, SessionTokens  # noqa: E402
+from werkzeug.security import check_password_hash, generate_password_hash  # noqa: E402
+
+
+def measure(func, iterations):
+    """호출당 지연시간(µs) 목록"""
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1e6)
+    return samples
+
+
+def expect_invalid(tokens, token):
+    def call():
+        try:
+            tokens.verify(token)
+        except InvalidToken:
+            return
+        raise AssertionError("token should be rejected")
+    return call
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50000, help="측정 반복 횟수")
+    parser.add_argument("--revoked", type=int, default=10000, help="미리 채워 둘 폐기 목록 크기")
+    parser.add_argument("--method", default=DEFAULT_METHOD, help="비교할 비밀번호 해시 방식 (기본: %(default)s)")
+    args = parser.parse_args()
+
+    tokens = SessionTokens(secret=b"bench-secret", revoked_capacity=max(args.revoked, 1) + 1)
+    for user_num in range(args.revoked):
+        tokens.revoke(tokens.issue(user_num)[1])
+    valid, _ = tokens.issue(42)
+    revoked, claims = tokens.issue(43)
+    tokens.revoke(claims)
+    forged = valid[:-2] + ("AA" if not valid.endswith("AA") else "BB")
+
+    cases = [
+        ("issue", lambda: tokens.issue(42)),
+        ("verify", lambda: tokens.verify(valid)),
+        ("verify revoked", expect_invalid(tokens, revoked)),
+        ("verify forged", expect_invalid(tokens, forged)),
+    ]
+    print(f"iterations={args.iterations} revoked={args.revoked} token={len(valid)}B")
+    print(f"{'case':<18}{'median µs':>11}{'p99 µs':>10}{'ops/s':>12}")
+    for name, func in cases:
+        samples = measure(func, args.iterations)
+        median = statistics.median(samples)
+        p99 = statistics.quantiles(samples, n=100)[-1]
+        print(f"{name:<18}{median:>11.2f}{p99:>10.2f}{1e6 / statistics.mean(samples):>12.0f}")
+
+    stored = generate_password_hash("correct horse battery staple", method=args.method)
+    samples = measure(lambda: check_password_hash(stored, "correct horse battery staple"), 5)
+    print(f"{'password check':<18}{statistics.median(samples):>11.0f}{'':>10}{1e6 / statistics.mean(samples):>12.1f}"
+          f"  ({args.method})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
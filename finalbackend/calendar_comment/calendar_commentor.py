@@ -9,6 +9,7 @@ class CalendarCommentator:
     def __init__(self, api_key=None, model="gpt-4o-mini"):
         # Hardcoded key for debugging - NOT FOR PRODUCTION
         
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         # Removed ValueError check
         self.client = OpenAI(api_key=self.api_key)
         self.model = model
@@ -0,0 +1,254 @@
+"""
+MySQL 커넥션 풀
+
+요청마다 mysql.connector.connect()로 TCP/인증 핸드셰이크를 반복하지 않도록
+연결을 재사용합니다. 모든 라우트는 ConnectionPool.connection() 컨텍스트 매니저로
+연결을 빌리고 반납하므로, 핸들러에서 연결이 새어 나갈 수 없습니다.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import mysql.connector
+from mysql.connector import errorcode, errors
+
+
+class PoolExhaustedError(errors.PoolError):
+    """checkout_timeout 안에 빌릴 수 있는 연결이 없을 때 발생"""
+
+
+class PooledConnection:
+    """
+    풀에서 빌려준 연결의 얇은 래퍼.
+    생성한 커서를 기억해 두었다가 반납할 때 모두 닫아줍니다.
+    """
+
+    def __init__(self, raw):
+        self._raw = raw
+        self._cursors = []
+
+    def cursor(self, *args, **kwargs):
+        cur = self._raw.cursor(*args, **kwargs)
+        self._cursors.append(cur)
+        return cur
+
+    def close(self):
+        """풀 연결은 직접 닫지 않습니다. (컨텍스트 매니저가 반납)"""
+
+    def _close_cursors(self):
+        for cur in self._cursors:
+            try:
+                cur.close()
+            except Exception:
+                pass
+        self._cursors = []
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+class ConnectionPool:
+    """
+    크기 제한, 유휴 타임아웃, 체크아웃 시 헬스 체크, 고갈 지표를 가진 커넥션 풀.
+
+    Args:
+        config: mysql.connector.connect()에 넘길 접속 정보
+        size: 동시에 열어둘 수 있는 최대 연결 수
+        idle_timeout: 이 시간(초) 이상 놀고 있던 연결은 재사용하지 않고 닫음
+        checkout_timeout: 빈 연결을 기다리는 최대 시간(초), 넘으면 PoolExhaustedError
+        health_check_interval: 반납된 지 이 시간(초)이 지난 연결은 빌려주기 전에 ping
+    """
+
+    def __init__(self, config: dict, size: int = 5, idle_timeout: float = 300.0,
+                 checkout_timeout: float = 5.0, health_check_interval: float = 5.0,
+                 connect=None):
+        if size < 1:
+            raise ValueError("pool size must be >= 1")
+        self.config = dict(config)
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self.health_check_interval = health_check_interval
+        self._connect = connect or mysql.connector.connect
+
+        self._cond = threading.Condition()
+        self._idle = deque()  # (raw_conn, released_at) - 오른쪽이 가장 최근
+        self._open = 0        # 풀이 책임지는 연결 수 (유휴 + 대여 중 + 생성 중)
+        self._in_use = 0
+
+        self._stats = {
+            "checkouts": 0,
+            "created": 0,
+            "reused": 0,
+            "idle_expired": 0,
+            "health_check_failures": 0,
+            "discarded": 0,
+            "waits": 0,
+            "exhausted": 0,
+            "wait_time_total": 0.0,
+            "peak_in_use": 0,
+        }
+
+    # ──────────────────────────────────────────────────────────────────────
+    # 내부 유틸
+    # ──────────────────────────────────────────────────────────────────────
+    def _new_connection(self):
+        try:
+            conn = self._connect(**self.config)
+        except mysql.connector.Error as err:
+            if err.errno == errorcode.ER_ACCESS_DENIED_ERROR:
+                print("Something is wrong with your user name or password")
+            elif err.errno == errorcode.ER_BAD_DB_ERROR:
+                print("Database does not exist")
+            else:
+                print(err)
+            raise
+        with self._cond:
+            self._stats["created"] += 1
+        return conn
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _is_healthy(self, conn) -> bool:
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _acquire(self):
+        deadline = time.monotonic() + self.checkout_timeout
+        waited = False
+        started = time.monotonic()
+
+        with self._cond:
+            while True:
+                if self._idle:
+                    conn, released_at = self._idle.pop()
+                    break
+                if self._open < self.size:
+                    self._open += 1
+                    conn, released_at = None, None
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["exhausted"] += 1
+                    self._stats["wait_time_total"] += time.monotonic() - started
+                    raise PoolExhaustedError(
+                        msg=f"connection pool exhausted (size={self.size}, "
+                            f"timeout={self.checkout_timeout}s)")
+                if not waited:
+                    waited = True
+                    self._stats["waits"] += 1
+                self._cond.wait(remaining)
+
+            if waited:
+                self._stats["wait_time_total"] += time.monotonic() - started
+
+        # 네트워크 작업(ping/connect)은 락 밖에서 수행
+        if conn is not None:
+            idle_for = time.monotonic() - released_at
+            if idle_for > self.idle_timeout:
+                self._close_quietly(conn)
+                conn = None
+                with self._cond:
+                    self._stats["idle_expired"] += 1
+            elif idle_for > self.health_check_interval and not self._is_healthy(conn):
+                self._close_quietly(conn)
+                conn = None
+                with self._cond:
+                    self._stats["health_check_failures"] += 1
+            else:
+                with self._cond:
+                    self._stats["reused"] += 1
+
+        if conn is None:
+            try:
+                conn = self._new_connection()
+            except Exception:
+                with self._cond:
+                    self._open -= 1
+                    self._cond.notify()
+                raise
+
+        with self._cond:
+            self._in_use += 1
+            self._stats["checkouts"] += 1
+            self._stats["peak_in_use"] = max(self._stats["peak_in_use"], self._in_use)
+        return conn
+
+    def _release(self, conn, discard: bool = False):
+        if not discard:
+            try:
+                # 커밋되지 않은 트랜잭션이 다음 사용자에게 넘어가지 않도록 정리
+                if conn.in_transaction:
+                    conn.rollback()
+            except Exception:
+                discard = True
+
+        with self._cond:
+            self._in_use -= 1
+            if discard:
+                self._open -= 1
+                self._stats["discarded"] += 1
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+        if discard:
+            self._close_quietly(conn)
+
+    # ──────────────────────────────────────────────────────────────────────
+    # 공개 API
+    # ──────────────────────────────────────────────────────────────────────
+    @contextmanager
+    def connection(self):
+        """
+        연결을 빌려주고 블록이 끝나면 반드시 반납합니다.
+
+            with pool.connection() as conn:
+                cursor = conn.cursor(dictionary=True)
+                ...
+        """
+        raw = self._acquire()
+        wrapped = PooledConnection(raw)
+        discard = False
+        try:
+            yield wrapped
+        except (errors.OperationalError, errors.InterfaceError):
+            # 연결 자체가 깨졌을 가능성이 있으므로 풀에 되돌리지 않음
+            discard = True
+            raise
+        finally:
+            wrapped._close_cursors()
+            self._release(raw, discard=discard)
+
+    def close_all(self) -> None:
+        """유휴 연결을 모두 닫습니다. (대여 중인 연결은 반납 시점에 정리되지 않음)"""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._open -= len(idle)
+        for conn, _ in idle:
+            self._close_quietly(conn)
+
+    def stats(self) -> dict:
+        """풀 상태와 누적 지표를 반환"""
+        with self._cond:
+            data = dict(self._stats)
+            data.update({
+                "size": self.size,
+                "open": self._open,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+            })
+        data["wait_time_total"] = round(data["wait_time_total"], 4)
+        return data
@@ -1,43 +1,40 @@
 import os
 import json
 from datetime import datetime, timedelta
-import os
-import json
-from datetime import datetime, timedelta
+
+from schedule_index import ScheduleIndex, nearest_schedule
 # from dotenv import load_dotenv # Removed
 
 # Removed load_dotenv()
 
-# ✅ 외부 AI 모듈 임포트
-from weather.weather_alarm import WeatherCommentator
-from calendar_comment.calendar_commentor import CalendarCommentator
+# ✅ 외부 AI 모듈은 주입받지 않았을 때만 생성 시점에 임포트 (openai 등 무거운 import 지연)
 
 class ScheduleMediator:
-    def __init__(self, days_threshold: int = 3):
+    def __init__(self, days_threshold: int = 3, weather_commentator=None, calendar_commentator=None):
         """
         days_threshold: '며칠 이내가 가까운 일정인지' 판단 기준 (기본값 3일)
+        weather_commentator / calendar_commentator: 공유할 인스턴스 (예보 캐시를 같이 쓰도록)
         """
         self.days_threshold = days_threshold
-        self.weather_commentator = WeatherCommentator()
-        self.calendar_commentator = CalendarCommentator()
-
-    def find_nearest_schedule(self, schedules: list[dict]) -> dict | None:
+        if weather_commentator is None:
+            from weather.weather_alarm import WeatherCommentator
+            weather_commentator = WeatherCommentator()
+        if calendar_commentator is None:
+            from calendar_comment.calendar_commentor import CalendarCommentator
+            calendar_commentator = CalendarCommentator()
+        self.weather_commentator = weather_commentator
+        self.calendar_commentator = calendar_commentator
+
+    def find_nearest_schedule(self, schedules) -> dict | None:
+        """
+        오늘부터 days_threshold일 이내에 시작하는 가장 가까운 일정.
+        schedules는 일정 dict 목록이나 이미 만든 ScheduleIndex.
+        (목록이면 한 번만 묻고 버리므로 인덱스를 만들지 않고 한 번 훑음)
+        """
         today = datetime.today().date()
-        for schedule in schedules:
-            # ✅ start_date로부터 날짜 문자열만 자름
-            start_date_str = schedule.get("start_date")
-            if not start_date_str:
-                continue  # 일정에 시작 날짜 없으면 건너뜀
-
-            try:
-                schedule_date = datetime.strptime(start_date_str[:10], "%Y-%m-%d").date()
-            except ValueError:
-                continue  # 날짜 파싱 실패 시 건너뜀
-
-            if 0 <= (schedule_date - today).days <= self.days_threshold:
-                return schedule  # 가까운 일정 발견
-
-        return None
+        if isinstance(schedules, ScheduleIndex):
+            return schedules.nearest(today, within_days=self.days_threshold)
+        return nearest_schedule(schedules, today, within_days=self.days_threshold)
 
     def run(self, schedules: list[dict]) -> str:
         """
@@ -46,9 +43,10 @@ class ScheduleMediator:
         nearest = self.find_nearest_schedule(schedules)
 
         if nearest:
-            print(f"📅 가까운 일정 발견: {nearest['title']} ({nearest['start_date'][:10]})")
-            return self.weather_commentator.generate_comment(nearest['start_date'][:10])
+            start_date = str(nearest['start_date'])[:10]
+            print(f"📅 가까운 일정 발견: {nearest.get('title')} ({start_date})")
+            return self.weather_commentator.generate_comment(start_date)
         else:
             print("❌ 가까운 일정 없음 → 한줄평으로 대체")
             result, _ = self.calendar_commentator.generate_comment(schedules)
-            return result
\ No newline at end of file
+            return result
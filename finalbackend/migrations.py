@@ -0,0 +1,194 @@
+"""
+MySQL 스키마 마이그레이션
+
+버전 번호가 붙은 마이그레이션을 순서대로 적용하고, 적용된 버전을
+`schema_migrations` 테이블에 기록합니다. 이미 운영 중인 DB도 빠진 버전만
+적용되므로 그대로 업그레이드됩니다.
+
+새 스키마 변경은 MIGRATIONS 끝에 (버전, 설명, [SQL ...]) 형태로 추가하세요.
+이미 배포된 마이그레이션은 수정하지 말고 새 버전을 추가해야 합니다.
+"""
+
+import mysql.connector
+from mysql.connector import errorcode
+
+MIGRATION_LOCK_NAME = "checkmate_schema_migrations"
+
+# MySQL DDL은 암묵적으로 커밋되므로, 중간에 실패한 마이그레이션을 다시 실행해도
+# 안전하도록 "이미 있음" 오류는 적용된 것으로 취급합니다.
+IGNORABLE_ERRORS = (
+    errorcode.ER_TABLE_EXISTS_ERROR,
+    errorcode.ER_DUP_KEYNAME,
+)
+
+MIGRATIONS = [
+    (1, "initial schema", [
+        # users 테이블
+        "CREATE TABLE IF NOT EXISTS `users` ("
+        "  `user_num` INT AUTO_INCREMENT PRIMARY KEY,"
+        "  `user_id` VARCHAR(255) NOT NULL UNIQUE,"
+        "  `user_mail` VARCHAR(255) NOT NULL,"
+        "  `user_name` VARCHAR(255) NOT NULL,"
+        "  `user_phone` VARCHAR(50),"
+        "  `user_pass` VARCHAR(255) NOT NULL"
+        ") ENGINE=InnoDB",
+
+        # calendars 테이블
+        "CREATE TABLE IF NOT EXISTS `calendars` ("
+        "  `calendar_id` INT AUTO_INCREMENT PRIMARY KEY,"
+        "  `calendar_name` VARCHAR(255) NOT NULL,"
+        "  `calendar_purpose` TEXT,"
+        "  `calendar_color` VARCHAR(50),"
+        "  `user_num` INT NOT NULL,"
+        "  `member_count` INT DEFAULT 1,"
+        "  `created_at` DATETIME DEFAULT CURRENT_TIMESTAMP,"
+        "  FOREIGN KEY (`user_num`) REFERENCES `users`(`user_num`) ON DELETE CASCADE"
+        ") ENGINE=InnoDB",
+
+        # events 테이블
+        "CREATE TABLE IF NOT EXISTS `events` ("
+        "  `event_id` INT AUTO_INCREMENT PRIMARY KEY,"
+        "  `title` VARCHAR(255) NOT NULL,"
+        "  `content` TEXT,"
+        "  `start_date` DATE NOT NULL,"
+        "  `end_date` DATE NOT NULL,"
+        "  `start_time` TIME NOT NULL,"
+        "  `end_time` TIME NOT NULL,"
+        "  `color` VARCHAR(50),"
+        "  `calendar_id` INT NOT NULL,"
+        "  `user_num` INT NOT NULL,"
+        "  `created_at` DATETIME DEFAULT CURRENT_TIMESTAMP,"
+        "  FOREIGN KEY (`calendar_id`) REFERENCES `calendars`(`calendar_id`) ON DELETE CASCADE,"
+        "  FOREIGN KEY (`user_num`) REFERENCES `users`(`user_num`) ON DELETE CASCADE"
+        ") ENGINE=InnoDB",
+
+        # friends 테이블
+        "CREATE TABLE IF NOT EXISTS `friends` ("
+        "  `id` INT AUTO_INCREMENT PRIMARY KEY,"
+        "  `user_id` INT NOT NULL,"
+        "  `friend_id` INT NOT NULL,"
+        "  `status` ENUM('pending', 'accepted', 'declined') NOT NULL DEFAULT 'pending',"
+        "  `created_at` DATETIME DEFAULT CURRENT_TIMESTAMP,"
+        "  `updated_at` DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,"
+        "  FOREIGN KEY (`user_id`) REFERENCES `users`(`user_num`) ON DELETE CASCADE,"
+        "  FOREIGN KEY (`friend_id`) REFERENCES `users`(`user_num`) ON DELETE CASCADE"
+        ") ENGINE=InnoDB",
+
+        # calendar_share 테이블
+        "CREATE TABLE IF NOT EXISTS `calendar_share` ("
+        "  `share_id` INT AUTO_INCREMENT PRIMARY KEY,"
+        "  `calendar_id` INT NOT NULL,"
+        "  `inviter_id` INT NOT NULL,"
+        "  `invitee_id` INT NOT NULL,"
+        "  `role` VARCHAR(50) NOT NULL DEFAULT 'viewer',"
+        "  `status` ENUM('pending', 'accepted', 'declined') NOT NULL DEFAULT 'pending',"
+        "  `created_at` DATETIME DEFAULT CURRENT_TIMESTAMP,"
+        "  FOREIGN KEY (`calendar_id`) REFERENCES `calendars`(`calendar_id`) ON DELETE CASCADE,"
+        "  FOREIGN KEY (`inviter_id`) REFERENCES `users`(`user_num`) ON DELETE CASCADE,"
+        "  FOREIGN KEY (`invitee_id`) REFERENCES `users`(`user_num`) ON DELETE CASCADE"
+        ") ENGINE=InnoDB",
+
+        # posts 테이블
+        "CREATE TABLE IF NOT EXISTS `posts` ("
+        "  `post_num` INT AUTO_INCREMENT PRIMARY KEY,"
+        "  `user_id` INT NOT NULL,"
+        "  `calendar_num` INT NOT NULL,"
+        "  `post_title` VARCHAR(255) NOT NULL,"
+        "  `post_content` TEXT,"
+        "  `created_at` DATETIME DEFAULT CURRENT_TIMESTAMP,"
+        "  FOREIGN KEY (`user_id`) REFERENCES `users`(`user_num`) ON DELETE CASCADE,"
+        "  FOREIGN KEY (`calendar_num`) REFERENCES `calendars`(`calendar_id`) ON DELETE CASCADE"
+        ") ENGINE=InnoDB",
+
+        # comments 테이블
+        "CREATE TABLE IF NOT EXISTS `comments` ("
+        "  `comment_num` INT AUTO_INCREMENT PRIMARY KEY,"
+        "  `user_id` INT NOT NULL,"
+        "  `post_num` INT NOT NULL,"
+        "  `comment_content` TEXT,"
+        "  `created_at` DATETIME DEFAULT CURRENT_TIMESTAMP,"
+        "  FOREIGN KEY (`user_id`) REFERENCES `users`(`user_num`) ON DELETE CASCADE,"
+        "  FOREIGN KEY (`post_num`) REFERENCES `posts`(`post_num`) ON DELETE CASCADE"
+        ") ENGINE=InnoDB",
+    ]),
+
+    # 자주 쓰는 조회 경로용 복합 인덱스 (filesort 제거)
+    # InnoDB 보조 인덱스에는 PK가 뒤에 붙으므로 (calendar_num, created_at) 인덱스는
+    # ORDER BY created_at, post_num 까지 인덱스 순서로 처리됩니다.
+    (2, "composite indexes for hot queries", [
+        "CREATE INDEX `idx_events_user_start` ON `events` (`user_num`, `start_date`, `start_time`)",
+        "CREATE INDEX `idx_share_invitee_status_created` ON `calendar_share` (`invitee_id`, `status`, `created_at`)",
+        "CREATE INDEX `idx_posts_calendar_created` ON `posts` (`calendar_num`, `created_at`)",
+        "CREATE INDEX `idx_comments_post_created` ON `comments` (`post_num`, `created_at`)",
+    ]),
+
+    # 기간 겹침 조회 (start_date <= to AND end_date >= from)
+    # 옵티마이저가 더 좁은 쪽 범위를 고를 수 있도록 end_date 선두 인덱스를 추가하고,
+    # 두 날짜를 모두 담아 나머지 조건도 인덱스 안에서 걸러지게 합니다.
+    (3, "date range indexes for windowed event queries", [
+        "CREATE INDEX `idx_events_user_end` ON `events` (`user_num`, `end_date`, `start_date`)",
+        "CREATE INDEX `idx_events_calendar_start` ON `events` (`calendar_id`, `start_date`, `end_date`)",
+        "CREATE INDEX `idx_events_calendar_end` ON `events` (`calendar_id`, `end_date`, `start_date`)",
+    ]),
+]
+
+
+def _ensure_version_table(cursor) -> None:
+    cursor.execute(
+        "CREATE TABLE IF NOT EXISTS `schema_migrations` ("
+        "  `version` INT PRIMARY KEY,"
+        "  `description` VARCHAR(255) NOT NULL,"
+        "  `applied_at` DATETIME DEFAULT CURRENT_TIMESTAMP"
+        ") ENGINE=InnoDB")
+
+
+def applied_versions(cursor) -> set:
+    """schema_migrations에 기록된 버전 목록"""
+    cursor.execute("SELECT version FROM schema_migrations")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def migrate(conn, migrations=None) -> list:
+    """
+    아직 적용되지 않은 마이그레이션을 버전 순서대로 적용합니다.
+    여러 프로세스가 동시에 시작해도 한 번만 적용되도록 GET_LOCK으로 직렬화합니다.
+
+    Returns:
+        이번 실행에서 새로 적용한 버전 목록
+    """
+    migrations = sorted(MIGRATIONS if migrations is None else migrations, key=lambda m: m[0])
+    cursor = conn.cursor()
+    cursor.execute("SELECT GET_LOCK(%s, 30)", (MIGRATION_LOCK_NAME,))
+    locked = cursor.fetchone()[0]
+    if locked != 1:
+        raise RuntimeError("could not acquire schema migration lock")
+
+    newly_applied = []
+    try:
+        _ensure_version_table(cursor)
+        done = applied_versions(cursor)
+
+        for version, description, statements in migrations:
+            if version in done:
+                continue
+
+            print(f"Applying migration {version} ({description}): ", end='')
+            for statement in statements:
+                try:
+                    cursor.execute(statement)
+                except mysql.connector.Error as err:
+                    if err.errno not in IGNORABLE_ERRORS:
+                        print(err.msg)
+                        raise
+            cursor.execute(
+                "INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+                (version, description))
+            conn.commit()
+            newly_applied.append(version)
+            print("OK")
+    finally:
+        cursor.execute("SELECT RELEASE_LOCK(%s)", (MIGRATION_LOCK_NAME,))
+        cursor.fetchone()
+        cursor.close()
+
+    return newly_applied
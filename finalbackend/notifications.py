@@ -0,0 +1,130 @@
+"""
+사용자 알림 pub/sub
+
+초대/친구 요청 같은 알림을 DB 폴링 없이 전달하기 위한 프로세스 내 허브입니다.
+쓰기 라우트가 커밋한 뒤 publish()하고, SSE/long-poll 라우트는 wait()로 새 알림이 올 때까지 잠들어
+있으므로 새 알림이 없는 클라이언트는 DB를 조회하지 않습니다.
+
+- 알림마다 전역 순번(seq)을 붙이고 사용자별로 최근 backlog개를 보관합니다.
+  클라이언트는 마지막으로 받은 커서(SSE의 Last-Event-ID)를 넘겨 놓친 알림을 이어 받습니다.
+- 커서는 "<epoch>-<seq>" 문자열입니다. seq는 재시작하면 0부터 다시 세므로, 다른 epoch(재시작 전 프로세스)의
+  커서나 형식이 잘못된 커서, 아직 발행되지 않은 seq는 놓친 알림이 있는 것으로 봅니다.
+- 보관 범위를 벗어나 알림을 놓쳤으면 complete=False를 돌려주므로, 그때만 DB에서 목록을 다시 읽습니다.
+- 프로세스 안에서만 동작합니다. (워커 프로세스를 여러 개 띄우면 각자 허브를 가짐)
+
+    hub = NotificationHub()
+    hub.publish(user_num, "calendar_invite", {...})
+    events, complete = hub.wait(user_num, after=last_cursor, timeout=25)
+"""
+
+import os
+import threading
+import time
+from collections import defaultdict, deque
+
+
+class NotificationHub:
+    """
+    사용자별 알림 대기열 + 대기 중인 구독자 깨우기
+
+    Args:
+        backlog: 사용자마다 보관할 최근 알림 수
+        retention: 알림 보관 시간(초)
+    """
+
+    def __init__(self, backlog=100, retention=3600):
+        self.backlog = backlog
+        self.retention = retention
+        self._cond = threading.Condition()
+        # 재시작 전 프로세스가 발급한 커서와 구분하기 위한 값
+        self.epoch = format(int(time.time() * 1000) ^ os.getpid(), "x")
+        self._seq = 0
+        self._events = defaultdict(deque)     # user → deque[(seq, published_at, event, data)]
+        self._dropped_upto = {}               # user → 보관 범위에서 밀려난 가장 큰 seq
+        self._subscribers = 0
+        self._stats = {"published": 0, "delivered": 0, "resyncs": 0, "wakeups": 0}
+
+    @property
+    def cursor(self):
+        """현재까지 발행된 마지막 알림의 커서 (이 값 이후부터 받으면 지금부터의 알림)"""
+        with self._cond:
+            return self._format(self._seq)
+
+    def _format(self, seq):
+        return f"{self.epoch}-{seq}"
+
+    def _parse_locked(self, after):
+        """이 프로세스가 발급한 커서면 seq, 아니면(없음/다른 epoch/형식 오류/미래 seq) None"""
+        epoch, _, seq = str(after or "").rpartition("-")
+        if epoch != self.epoch or not seq.isdigit() or int(seq) > self._seq:
+            return None
+        return int(seq)
+
+    def publish(self, user_num, event, data):
+        """user_num에게 알림 발행. 발행된 알림의 커서 반환"""
+        user = str(user_num)
+        now = time.time()
+        with self._cond:
+            self._seq += 1
+            queue = self._events[user]
+            queue.append((self._seq, now, event, data))
+            self._trim_locked(user, queue, now)
+            self._stats["published"] += 1
+            self._cond.notify_all()
+            return self._format(self._seq)
+
+    def _trim_locked(self, user, queue, now):
+        while queue and (len(queue) > self.backlog or now - queue[0][1] > self.retention):
+            self._dropped_upto[user] = queue.popleft()[0]
+
+    def events_after(self, user_num, after):
+        """
+        after(커서) 이후의 알림 목록과, 그 사이 알림을 하나도 놓치지 않았는지(complete) 반환.
+        after가 None이거나 이 프로세스의 커서가 아니면 ([], False).
+        """
+        user = str(user_num)
+        with self._cond:
+            return self._events_after_locked(user, after)
+
+    def _events_after_locked(self, user, after):
+        after = self._parse_locked(after)
+        if after is None:
+            return [], False
+        queue = self._events.get(user)
+        if queue:
+            self._trim_locked(user, queue, time.time())
+        complete = after >= self._dropped_upto.get(user, 0)
+        events = [{"id": self._format(seq), "event": event, "data": data}
+                  for seq, _, event, data in (queue or ()) if seq > after]
+        return events, complete
+
+    def wait(self, user_num, after, timeout=25.0):
+        """
+        after(커서) 이후 알림이 생길 때까지 최대 timeout초 기다림 (DB 조회 없음).
+        (알림 목록, complete) 반환 - 시간이 다 되면 빈 목록, 커서가 유효하지 않으면 바로 ([], False).
+        """
+        user = str(user_num)
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._subscribers += 1
+            try:
+                while True:
+                    events, complete = self._events_after_locked(user, after)
+                    if events or not complete:
+                        self._stats["delivered"] += len(events)
+                        self._stats["resyncs"] += not complete
+                        return events, complete
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return [], True
+                    self._cond.wait(remaining)
+                    self._stats["wakeups"] += 1
+            finally:
+                self._subscribers -= 1
+
+    def stats(self):
+        with self._cond:
+            data = dict(self._stats)
+            data.update({"cursor": self._format(self._seq), "waiting": self._subscribers,
+                         "users": sum(1 for q in self._events.values() if q)})
+        return data
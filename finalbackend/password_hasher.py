@@ -0,0 +1,184 @@
+"""
+비밀번호 해시 작업 풀
+
+generate_password_hash / check_password_hash는 일부러 느리게 만든 CPU 작업(scrypt 기본 약 100ms)이라
+/register, /login 요청 스레드에서 바로 돌리면 로그인이 몰릴 때 GIL과 CPU를 붙잡아 다른 라우트까지 느려집니다.
+여기서는 해시 작업을 전용 프로세스 풀에 넘기고, 대기 중인 작업 수를 제한합니다.
+
+- 풀이 꽉 차면(max_pending) 잠깐 기다렸다가 HasherBusy를 던집니다 → 라우트는 503 + Retry-After.
+- 알고리즘/비용은 PASSWORD_HASH_METHOD로 정합니다. (werkzeug 형식: "scrypt:32768:8:1", "pbkdf2:sha256:600000")
+- 로그인 성공 시 저장된 해시의 알고리즘/비용이 현재 설정과 다르면 같은 작업 안에서 새 해시를 만들어 돌려주므로,
+  라우트가 DB만 갱신하면 됩니다. (평문 비밀번호를 다시 넘기지 않음)
+- workers=0 이면 풀 없이 호출한 스레드에서 바로 계산합니다. (테스트, 디버깅용)
+- spawn 방식 플랫폼에서는 작업 프로세스가 실행 스크립트를 다시 import하므로, 서버는 run.py로 띄웁니다.
+  (backend_new를 __main__ 블록 안에서만 불러오므로 작업 프로세스에는 이 모듈만 올라감)
+
+    hasher = PasswordHasher.from_env()
+    stored = hasher.hash(password)
+    ok, upgraded = hasher.verify(stored, password)
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+DEFAULT_METHOD = "scrypt:32768:8:1"
+
+
+class HasherBusy(Exception):
+    """대기 중인 해시 작업이 너무 많음 (잠시 후 다시 시도)"""
+
+
+def canonical_method(method):
+    """
+    werkzeug 해시 방식 문자열을 생략된 기본값까지 채운 형태로 변환 ("scrypt" → "scrypt:32768:8:1").
+    저장된 해시의 "방식$salt$hash" 앞부분과 그대로 비교할 수 있습니다. 모르는 방식은 ValueError.
+    """
+    name, *args = method.split(":")
+    if name == "scrypt":
+        defaults = ["32768", "8", "1"]
+    elif name == "pbkdf2":
+        defaults = ["sha256", str(DEFAULT_PBKDF2_ITERATIONS)]
+    else:
+        raise ValueError(f"Unsupported password hash method: {method}")
+    if len(args) > len(defaults):
+        raise ValueError(f"Invalid password hash method: {method}")
+    return ":".join([name] + args + defaults[len(args):])
+
+
+def needs_rehash(stored, method):
+    """저장된 해시가 현재 방식/비용(method, canonical 형태)과 다르면 True"""
+    return stored.split("$", 1)[0] != method
+
+
+# --- 작업 프로세스에서 실행되는 함수 (spawn 환경에서도 import 가능해야 하므로 모듈 최상위) ---
+
+def _hash(password, method):
+    return generate_password_hash(password, method=method)
+
+
+def _verify(stored, password, method):
+    """(일치 여부, 비용이 바뀌었으면 새 해시 아니면 None)"""
+    try:
+        ok = check_password_hash(stored, password)
+    except ValueError:
+        # 지원하지 않는 형식의 해시 (예: 평문으로 저장된 예전 계정)
+        return False, None
+    if ok and needs_rehash(stored, method):
+        return True, generate_password_hash(password, method=method)
+    return ok, None
+
+
+class PasswordHasher:
+    """
+    해시/검증을 제한된 프로세스 풀에서 실행
+
+    Args:
+        method: werkzeug 해시 방식 (알고리즘:비용)
+        workers: 작업 프로세스 수 (0이면 호출 스레드에서 실행)
+        max_pending: 실행 중 + 대기 중 작업 수 상한 (기본: workers * 4)
+        queue_timeout: 자리가 날 때까지 기다릴 최대 시간(초), 지나면 HasherBusy
+        timeout: 작업 하나의 결과를 기다릴 최대 시간(초)
+    """
+
+    def __init__(self, method=DEFAULT_METHOD, workers=None, max_pending=None, queue_timeout=2.0, timeout=10.0):
+        self.method = canonical_method(method)
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.max_pending = max_pending or max(self.workers, 1) * 4
+        self.queue_timeout = queue_timeout
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pending = 0
+        self._stats = {"hashed": 0, "verified": 0, "failed": 0, "rehashed": 0, "rejected": 0, "busy_ms": 0.0}
+
+    def _pool(self):
+        # 프로세스는 첫 해시 요청 때 띄움 (서버 시작, /health를 느리게 하지 않음)
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def _run(self, func, *args):
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            with self._lock:
+                self._stats["rejected"] += 1
+            raise HasherBusy("password hashing queue is full")
+        started = time.perf_counter()
+        with self._lock:
+            self._pending += 1
+        try:
+            if self.workers == 0:
+                return func(*args)
+            executor = self._pool()
+            return executor.submit(func, *args).result(timeout=self.timeout)
+        except TimeoutError:
+            raise HasherBusy("password hashing timed out")
+        except BrokenProcessPool:
+            # 작업 프로세스가 죽으면 풀을 버리고 다음 요청 때 새로 띄움
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            raise
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._stats["busy_ms"] += (time.perf_counter() - started) * 1000
+            self._slots.release()
+
+    def hash(self, password):
+        stored = self._run(_hash, password, self.method)
+        with self._lock:
+            self._stats["hashed"] += 1
+        return stored
+
+    def verify(self, stored, password):
+        """
+        (일치 여부, 새 해시 또는 None) 반환.
+        새 해시가 있으면 저장된 해시의 방식/비용이 오래된 것이므로 DB의 값을 바꾸면 됩니다.
+        """
+        ok, upgraded = self._run(_verify, stored or "", password, self.method)
+        with self._lock:
+            self._stats["verified"] += 1
+            self._stats["failed"] += not ok
+            self._stats["rehashed"] += upgraded is not None
+        return ok, upgraded
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def stats(self):
+        with self._lock:
+            data = dict(self._stats)
+            data["pending"] = self._pending
+            started = self._executor is not None
+        jobs = data["hashed"] + data["verified"]
+        data["avg_ms"] = round(data.pop("busy_ms") / jobs, 2) if jobs else 0.0
+        data.update({"method": self.method, "workers": self.workers, "max_pending": self.max_pending,
+                     "started": started})
+        return data
+
+    @classmethod
+    def from_env(cls):
+        """
+        PASSWORD_HASH_METHOD: 해시 방식/비용 (기본 scrypt:32768:8:1)
+        PASSWORD_HASH_WORKERS: 작업 프로세스 수 (기본 CPU 수, 0이면 요청 스레드에서 실행)
+        PASSWORD_HASH_MAX_PENDING: 대기 작업 상한 (기본 workers * 4)
+        PASSWORD_HASH_QUEUE_TIMEOUT: 자리가 날 때까지 기다릴 시간(초, 기본 2)
+        """
+        workers = os.getenv("PASSWORD_HASH_WORKERS")
+        max_pending = os.getenv("PASSWORD_HASH_MAX_PENDING")
+        return cls(
+            method=os.getenv("PASSWORD_HASH_METHOD", DEFAULT_METHOD),
+            workers=int(workers) if workers else None,
+            max_pending=int(max_pending) if max_pending else None,
+            queue_timeout=float(os.getenv("PASSWORD_HASH_QUEUE_TIMEOUT", "2")),
+        )
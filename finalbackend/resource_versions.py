@@ -0,0 +1,93 @@
+"""
+리소스 버전 카운터 / ETag
+
+React 앱은 화면을 새로 그릴 때마다 캘린더, 일정, 게시글, 알림 목록을 다시 읽는데, 대부분은
+지난번과 똑같은 JSON입니다. 리소스마다 버전 번호를 두고 쓰기 라우트가 커밋 뒤 bump()하면,
+조회 라우트는 (리소스, 버전, 쿼리 파라미터)만으로 ETag를 만들 수 있어서
+If-None-Match가 같으면 MySQL을 건드리지 않고 304를 돌려줄 수 있습니다.
+
+- 버전은 조회 쿼리 전에 읽습니다. 조회 중에 쓰기가 끼어들면 다음 요청은 버전이 달라서 다시 읽습니다.
+- ETag에 프로세스 epoch가 들어가므로 서버를 재시작하면 이전 ETag는 모두 무효가 됩니다.
+- 버전은 프로세스 메모리에만 있어서 단일 프로세스 배포(python backend_new.py, 워커 1개)에서만 맞습니다.
+  워커 프로세스가 여러 개면 다른 워커의 쓰기를 모르는 워커가 오래된 목록에 304를 줄 수 있고,
+  DB를 직접 고쳐도 버전이 따라가지 못합니다. 그래서 기본은 꺼 두고, 단일 프로세스일 때만
+  RESOURCE_ETAGS=1 로 켭니다.
+
+    versions = ResourceVersions(enabled=True)
+    etag = versions.etag("user_calendars", user_num, request.args)
+    versions.bump("user_calendars", user_num)
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import defaultdict
+
+
+class ResourceVersions:
+    """
+    (리소스 종류, 키)별 버전 번호와 ETag 적중률
+
+    Args:
+        enabled: False면 ETag를 만들지 않음 (항상 전체 응답)
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        # 재시작 후에는 버전이 0부터 다시 시작하므로 ETag에 프로세스 구분값을 넣음
+        self.epoch = format(int(time.time() * 1000) ^ os.getpid(), "x")
+        self._lock = threading.Lock()
+        self._versions = defaultdict(int)
+        self._stats = {"hits": 0, "misses": 0, "bumps": 0}
+        self._by_resource = defaultdict(lambda: {"hits": 0, "misses": 0})
+
+    def version(self, resource, key):
+        with self._lock:
+            return self._versions.get((resource, str(key)), 0)
+
+    def bump(self, resource, *keys):
+        """쓰기가 커밋된 뒤 호출. 같은 리소스의 여러 키를 한 번에 올릴 수 있음"""
+        with self._lock:
+            for key in keys:
+                if key is None:
+                    continue
+                self._versions[(resource, str(key))] += 1
+                self._stats["bumps"] += 1
+
+    def etag(self, resource, key, args=None):
+        """
+        강한 ETag 값 (따옴표 없이). 같은 리소스라도 쿼리 파라미터(from/to/fields/limit/cursor ...)가
+        다르면 응답 본문이 다르므로 파라미터 해시를 붙입니다.
+        """
+        tag = f"{resource}.{key}.{self.version(resource, key)}-{self.epoch}"
+        if args:
+            # werkzeug MultiDict면 같은 이름의 파라미터 여러 개까지 포함
+            items = sorted(args.items(multi=True) if hasattr(args, "getlist") else args.items())
+            digest = hashlib.blake2b(repr(items).encode(), digest_size=6).hexdigest()
+            tag += f"-{digest}"
+        return tag
+
+    def record(self, resource, hit):
+        with self._lock:
+            field = "hits" if hit else "misses"
+            self._stats[field] += 1
+            self._by_resource[resource][field] += 1
+
+    def stats(self):
+        with self._lock:
+            data = dict(self._stats)
+            resources = {name: dict(counts) for name, counts in self._by_resource.items()}
+            tracked = len(self._versions)
+        requests = data["hits"] + data["misses"]
+        data["hit_ratio"] = round(data["hits"] / requests, 3) if requests else 0.0
+        for counts in resources.values():
+            total = counts["hits"] + counts["misses"]
+            counts["hit_ratio"] = round(counts["hits"] / total, 3) if total else 0.0
+        data.update({"enabled": self.enabled, "tracked": tracked, "resources": resources})
+        return data
+
+    @classmethod
+    def from_env(cls):
+        """RESOURCE_ETAGS=1 이면 ETag/304를 켬 (단일 프로세스 배포 전용, 기본 꺼짐)"""
+        return cls(enabled=os.getenv("RESOURCE_ETAGS", "0") == "1")
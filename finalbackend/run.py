@@ -0,0 +1,15 @@
+"""
+서버 실행 진입점
+
+    python run.py
+
+비밀번호 해시 풀(password_hasher)은 작업 프로세스를 띄웁니다. spawn 방식(Windows/macOS, 컨테이너 설정에 따라
+Linux도)에서는 작업 프로세스가 실행한 스크립트를 __mp_main__으로 다시 import하므로,
+python backend_new.py 로 띄우면 작업 프로세스마다 Flask 앱, DB 풀, 서비스 레지스트리를 다시 만듭니다.
+이 파일은 __main__ 블록 안에서만 backend_new를 불러오므로 작업 프로세스는 password_hasher만 import합니다.
+"""
+
+if __name__ == '__main__':
+    import backend_new
+
+    backend_new.main()
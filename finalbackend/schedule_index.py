@@ -0,0 +1,191 @@
+"""
+일정 목록 구간 인덱스
+
+일정 목록(DB events 행, 프론트에서 보낸 dict, GPT 추출 결과)의 날짜를 한 번만 파싱해서
+시작 시각 순으로 정렬해 두고, 이분 탐색으로 아래 질의에 답합니다.
+
+- nearest(today, within_days): 오늘 이후 가장 가까운 일정 (N일 이내)
+- window(start, end): 기간과 겹치는 모든 일정
+- overlapping(at): 지금 진행 중인 일정
+
+시작 시각 정렬과 함께 "앞쪽 일정들의 가장 늦은 종료 시각"(누적 최대값)을 들고 있어서,
+window/overlapping은 이미 끝난 일정을 이분 탐색으로 건너뛰고 결과 k개만 확인합니다. (O(log n + k))
+기간이 아주 긴 일정이 앞쪽에 있으면 그 뒤 구간을 훑어야 하지만, 달력 일정에서는 드문 경우입니다.
+
+인덱스를 만드는 비용은 O(n log n)이라 한 번 만들어 여러 번 질의할 때만 이득입니다.
+요청마다 한 번만 묻는 경우(이미 DB에서 기간으로 걸러 온 행, 프론트가 보낸 목록)에는
+nearest_schedule / window_schedules로 한 번 훑는 것(O(n))이 더 쌉니다.
+
+    index = ScheduleIndex(schedules)
+    index.nearest(date.today(), within_days=3)
+    index.window(date.today(), date.today() + timedelta(days=3))
+
+    nearest_schedule(schedules, date.today(), within_days=3)
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, List, Optional, Union
+
+DateLike = Union[str, date, datetime]
+
+
+def _parse_time(value) -> Optional[time]:
+    """'14:00', '14:00:00', MySQL TIME(timedelta), time 객체 → time"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, time):
+        return value
+    if isinstance(value, timedelta):
+        seconds = int(value.total_seconds()) % 86400
+        return time(seconds // 3600, seconds % 3600 // 60, seconds % 60)
+    text = str(value).strip()
+    if text[1:2] == ":":
+        text = "0" + text   # "9:30" → "09:30"
+    try:
+        # "HH:MM", "HH:MM:SS" (strptime보다 훨씬 빠름)
+        return time.fromisoformat(text)
+    except ValueError:
+        return None
+
+
+def parse_datetime(value: DateLike, time_value=None, end_of_day: bool = False) -> Optional[datetime]:
+    """
+    날짜(+시간) 값을 datetime으로 변환. 시간이 없으면 하루의 시작(end_of_day면 끝).
+    문자열은 "2025-10-17", "2025-10-17 14:00:00", "2025-10-17T14:00", GPT 추출 형식 "2025-10-17-14:00"을 받습니다.
+    파싱할 수 없으면 None.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        day, rest = value, ""
+    else:
+        text = str(value).strip()
+        try:
+            day = date.fromisoformat(text[:10])
+        except ValueError:
+            return None
+        rest = text[10:].lstrip(" T-")
+
+    parsed_time = _parse_time(time_value) or _parse_time(rest)
+    if parsed_time is None:
+        parsed_time = time.max if end_of_day else time.min
+    return datetime.combine(day, parsed_time)
+
+
+def schedule_bounds(schedule: dict):
+    """일정의 (시작, 종료) datetime. 시작을 파싱할 수 없으면 None, 종료가 없거나 시작보다 이르면 시작과 같게."""
+    start = parse_datetime(schedule.get("start_date"), schedule.get("start_time"))
+    if start is None:
+        return None
+    end = parse_datetime(schedule.get("end_date") or schedule.get("start_date"),
+                         schedule.get("end_time"), end_of_day=True)
+    if end is None or end < start:
+        end = start
+    return start, end
+
+
+def nearest_schedule(schedules: Iterable[dict], today: DateLike = None,
+                     within_days: Optional[int] = None) -> Optional[dict]:
+    """ScheduleIndex.nearest와 같은 결과를 인덱스 없이 한 번 훑어서 (O(n))"""
+    lo = datetime.combine(parse_datetime(today or date.today()).date(), time.min)
+    best = best_start = None
+    for schedule in schedules or []:
+        bounds = schedule_bounds(schedule)
+        if bounds is None or bounds[0] < lo:
+            continue
+        # 시작 시각이 같으면 앞에 있는 일정
+        if best_start is None or bounds[0] < best_start:
+            best, best_start = schedule, bounds[0]
+    if best is None:
+        return None
+    if within_days is not None and (best_start.date() - lo.date()).days > within_days:
+        return None
+    return best
+
+
+def window_schedules(schedules: Iterable[dict], start: DateLike, end: DateLike) -> List[dict]:
+    """[start, end] 기간과 겹치는 일정을 입력 순서대로 (O(n)). 입력이 시작 시각 순이면 결과도 시작 시각 순."""
+    lo = parse_datetime(start)
+    hi = parse_datetime(end, end_of_day=True)
+    if lo is None or hi is None or hi < lo:
+        return []
+    result = []
+    for schedule in schedules or []:
+        bounds = schedule_bounds(schedule)
+        if bounds is not None and bounds[0] <= hi and bounds[1] >= lo:
+            result.append(schedule)
+    return result
+
+
+class ScheduleIndex:
+    """
+    시작 시각 순으로 정렬된 일정 인덱스
+
+    Args:
+        schedules: start_date(필수), start_time, end_date, end_time 키를 가진 dict 목록.
+                   날짜를 파싱할 수 없는 일정은 건너뛰고 skipped에 개수를 남깁니다.
+    """
+
+    def __init__(self, schedules: Iterable[dict]):
+        entries = []
+        self.skipped = 0
+        for position, schedule in enumerate(schedules or []):
+            bounds = schedule_bounds(schedule)
+            if bounds is None:
+                self.skipped += 1
+                continue
+            start, end = bounds
+            # 시작 시각이 같으면 원래 순서 유지
+            entries.append((start, position, end, schedule))
+        entries.sort(key=lambda e: (e[0], e[1]))
+
+        self._starts: List[datetime] = [e[0] for e in entries]
+        self._ends: List[datetime] = [e[2] for e in entries]
+        self._items: List[dict] = [e[3] for e in entries]
+        # _max_ends[i] = 0..i번째 일정 중 가장 늦은 종료 시각 (단조 증가 → 이분 탐색 가능)
+        self._max_ends: List[datetime] = []
+        latest = None
+        for end in self._ends:
+            latest = end if latest is None or end > latest else latest
+            self._max_ends.append(latest)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def nearest(self, today: DateLike = None, within_days: Optional[int] = None) -> Optional[dict]:
+        """today(날짜) 이후 시작하는 가장 이른 일정. within_days를 주면 그 날짜 수 이내만."""
+        lo = parse_datetime(today or date.today())
+        lo = datetime.combine(lo.date(), time.min)
+        i = bisect_left(self._starts, lo)
+        if i == len(self._starts):
+            return None
+        if within_days is not None and (self._starts[i].date() - lo.date()).days > within_days:
+            return None
+        return self._items[i]
+
+    def window(self, start: DateLike, end: DateLike) -> List[dict]:
+        """[start, end] 기간과 겹치는 일정 (시작 시각 순). 날짜만 주면 end는 그날 끝까지."""
+        lo = parse_datetime(start)
+        hi = parse_datetime(end, end_of_day=True)
+        if lo is None or hi is None or hi < lo:
+            return []
+        # start <= hi 인 일정만 후보
+        stop = bisect_right(self._starts, hi)
+        # 그중 누적 최대 종료 시각이 lo보다 이른 앞부분은 모두 끝난 일정
+        first = bisect_left(self._max_ends, lo, 0, stop)
+        return [self._items[i] for i in range(first, stop) if self._ends[i] >= lo]
+
+    def overlapping(self, at: DateLike = None) -> List[dict]:
+        """at 시각(기본: 지금)에 진행 중인 일정"""
+        at = parse_datetime(at) if at is not None else datetime.now()
+        return self.window(at, at)
+
+    def within_days(self, days: int, today: DateLike = None) -> List[dict]:
+        """오늘부터 days일 뒤까지와 겹치는 일정"""
+        day = parse_datetime(today or date.today()).date()
+        return self.window(day, day + timedelta(days=days))
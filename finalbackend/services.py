@@ -0,0 +1,136 @@
+"""
+지연 생성 서비스 레지스트리와 시작 시간 측정
+
+AI 모듈(AntChatGPT, WeatherCommentator, CalendarCommentator, ScheduleMediator)은
+openai/bs4 같은 무거운 패키지를 불러오고 클라이언트를 만들기 때문에, 서버가
+/health에 응답하기 전에 모두 준비할 필요가 없습니다. 여기 등록한 팩토리는
+처음 사용될 때 한 번만 실행되고, 그 뒤로는 같은 인스턴스를 공유합니다.
+
+    services = ServiceRegistry(profiler)
+    services.register("weather", build_weather)
+    services.weather.generate_comment()    # 첫 호출 때 생성
+
+StartupProfiler는 import/초기화 구간별 소요 시간을 기록해 어디서 시간이 드는지 보여줍니다.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    """프로세스 시작 후 구간별(import, 초기화) 소요 시간 기록"""
+
+    def __init__(self, started_at=None):
+        self.started_at = time.perf_counter() if started_at is None else started_at
+        self._lock = threading.Lock()
+        self._phases = []      # (이름, ms)
+        self.ready_ms = None
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def record(self, name, seconds):
+        with self._lock:
+            self._phases.append((name, round(seconds * 1000, 2)))
+
+    def ready(self):
+        """모듈 로드가 끝나 요청을 받을 수 있게 된 시점 기록"""
+        self.ready_ms = round((time.perf_counter() - self.started_at) * 1000, 2)
+
+    def report(self) -> dict:
+        with self._lock:
+            phases = [{"name": name, "ms": ms} for name, ms in self._phases]
+        return {
+            "ready_ms": self.ready_ms,
+            "phases": phases,
+            "slowest": sorted(phases, key=lambda p: p["ms"], reverse=True)[:5],
+        }
+
+
+class ServiceRegistry:
+    """
+    이름 → 팩토리를 등록해 두고 처음 요청될 때 생성하는 싱글톤 레지스트리.
+    여러 스레드가 동시에 처음 요청해도 팩토리는 한 번만 실행됩니다.
+    """
+
+    def __init__(self, profiler: StartupProfiler = None):
+        self.profiler = profiler
+        self._lock = threading.RLock()
+        self._factories = {}
+        self._instances = {}
+        self._init_ms = {}
+
+    def register(self, name, factory):
+        with self._lock:
+            if name in self._instances:
+                raise ValueError(f"service already built: {name}")
+            self._factories[name] = factory
+
+    def get(self, name):
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        with self._lock:
+            instance = self._instances.get(name)
+            if instance is not None:
+                return instance
+            try:
+                factory = self._factories[name]
+            except KeyError:
+                raise KeyError(f"unknown service: {name}") from None
+            started = time.perf_counter()
+            # 팩토리 안에서 다른 서비스를 get()해도 RLock이라 교착되지 않음
+            instance = factory()
+            elapsed = time.perf_counter() - started
+            self._instances[name] = instance
+            self._init_ms[name] = round(elapsed * 1000, 2)
+        if self.profiler is not None:
+            self.profiler.record(f"service:{name}", elapsed)
+        print(f"⚙️ 서비스 준비: {name} ({elapsed * 1000:.0f}ms)")
+        return instance
+
+    def peek(self, name):
+        """이미 만들어진 인스턴스만 반환 (없으면 None, 생성하지 않음)"""
+        return self._instances.get(name)
+
+    def is_loaded(self, name) -> bool:
+        return name in self._instances
+
+    def warm_up(self, names=None, background=True):
+        """지정한 서비스를 미리 생성 (기본: 백그라운드 스레드)"""
+        names = list(self._factories) if names is None else list(names)
+
+        def run():
+            for name in names:
+                try:
+                    self.get(name)
+                except Exception as e:
+                    print(f"⚠️ 서비스 준비 실패: {name}: {e}")
+
+        if not background:
+            run()
+            return None
+        thread = threading.Thread(target=run, name="services-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def report(self) -> dict:
+        with self._lock:
+            return {
+                name: {"loaded": name in self._instances, "init_ms": self._init_ms.get(name)}
+                for name in self._factories
+            }
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self.get(name)
+        except KeyError:
+            raise AttributeError(name) from None
@@ -0,0 +1,145 @@
+"""
+서명된 세션 토큰
+
+지금까지 클라이언트는 매 요청에 user_num만 보내고 서버는 그 값을 그대로 믿었습니다.
+/login이 HMAC-SHA256으로 서명한 토큰을 발급하면, 이후 요청은 토큰의 서명과 만료 시각만 확인해서
+누구의 요청인지 알 수 있습니다. 검증은 메모리 안에서 끝나므로 DB 조회도, 비밀번호 해시도 필요 없습니다.
+
+- 토큰: base64url(JSON {"sub", "jti", "iat", "exp"}) + "." + base64url(HMAC-SHA256(secret, 앞부분))
+- 로그아웃한 토큰의 jti는 만료 시각까지 폐기 목록(LRU, 최대 revoked_capacity개)에 둡니다.
+  폐기 목록이 넘치면 가장 오래 쓰이지 않은 항목부터 버리므로, capacity는 ttl 동안의 로그아웃 수보다 크게 잡습니다.
+- 폐기 목록은 프로세스 안에만 있습니다. (워커 프로세스를 여러 개 띄우면 각자 목록을 가짐)
+- SESSION_SECRET이 없으면 프로세스마다 임의의 키를 만들므로 재시작하면 모두 다시 로그인해야 합니다.
+
+    tokens = SessionTokens(secret=b"...")
+    token, claims = tokens.issue(user_num)
+    claims = tokens.verify(token)        # 잘못된 토큰이면 InvalidToken
+    tokens.revoke(claims)
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+
+class InvalidToken(Exception):
+    """서명/형식이 잘못됐거나 만료/폐기된 토큰. reason에 이유"""
+
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
+
+
+def _b64encode(raw):
+    return base64.urlsafe_b64encode(raw).rstrip(b"=")
+
+
+def _b64decode(data):
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+class SessionTokens:
+    """
+    세션 토큰 발급/검증과 폐기 목록
+
+    Args:
+        secret: HMAC 키 (None이면 프로세스마다 임의 생성)
+        ttl: 토큰 유효 시간(초)
+        revoked_capacity: 폐기 목록 최대 크기
+    """
+
+    def __init__(self, secret=None, ttl=7 * 86400, revoked_capacity=10000):
+        self.ephemeral = not secret
+        self._secret = secret.encode() if isinstance(secret, str) else (secret or secrets.token_bytes(32))
+        self.ttl = ttl
+        self.revoked_capacity = revoked_capacity
+        self._lock = threading.Lock()
+        self._revoked = OrderedDict()     # jti → exp
+        self._stats = {"issued": 0, "verified": 0, "revoked": 0, "evicted": 0}
+        self._rejected = {"malformed": 0, "signature": 0, "expired": 0, "revoked": 0}
+
+    def _sign(self, payload):
+        return _b64encode(hmac.new(self._secret, payload, hashlib.sha256).digest())
+
+    def issue(self, user_num):
+        """(토큰 문자열, claims) 반환"""
+        now = int(time.time())
+        claims = {"sub": user_num, "jti": secrets.token_urlsafe(12), "iat": now, "exp": now + self.ttl}
+        payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode())
+        with self._lock:
+            self._stats["issued"] += 1
+        return (payload + b"." + self._sign(payload)).decode(), claims
+
+    def verify(self, token):
+        """검증된 claims 반환. 잘못된 토큰이면 InvalidToken"""
+        try:
+            payload, signature = token.encode().split(b".")
+        except (AttributeError, UnicodeEncodeError, ValueError):
+            raise self._reject("malformed")
+        # 서명부터 확인 (위조된 payload는 파싱하지 않음)
+        if not hmac.compare_digest(signature, self._sign(payload)):
+            raise self._reject("signature")
+        try:
+            claims = json.loads(_b64decode(payload))
+            exp, jti = claims["exp"], claims["jti"]
+        except (ValueError, KeyError, TypeError):
+            raise self._reject("malformed")
+        if exp <= time.time():
+            raise self._reject("expired")
+        with self._lock:
+            if jti in self._revoked:
+                self._revoked.move_to_end(jti)
+                self._rejected["revoked"] += 1
+                raise InvalidToken("revoked")
+            self._stats["verified"] += 1
+        return claims
+
+    def _reject(self, reason):
+        with self._lock:
+            self._rejected[reason] += 1
+        return InvalidToken(reason)
+
+    def revoke(self, claims):
+        """로그아웃: 이 토큰(jti)을 만료 시각까지 거부"""
+        now = time.time()
+        with self._lock:
+            self._revoked[claims["jti"]] = claims["exp"]
+            self._revoked.move_to_end(claims["jti"])
+            self._stats["revoked"] += 1
+            # 앞쪽(오래된 항목)부터 이미 만료된 토큰은 목록에 둘 필요가 없음
+            while self._revoked:
+                jti, exp = next(iter(self._revoked.items()))
+                if exp > now and len(self._revoked) <= self.revoked_capacity:
+                    break
+                self._revoked.popitem(last=False)
+                self._stats["evicted"] += exp > now
+
+    def stats(self):
+        with self._lock:
+            data = dict(self._stats)
+            data["rejected"] = dict(self._rejected)
+            data["revoked_size"] = len(self._revoked)
+        data.update({"ttl": self.ttl, "revoked_capacity": self.revoked_capacity, "ephemeral_secret": self.ephemeral})
+        return data
+
+    @classmethod
+    def from_env(cls):
+        """
+        SESSION_SECRET: HMAC 키 (없으면 프로세스마다 임의 생성)
+        SESSION_TTL: 토큰 유효 시간(초, 기본 7일)
+        SESSION_REVOKED_CAPACITY: 폐기 목록 크기 (기본 10000)
+        """
+        secret = os.getenv("SESSION_SECRET")
+        if not secret:
+            print("⚠️ SESSION_SECRET이 없어 임시 키를 사용합니다. (재시작하면 세션 토큰이 모두 무효)")
+        return cls(
+            secret=secret,
+            ttl=int(os.getenv("SESSION_TTL", str(7 * 86400))),
+            revoked_capacity=int(os.getenv("SESSION_REVOKED_CAPACITY", "10000")),
+        )
@@ -0,0 +1,105 @@
+import contextlib
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "ant_chat_gpt"))
+
+# backend_new import 전에 설정 (해시는 요청 스레드에서, 세션 키는 고정)
+os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
+os.environ.setdefault("SESSION_SECRET", "test-secret")
+
+
+class FakeCursor:
+    def __init__(self, db, dictionary=False):
+        self.db = db
+        self.dictionary = dictionary
+        self.rows = []
+        self.lastrowid = None
+        self.rowcount = 0
+
+    def _insert_ids(self, sql, count):
+        if sql.lstrip().upper().startswith("INSERT"):
+            self.lastrowid = self.db.next_id
+            self.db.next_id += count
+            self.rowcount = count
+
+    def execute(self, sql, params=()):
+        self.db.executed.append((sql, params))
+        self.rows = list(self.db.respond(sql, params) or [])
+        self._insert_ids(sql, 1)
+
+    def executemany(self, sql, seq):
+        seq = list(seq)
+        self.db.executed.append((sql, seq))
+        self.db.respond(sql, seq)
+        self._insert_ids(sql, len(seq))
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+class FakeDB:
+    """SQL 조각 → 결과(행 목록, 예외, 또는 params를 받는 함수) 규칙으로 응답하는 가짜 연결"""
+
+    def __init__(self):
+        self.rules = []
+        self.executed = []
+        self.commits = 0
+        self.next_id = 100
+
+    def on(self, fragment, result):
+        self.rules.append((fragment, result))
+        return self
+
+    def respond(self, sql, params):
+        for fragment, result in self.rules:
+            if fragment in sql:
+                if isinstance(result, Exception):
+                    raise result
+                return result(params) if callable(result) else result
+        return []
+
+    def cursor(self, dictionary=False, **kwargs):
+        return FakeCursor(self, dictionary)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+    def queries(self, fragment):
+        return [sql for sql, _ in self.executed if fragment in sql]
+
+
+@pytest.fixture
+def backend():
+    import backend_new
+    return backend_new
+
+
+@pytest.fixture
+def db(backend, monkeypatch):
+    fake = FakeDB()
+
+    @contextlib.contextmanager
+    def get_db():
+        yield fake
+
+    monkeypatch.setattr(backend, "get_db", get_db)
+    return fake
+
+
+@pytest.fixture
+def client(backend, db):
+    return backend.app.test_client()
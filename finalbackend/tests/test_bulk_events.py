@@ -0,0 +1,87 @@
+import mysql.connector
+import pytest
+
+
+def test_normalize_fills_defaults_and_all_day(backend):
+    row = backend.normalize_bulk_event({"title": "회의", "start_date": "2025-10-17"},
+                                       {"calendar_id": 1, "user_num": 2})
+    assert row == ("회의", None, "2025-10-17", "2025-10-17", "00:00:00", "23:59:59", None, 1, 2)
+
+
+def test_normalize_accepts_gpt_datetime_format(backend):
+    row = backend.normalize_bulk_event(
+        {"title": "콘서트", "start_date": "2025-10-17-19:30", "end_date": "2025-10-17-21:00",
+         "calendar_id": 1, "user_num": 2}, {})
+    assert row[2:6] == ("2025-10-17", "2025-10-17", "19:30:00", "21:00:00")
+
+
+@pytest.mark.parametrize("item", [
+    {"start_date": "2025-10-17"},
+    {"title": "x", "start_date": "17/10/2025"},
+    {"title": "x", "start_date": "2025-10-18", "end_date": "2025-10-17"},
+    {"title": "x", "start_date": "2025-10-17", "start_time": "25:00"},
+    "not an object",
+])
+def test_normalize_rejects_invalid_items(backend, item):
+    with pytest.raises(ValueError):
+        backend.normalize_bulk_event(item, {"calendar_id": 1, "user_num": 2})
+
+
+def _known_ids(db, calendars=(1,), users=(2,), lock_mode=1):
+    db.on("FROM `calendars`", [(c,) for c in calendars])
+    db.on("FROM `users`", [(u,) for u in users])
+    db.on("@@innodb_autoinc_lock_mode", [(1, lock_mode)])
+
+
+def test_bulk_reports_errors_by_index(client, db):
+    _known_ids(db)
+    res = client.post("/api/events/bulk", json={"calendar_id": 1, "user_num": 2, "events": [
+        {"title": "a", "start_date": "2025-10-17"},
+        {"title": "b"},
+        {"title": "c", "start_date": "2025-10-18", "calendar_id": 9},
+        {"title": "d", "start_date": "2025-10-19"},
+    ]})
+    body = res.get_json()
+    assert res.status_code == 201
+    assert [r.get("event_id") for r in body["results"]] == [100, None, None, 101]
+    assert "required" in body["results"][1]["error"]
+    assert body["results"][2]["error"] == "Calendar 9 not found"
+    assert body["created"] == 2 and body["failed"] == 2
+    # 없는 캘린더 항목은 INSERT에 포함되지 않음
+    assert len(db.queries("INSERT INTO events")) == 1
+
+
+def test_bulk_interleaved_autoinc_inserts_rows_one_by_one(client, db):
+    _known_ids(db, lock_mode=2)
+    res = client.post("/api/events/bulk", json={"calendar_id": 1, "user_num": 2, "events": [
+        {"title": "a", "start_date": "2025-10-17"},
+        {"title": "b", "start_date": "2025-10-18"},
+    ]})
+    assert res.get_json()["event_ids"] == [100, 101]
+    assert len(db.queries("INSERT INTO events")) == 2
+
+
+def test_bulk_row_level_db_error_is_reported_by_index(client, db):
+    _known_ids(db)
+
+    def insert(params):
+        # multi-row INSERT는 실패, 한 행씩 다시 넣을 때 두 번째 행만 실패
+        if isinstance(params, list) or params[0] == "b":
+            raise mysql.connector.DataError(msg="Data too long", errno=1406)
+
+    db.on("INSERT INTO events", insert)
+    res = client.post("/api/events/bulk", json={"calendar_id": 1, "user_num": 2, "events": [
+        {"title": "a", "start_date": "2025-10-17"},
+        {"title": "b", "start_date": "2025-10-18"},
+    ]})
+    results = res.get_json()["results"]
+    assert res.status_code == 201
+    assert "event_id" in results[0]
+    assert results[1]["error"] == "Database error: Data too long"
+    assert db.queries("ROLLBACK TO SAVEPOINT")
+
+
+def test_bulk_all_invalid_is_400_without_db(client, db):
+    res = client.post("/api/events/bulk", json={"events": [{"title": "x"}]})
+    assert res.status_code == 400
+    assert db.executed == []
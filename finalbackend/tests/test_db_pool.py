@@ -0,0 +1,102 @@
+import threading
+
+import pytest
+from mysql.connector import errors
+
+from db_pool import ConnectionPool, PoolExhaustedError
+
+
+class FakeConn:
+    def __init__(self):
+        self.closed = False
+        self.in_transaction = False
+        self.rolled_back = 0
+
+    def cursor(self, *args, **kwargs):
+        return FakeCur()
+
+    def ping(self, reconnect=False):
+        if self.closed:
+            raise errors.InterfaceError(msg="closed")
+
+    def rollback(self):
+        self.rolled_back += 1
+        self.in_transaction = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeCur:
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def make_pool(**kwargs):
+    created = []
+
+    def connect(**config):
+        conn = FakeConn()
+        created.append(conn)
+        return conn
+
+    kwargs.setdefault("checkout_timeout", 0.05)
+    return ConnectionPool({}, connect=connect, **kwargs), created
+
+
+def test_connections_are_reused():
+    pool, created = make_pool(size=2)
+    for _ in range(3):
+        with pool.connection():
+            pass
+    assert len(created) == 1
+    assert pool.stats()["reused"] == 2
+
+
+def test_exhausted_pool_raises_after_timeout():
+    pool, _ = make_pool(size=1)
+    with pool.connection():
+        with pytest.raises(PoolExhaustedError):
+            with pool.connection():
+                pass
+    stats = pool.stats()
+    assert stats["exhausted"] == 1 and stats["in_use"] == 0
+
+
+def test_waiter_gets_connection_when_released():
+    pool, created = make_pool(size=1, checkout_timeout=2)
+    got = threading.Event()
+
+    def wait_for_connection():
+        with pool.connection():
+            got.set()
+
+    with pool.connection():
+        waiter = threading.Thread(target=wait_for_connection)
+        waiter.start()
+        assert not got.wait(0.05)
+    waiter.join(2)
+    assert got.is_set()
+    assert len(created) == 1 and pool.stats()["waits"] == 1
+
+
+def test_broken_connection_is_discarded_and_cursors_closed():
+    pool, created = make_pool(size=1)
+    with pytest.raises(errors.OperationalError):
+        with pool.connection() as conn:
+            cur = conn.cursor()
+            raise errors.OperationalError(msg="gone away")
+    assert cur.closed and created[0].closed
+    assert pool.stats()["open"] == 0
+    with pool.connection():
+        pass
+    assert len(created) == 2
+
+
+def test_open_transaction_is_rolled_back_on_release():
+    pool, created = make_pool(size=1)
+    with pool.connection():
+        created[0].in_transaction = True
+    assert created[0].rolled_back == 1
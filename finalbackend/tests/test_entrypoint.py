@@ -0,0 +1,31 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_spawned_worker_does_not_import_backend():
+    # spawn 방식 작업 프로세스는 실행 스크립트를 __mp_main__으로 다시 불러온 뒤 password_hasher._hash를 찾음
+    code = (
+        "import runpy, sys; runpy.run_path('run.py', run_name='__mp_main__'); "
+        "import password_hasher; print('backend_new' in sys.modules, 'flask' in sys.modules)"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.split() == ["False", "False"]
+
+
+def test_spawn_pool_hashes_with_module_level_tasks():
+    code = (
+        "import multiprocessing as mp\n"
+        "if __name__ == '__main__':\n"
+        "    mp.set_start_method('spawn')\n"
+        "    from password_hasher import PasswordHasher\n"
+        "    hasher = PasswordHasher(method='pbkdf2:sha256:1000', workers=1)\n"
+        "    ok, _ = hasher.verify(hasher.hash('pw'), 'pw')\n"
+        "    hasher.shutdown()\n"
+        "    print(ok)\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True,
+                         timeout=60)
+    assert out.stdout.strip() == "True"
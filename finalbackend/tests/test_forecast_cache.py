@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from weather.forecast_cache import KST, ForecastCache
+
+# 08시 발표분이 API에 올라온 뒤 (다음 발표분은 11:10부터)
+MORNING = datetime(2025, 10, 15, 9, 0, tzinfo=KST)
+
+
+class FlakyFetch:
+    def __init__(self):
+        self.calls = []
+        self.fail = False
+
+    def __call__(self, nx, ny, base_date, base_time):
+        self.calls.append((base_date, base_time))
+        if self.fail:
+            raise ConnectionError("KMA API down")
+        return [{"fcstDate": base_date, "baseTime": base_time}]
+
+
+@pytest.fixture
+def fetch():
+    return FlakyFetch()
+
+
+def test_same_slot_is_fetched_once(fetch):
+    cache = ForecastCache(fetch)
+    assert cache.get(55, 127, MORNING) == cache.get(55, 127, MORNING + timedelta(hours=1))
+    assert fetch.calls == [("20251015", "0800")]
+    assert cache.stats()["hits"] == 1
+
+
+def test_serves_previous_slot_within_max_stale(fetch):
+    cache = ForecastCache(fetch, max_stale=3600)
+    first = cache.get(55, 127, MORNING)
+
+    fetch.fail = True
+    # 11시 발표분 조회 실패, 08시 발표분이 만료된 지 30분
+    assert cache.get(55, 127, MORNING + timedelta(hours=2, minutes=40)) == first
+    assert cache.stats()["stale_served"] == 1
+
+
+def test_drops_snapshot_older_than_max_stale(fetch, capsys):
+    cache = ForecastCache(fetch, max_stale=3600)
+    cache.get(55, 127, MORNING)
+
+    fetch.fail = True
+    # 08시 발표분이 만료된 지 2시간 넘음 → 쓰지 않고 None
+    assert cache.get(55, 127, MORNING + timedelta(hours=4, minutes=20)) is None
+    stats = cache.stats()
+    assert (stats["stale_rejected"], stats["unavailable"], stats["grids"]) == (1, 1, 0)
+    assert "KMA API down" in capsys.readouterr().out
+
+
+def test_prefetch_failure_raises(fetch):
+    cache = ForecastCache(fetch)
+    fetch.fail = True
+    with pytest.raises(ConnectionError):
+        cache.refresh(55, 127, MORNING)
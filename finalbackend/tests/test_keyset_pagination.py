@@ -0,0 +1,53 @@
+from datetime import datetime
+
+import pytest
+
+
+def test_cursor_round_trip(backend):
+    created = datetime(2025, 10, 17, 9, 30, 15)
+    token = backend.encode_cursor(created, 42)
+    assert "=" not in token
+    assert backend.decode_cursor(token) == (created, 42)
+
+
+@pytest.mark.parametrize("token", ["", "garbage", "e30"])
+def test_invalid_cursor_raises(backend, token):
+    with pytest.raises(ValueError):
+        backend.decode_cursor(token)
+
+
+def test_page_args(backend):
+    assert backend.parse_page_args({}) is None
+    assert backend.parse_page_args({"limit": "500"}) == (backend.MAX_PAGE_SIZE, None)
+    assert backend.parse_page_args({"limit": "0"}) == (1, None)
+    with pytest.raises(ValueError):
+        backend.parse_page_args({"limit": "x"})
+
+
+def _posts(count):
+    return [{"post_num": n, "created_at": datetime(2025, 10, n)} for n in range(count, 0, -1)]
+
+
+def test_posts_page_has_next_cursor(client, db):
+    db.on("FROM posts", _posts(3))
+    res = client.get("/api/calendars/1/posts?limit=2")
+    body = res.get_json()
+    assert [p["post_num"] for p in body["items"]] == [3, 2]
+    assert body["next_cursor"]
+    sql, params = db.executed[-1]
+    assert "LIMIT %s" in sql and params[-1] == 3
+
+
+def test_posts_cursor_continues_after_last_key(client, db, backend):
+    db.on("FROM posts", _posts(1))
+    cursor = backend.encode_cursor(datetime(2025, 10, 2), 2)
+    body = client.get(f"/api/calendars/1/posts?limit=2&cursor={cursor}").get_json()
+    assert body["next_cursor"] is None
+    sql, params = db.executed[-1]
+    assert "p.created_at < %s" in sql
+    assert params == (1, datetime(2025, 10, 2), datetime(2025, 10, 2), 2, 3)
+
+
+def test_bad_cursor_is_400(client, db):
+    assert client.get("/api/posts/1/comments?cursor=nope").status_code == 400
+    assert db.executed == []
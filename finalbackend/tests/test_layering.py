@@ -0,0 +1,36 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE_ROOT = os.path.join(ROOT, "ant_chat_gpt")
+
+
+def test_weather_does_not_import_detector():
+    # weather는 ant_chat_gpt.common만 쓰고 detector(뉴스 크롤러, OpenAI 클라이언트)를 끌어오지 않아야 함
+    code = ("import sys; sys.path.insert(0, 'ant_chat_gpt'); import weather.weather_alarm; "
+            "print(sorted(m for m in ('ant_chat_gpt.detector', 'ant_chat_gpt.gpt_search.naver_crawler') "
+            "if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
+
+
+def test_package_imports_from_its_own_root():
+    # 설치된 패키지처럼 ant_chat_gpt 폴더만 sys.path에 있어도 import 되어야 함 (상위 폴더 모듈에 의존하지 않음)
+    code = "import ant_chat_gpt, ant_chat_gpt.detector, ant_chat_gpt.common.http_client"
+    env = dict(os.environ, PYTHONPATH="", OPENAI_API_KEY="test-key")
+    subprocess.run([sys.executable, "-c", code], cwd=PACKAGE_ROOT, env=env, check=True)
+
+
+def test_common_is_packaged():
+    from setuptools import find_packages
+    assert "ant_chat_gpt.common" in find_packages(PACKAGE_ROOT)
+
+
+def test_ant_chat_gpt_reexports_common():
+    from ant_chat_gpt import cache, http_client
+    from ant_chat_gpt.common import cache as common_cache, http_client as common_http
+
+    assert cache.LRUCache is common_cache.LRUCache
+    assert cache.make_key is common_cache.make_key
+    assert http_client.get_session is common_http.get_session
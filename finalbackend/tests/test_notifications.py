@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from notifications import NotificationHub
+
+
+@pytest.fixture
+def hub(backend, monkeypatch):
+    fresh = NotificationHub(backlog=3)
+    monkeypatch.setattr(backend, "notification_hub", fresh)
+    return fresh
+
+
+def test_resume_after_cursor(hub):
+    start = hub.cursor
+    first = hub.publish(1, "calendar_invite", {"share_id": 1})
+    hub.publish(2, "friend_request", {"from": 3})
+    hub.publish(1, "calendar_invite", {"share_id": 2})
+
+    events, complete = hub.events_after(1, start)
+    assert complete
+    assert [e["data"]["share_id"] for e in events] == [1, 2]
+    assert hub.events_after(1, first) == ([events[1]], True)
+
+
+def test_dropped_backlog_needs_resync(hub):
+    start = hub.cursor
+    for share_id in range(5):
+        hub.publish(1, "calendar_invite", {"share_id": share_id})
+    events, complete = hub.events_after(1, start)
+    assert not complete
+    assert len(events) == 3
+
+
+@pytest.mark.parametrize("after", [None, "", "57", "deadbeef-57", "garbage"])
+def test_foreign_or_missing_cursor_needs_resync(hub, after):
+    hub.publish(1, "calendar_invite", {"share_id": 1})
+    assert hub.events_after(1, after) == ([], False)
+    # 기다리지 않고 바로 돌아옴
+    assert hub.wait(1, after, timeout=5) == ([], False)
+
+
+def test_cursor_ahead_of_current_seq_needs_resync(hub):
+    hub.publish(1, "calendar_invite", {"share_id": 1})
+    assert hub.events_after(1, f"{hub.epoch}-57") == ([], False)
+
+
+def test_poll_after_restart_returns_snapshot(client, db, hub):
+    db.on("FROM calendar_share cs", [{"share_id": 9, "calendar_id": 4}])
+    # 재시작 전 프로세스가 발급한 커서 (seq만 보면 새 프로세스보다 앞서 있음)
+    res = client.get("/api/notifications/poll?user_num=1&wait=0&after=0f0f0f-57")
+
+    body = res.get_json()
+    assert res.status_code == 200
+    assert body["snapshot"] == [{"share_id": 9, "calendar_id": 4}]
+    assert body["cursor"] == hub.cursor
+
+
+def test_poll_with_current_cursor_returns_events(client, db, hub):
+    cursor = hub.cursor
+    hub.publish(1, "calendar_invite", {"share_id": 5})
+
+    body = client.get(f"/api/notifications/poll?user_num=1&wait=0&after={cursor}").get_json()
+    assert body["snapshot"] is None
+    assert [e["data"] for e in body["events"]] == [{"share_id": 5}]
+    assert body["cursor"] == body["events"][0]["id"]
+    assert db.queries("FROM calendar_share cs") == []
+
+
+def test_stream_reconnect_after_restart_starts_with_snapshot(client, db, hub):
+    db.on("FROM calendar_share cs", [{"share_id": 9}])
+    res = client.get("/api/notifications/stream?user_num=1", headers={"Last-Event-ID": "0f0f0f-57"},
+                     buffered=False)
+    chunks = (chunk.decode() for chunk in res.response)
+    assert next(chunks).startswith("retry:")
+    first = next(chunks)
+    res.close()
+
+    assert f"id: {hub.cursor}\n" in first
+    assert "event: snapshot\n" in first
+    assert json.loads(first.split("data: ", 1)[1]) == [{"share_id": 9}]
@@ -0,0 +1,57 @@
+import pytest
+
+from resource_versions import ResourceVersions
+
+
+@pytest.fixture
+def versions(backend, monkeypatch):
+    fresh = ResourceVersions(enabled=True)
+    monkeypatch.setattr(backend, "resource_versions", fresh)
+    return fresh
+
+
+def test_disabled_by_default(monkeypatch):
+    monkeypatch.delenv("RESOURCE_ETAGS", raising=False)
+    assert not ResourceVersions.from_env().enabled
+    monkeypatch.setenv("RESOURCE_ETAGS", "1")
+    assert ResourceVersions.from_env().enabled
+
+
+def test_no_etag_when_disabled(client, db, backend, monkeypatch):
+    monkeypatch.setattr(backend, "resource_versions", ResourceVersions())
+    db.on("FROM calendars", [{"calendar_id": 1}])
+
+    res = client.get("/api/calendars?user_num=7", headers={"If-None-Match": '"anything"'})
+    assert res.status_code == 200
+    assert "ETag" not in res.headers
+
+
+def test_matching_etag_skips_query(client, db, versions):
+    db.on("FROM calendars", [{"calendar_id": 1}])
+    first = client.get("/api/calendars?user_num=7")
+    etag = first.headers["ETag"]
+
+    second = client.get("/api/calendars?user_num=7", headers={"If-None-Match": etag})
+    assert first.status_code == 200
+    assert second.status_code == 304
+    assert second.headers["ETag"] == etag
+    assert len(db.queries("FROM calendars")) == 1
+    assert versions.stats()["resources"]["user_calendars"] == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+
+
+def test_write_invalidates_etag(client, db, versions):
+    db.on("FROM calendars", [{"calendar_id": 1}])
+    etag = client.get("/api/calendars?user_num=7").headers["ETag"]
+
+    created = client.post("/api/calendars", json={"user_num": 7, "calendar_name": "운동"})
+    after = client.get("/api/calendars?user_num=7", headers={"If-None-Match": etag})
+    assert created.status_code == 201
+    assert after.status_code == 200
+    assert after.headers["ETag"] != etag
+
+
+def test_query_params_are_part_of_etag(client, db, versions):
+    db.on("FROM calendars", [])
+    a = client.get("/api/calendars?user_num=7").headers["ETag"]
+    b = client.get("/api/calendars?user_num=8").headers["ETag"]
+    assert a != b
@@ -0,0 +1,85 @@
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from schedule_index import ScheduleIndex, nearest_schedule, schedule_bounds, window_schedules
+
+TODAY = date(2025, 10, 15)
+
+
+def random_schedules(seed, count=200):
+    rng = random.Random(seed)
+    schedules = []
+    for n in range(count):
+        start = TODAY + timedelta(days=rng.randint(-10, 10))
+        end = start + timedelta(days=rng.choice([0, 0, 0, 1, 3]))
+        schedules.append({
+            "id": n,
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat(),
+            "start_time": rng.choice([None, "09:00:00", "14:30", timedelta(hours=20)]),
+            "end_time": rng.choice([None, "18:00:00"]),
+        })
+    return schedules
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_linear_scans_match_index(seed):
+    schedules = random_schedules(seed)
+    index = ScheduleIndex(schedules)
+
+    for within in (None, 0, 3):
+        assert nearest_schedule(schedules, TODAY, within) is index.nearest(TODAY, within)
+
+    at = datetime.combine(TODAY, datetime.min.time()) + timedelta(hours=12)
+    end = TODAY + timedelta(days=3)
+    ordered = sorted(schedules, key=lambda s: schedule_bounds(s)[0])
+    assert window_schedules(ordered, at, end) == index.window(at, end)
+
+
+def test_nearest_keeps_first_of_equal_starts():
+    schedules = [{"id": 1, "start_date": "2025-10-16"}, {"id": 2, "start_date": "2025-10-16"}]
+    assert nearest_schedule(schedules, TODAY)["id"] == 1
+    assert nearest_schedule(schedules, TODAY, within_days=0) is None
+
+
+@pytest.fixture
+def commentator(backend, monkeypatch):
+    from services import ServiceRegistry
+
+    seen = []
+
+    class FakeCommentator:
+        def generate_comment(self, schedules):
+            seen.append(schedules)
+            return "바쁜 한 주", {}
+
+    registry = ServiceRegistry()
+    registry.register("calendar_commentator", FakeCommentator)
+    monkeypatch.setattr(backend, "services", registry)
+    return seen
+
+
+def test_preview_filters_db_window_rows_in_order(client, db, backend, commentator):
+    token, _ = backend.session_tokens.issue(7)
+    today = date.today()
+    yesterday = (today - timedelta(days=1)).isoformat()
+    rows = [
+        # 날짜로는 오늘과 겹치지만 자정에 이미 끝난 일정
+        {"title": "끝난 야간 작업", "start_date": yesterday, "end_date": today.isoformat(),
+         "start_time": "22:00:00", "end_time": "00:00:00"},
+        {"title": "진행 중", "start_date": today.isoformat(), "end_date": today.isoformat(),
+         "start_time": "00:00:00", "end_time": "23:59:59"},
+    ]
+    db.on("FROM events", rows)
+
+    res = client.post("/api/ai-assistant/preview-event", json={"user_num": 7, "calendar_id": 1},
+                      headers={"Authorization": f"Bearer {token}"})
+
+    assert res.status_code == 200
+    assert res.get_json()["content"] == "바쁜 한 주"
+    assert [s["title"] for s in commentator[0]] == ["진행 중"]
+    # 기간 조건은 DB 쿼리에서 (인덱스로) 거름
+    sql = db.queries("FROM events")[0]
+    assert "start_date <=" in sql and "end_date >=" in sql
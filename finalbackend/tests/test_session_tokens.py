@@ -0,0 +1,106 @@
+import time
+
+import pytest
+
+from session_tokens import InvalidToken, SessionTokens
+
+
+@pytest.fixture
+def tokens():
+    return SessionTokens(secret="test-secret", ttl=60, revoked_capacity=2)
+
+
+def test_issue_and_verify(tokens):
+    token, claims = tokens.issue(7)
+    assert tokens.verify(token) == claims
+    assert claims["sub"] == 7 and claims["exp"] - claims["iat"] == 60
+
+
+@pytest.mark.parametrize("mangle, reason", [
+    (lambda t: t + "x", "signature"),
+    (lambda t: "A" + t[1:], "signature"),
+    (lambda t: t.replace(".", ""), "malformed"),
+    (lambda t: None, "malformed"),
+])
+def test_rejects_tampered_tokens(tokens, mangle, reason):
+    token, _ = tokens.issue(7)
+    with pytest.raises(InvalidToken) as e:
+        tokens.verify(mangle(token))
+    assert e.value.reason == reason
+
+
+def test_rejects_token_signed_with_other_secret(tokens):
+    token, _ = SessionTokens(secret="other").issue(7)
+    with pytest.raises(InvalidToken, match="signature"):
+        tokens.verify(token)
+
+
+def test_rejects_expired_token(tokens, monkeypatch):
+    token, claims = tokens.issue(7)
+    monkeypatch.setattr(time, "time", lambda: claims["exp"] + 1)
+    with pytest.raises(InvalidToken, match="expired"):
+        tokens.verify(token)
+
+
+def test_revoke_and_capacity(tokens):
+    issued = [tokens.issue(n) for n in range(3)]
+    for _, claims in issued:
+        tokens.revoke(claims)
+
+    # 폐기 목록은 최근 2개만 유지 (가장 오래된 항목이 밀려남)
+    with pytest.raises(InvalidToken, match="revoked"):
+        tokens.verify(issued[2][0])
+    assert tokens.verify(issued[0][0])["sub"] == 0
+    stats = tokens.stats()
+    assert (stats["revoked"], stats["evicted"], stats["revoked_size"]) == (3, 1, 2)
+
+
+# --- 라우트 ---
+
+@pytest.fixture
+def auth(backend):
+    token, _ = backend.session_tokens.issue(7)
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.parametrize("method, path, body", [
+    ("get", "/api/calendars?user_num=8", None),
+    ("get", "/api/user/8/events", None),
+    ("post", "/api/calendars", {"user_num": 8, "calendar_name": "남의 캘린더"}),
+    ("post", "/api/chat", {"message": "안녕", "user_num": 8}),
+    ("post", "/api/chat/stream", {"message": "안녕", "user_num": 8}),
+    ("post", "/api/events/bulk", {"calendar_id": 1, "events": [{"title": "a", "start_date": "2025-10-20",
+                                                                "user_num": 8}]}),
+    ("post", "/api/posts", {"user_id": 8, "calendar_num": 1, "post_title": "t", "post_content": "c"}),
+    ("post", "/api/calendars/invite", {"calendar_id": 1, "inviter_id": 8, "invitee_email": "a@b.c",
+                                       "role": "viewer"}),
+])
+def test_other_users_number_is_forbidden(client, db, auth, method, path, body):
+    res = getattr(client, method)(path, json=body, headers=auth)
+    assert res.status_code == 403
+    assert db.executed == []
+
+
+def test_own_user_number_is_allowed(client, db, auth):
+    res = client.post("/api/calendars", json={"user_num": 7, "calendar_name": "운동"}, headers=auth)
+    assert res.status_code == 201
+
+
+def test_invalid_token_is_rejected(client, db):
+    res = client.get("/api/calendars?user_num=7", headers={"Authorization": "Bearer nope.nope"})
+    assert res.status_code == 401
+
+
+@pytest.mark.parametrize("value", ["null", "undefined"])
+def test_placeholder_token_counts_as_absent(client, db, value):
+    res = client.get("/api/calendars?user_num=7", headers={"Authorization": f"Bearer {value}"})
+    assert res.status_code == 200
+
+
+def test_logout_revokes_token(client, db, auth):
+    assert client.get("/api/session", headers=auth).get_json()["user_num"] == 7
+    assert client.post("/logout", headers=auth).status_code == 200
+
+    res = client.get("/api/session", headers=auth)
+    assert res.status_code == 401
+    assert "revoked" in res.get_json()["message"]
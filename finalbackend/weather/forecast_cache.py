@@ -0,0 +1,259 @@
+"""
+기상청 단기예보(VilageFcst) 캐시와 백그라운드 선조회
+
+단기예보는 하루 8번(02, 05, 08, 11, 14, 17, 20, 23시) 발표되고
+API에는 발표 시각 약 10분 뒤부터 올라옵니다. 그 사이에는 같은 격자(nx, ny)에
+대한 응답이 바뀌지 않으므로 (nx, ny, base_date, base_time) 단위로 캐시하고,
+다음 발표 시각이 되면 만료시킵니다.
+
+ForecastPrefetcher는 최근에 조회된 격자(hot grid)를 발표 직후에 미리 받아 두어
+사용자 요청이 apis.data.go.kr 응답을 기다리지 않게 합니다.
+
+조회가 실패하면 직전 발표분을 대신 돌려주되, 만료된 지 max_stale(초)이 지난 스냅샷은 쓰지 않습니다.
+그때는 오류를 로그로 남기고 None을 돌려줍니다. (며칠 전 예보로 조언을 만들지 않도록)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+KST = timezone(timedelta(hours=9))
+
+BASE_HOURS = (2, 5, 8, 11, 14, 17, 20, 23)
+PUBLISH_DELAY = timedelta(minutes=10)   # 발표 시각 → API 제공 시각
+
+
+def now_kst() -> datetime:
+    return datetime.now(KST)
+
+
+def _to_kst(now):
+    if now is None:
+        return now_kst()
+    if now.tzinfo is None:
+        return now.replace(tzinfo=KST)
+    return now.astimezone(KST)
+
+
+def latest_slot(now=None) -> datetime:
+    """now 시점에 API로 받을 수 있는 가장 최근 발표 시각"""
+    available = _to_kst(now) - PUBLISH_DELAY
+    for hour in reversed(BASE_HOURS):
+        if available.hour >= hour:
+            return available.replace(hour=hour, minute=0, second=0, microsecond=0)
+    previous_day = available - timedelta(days=1)
+    return previous_day.replace(hour=BASE_HOURS[-1], minute=0, second=0, microsecond=0)
+
+
+def next_slot(slot: datetime) -> datetime:
+    """slot 다음 발표 시각"""
+    for hour in BASE_HOURS:
+        if hour > slot.hour:
+            return slot.replace(hour=hour, minute=0, second=0, microsecond=0)
+    next_day = slot + timedelta(days=1)
+    return next_day.replace(hour=BASE_HOURS[0], minute=0, second=0, microsecond=0)
+
+
+def next_publication(now=None) -> datetime:
+    """다음 발표분이 API에 올라오는 시각"""
+    return next_slot(latest_slot(now)) + PUBLISH_DELAY
+
+
+def slot_params(slot: datetime):
+    """발표 시각 → (base_date, base_time) 문자열"""
+    return slot.strftime("%Y%m%d"), slot.strftime("%H%M")
+
+
+class ForecastCache:
+    """
+    격자별 최신 예보 스냅샷 캐시
+
+    Args:
+        fetch: fetch(nx, ny, base_date, base_time) -> 예보 item 리스트
+        max_grids: 보관할 최대 격자 수 (넘으면 가장 오래 안 쓴 격자부터 제거)
+        hot_window: 이 시간(초) 안에 조회된 격자를 선조회 대상으로 봄
+        max_stale: 조회 실패 시 만료 후 이 시간(초)까지만 직전 스냅샷을 대신 사용
+    """
+
+    def __init__(self, fetch, max_grids: int = 64, hot_window: float = 6 * 3600,
+                 max_stale: float = 3 * 3600):
+        self._fetch = fetch
+        self.max_grids = max_grids
+        self.hot_window = hot_window
+        self.max_stale = max_stale
+        self._lock = threading.Lock()
+        # (nx, ny) -> {"key", "expires_at", "items"}
+        self._entries = OrderedDict()
+        self._last_access = {}     # (nx, ny) -> time.monotonic()
+        self._inflight = {}        # key -> threading.Lock (같은 키를 한 번만 조회)
+        self._stats = {"hits": 0, "misses": 0, "fetches": 0, "fetch_errors": 0,
+                       "stale_served": 0, "stale_rejected": 0, "unavailable": 0, "prefetched": 0}
+
+    def _fresh(self, grid, key, now):
+        entry = self._entries.get(grid)
+        if entry and entry["key"] == key and now < entry["expires_at"]:
+            self._entries.move_to_end(grid)
+            return entry["items"]
+        return None
+
+    def _load(self, nx, ny, now, prefetch=False):
+        grid = (nx, ny)
+        slot = latest_slot(now)
+        base_date, base_time = slot_params(slot)
+        key = (nx, ny, base_date, base_time)
+
+        with self._lock:
+            if not prefetch:
+                self._last_access[grid] = time.monotonic()
+            items = self._fresh(grid, key, now)
+            if items is not None:
+                if not prefetch:
+                    self._stats["hits"] += 1
+                return items, False
+            if not prefetch:
+                self._stats["misses"] += 1
+            key_lock = self._inflight.setdefault(key, threading.Lock())
+
+        # 같은 키를 동시에 요청하면 한 번만 조회하고 나머지는 결과를 기다림
+        with key_lock:
+            with self._lock:
+                items = self._fresh(grid, key, now)
+            if items is not None:
+                return items, False
+
+            try:
+                items = self._fetch(nx, ny, base_date, base_time)
+            except Exception as e:
+                with self._lock:
+                    self._stats["fetch_errors"] += 1
+                    self._inflight.pop(key, None)
+                    if prefetch:
+                        raise
+                    stale = self._entries.get(grid)
+                    if stale is not None:
+                        if (now - stale["expires_at"]).total_seconds() <= self.max_stale:
+                            # 발표 직후 아직 자료가 없거나 API 오류 → 직전 발표분 사용
+                            self._stats["stale_served"] += 1
+                            return stale["items"], False
+                        # 너무 오래된 예보는 버림
+                        del self._entries[grid]
+                        self._stats["stale_rejected"] += 1
+                    self._stats["unavailable"] += 1
+                print(f"⚠️ 예보 조회 실패 ({nx}, {ny}, {base_date} {base_time}): {e}")
+                return None, False
+
+            with self._lock:
+                self._stats["fetches"] += 1
+                if prefetch:
+                    self._stats["prefetched"] += 1
+                self._entries[grid] = {
+                    "key": key,
+                    "expires_at": next_slot(slot) + PUBLISH_DELAY,
+                    "items": items,
+                }
+                self._entries.move_to_end(grid)
+                while len(self._entries) > self.max_grids:
+                    old_grid, _ = self._entries.popitem(last=False)
+                    self._last_access.pop(old_grid, None)
+                self._inflight.pop(key, None)
+            return items, True
+
+    def get(self, nx, ny, now=None):
+        """
+        현재 발표분 예보 item 리스트 (캐시에 없으면 조회).
+        조회에 실패했고 max_stale 안의 직전 스냅샷도 없으면 None.
+        """
+        items, _ = self._load(nx, ny, _to_kst(now))
+        return items
+
+    def refresh(self, nx, ny, now=None) -> bool:
+        """현재 발표분을 미리 받아 둠. 새로 받았으면 True"""
+        _, fetched = self._load(nx, ny, _to_kst(now), prefetch=True)
+        return fetched
+
+    def hot_grids(self) -> list:
+        """hot_window 안에 사용자 요청이 있었던 격자 목록"""
+        cutoff = time.monotonic() - self.hot_window
+        with self._lock:
+            return [grid for grid, at in self._last_access.items() if at >= cutoff]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._last_access.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            data = dict(self._stats)
+            lookups = data["hits"] + data["misses"]
+            data["hit_ratio"] = round(data["hits"] / lookups, 4) if lookups else 0.0
+            data["grids"] = len(self._entries)
+            data["max_stale"] = self.max_stale
+            data["snapshots"] = {
+                f"{nx},{ny}": "/".join(entry["key"][2:])
+                for (nx, ny), entry in self._entries.items()
+            }
+        return data
+
+
+class ForecastPrefetcher:
+    """
+    발표 시각마다 hot grid의 예보를 미리 받아 두는 데몬 스레드
+
+    Args:
+        cache: ForecastCache
+        delay: API 제공 시각 이후 추가로 기다릴 시간(초)
+        retry_interval: 자료가 아직 없을 때 다시 시도할 간격(초)
+        max_retries: 발표분마다 최대 재시도 횟수
+    """
+
+    def __init__(self, cache: ForecastCache, delay: float = 30.0,
+                 retry_interval: float = 60.0, max_retries: int = 5):
+        self.cache = cache
+        self.delay = delay
+        self.retry_interval = retry_interval
+        self.max_retries = max_retries
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats = {"runs": 0, "refreshed": 0, "failures": 0, "last_run": None}
+
+    def run_once(self, now=None) -> list:
+        """hot grid를 한 번 갱신하고 실패한 격자 목록을 반환"""
+        failed = []
+        for nx, ny in self.cache.hot_grids():
+            try:
+                if self.cache.refresh(nx, ny, now):
+                    self._stats["refreshed"] += 1
+            except Exception as e:
+                print(f"⚠️ 예보 선조회 실패 ({nx}, {ny}): {e}")
+                self._stats["failures"] += 1
+                failed.append((nx, ny))
+        self._stats["runs"] += 1
+        self._stats["last_run"] = now_kst().isoformat(timespec="seconds")
+        return failed
+
+    def _loop(self):
+        while not self._stop.is_set():
+            wake_at = next_publication() + timedelta(seconds=self.delay)
+            if self._stop.wait(max(0.0, (wake_at - now_kst()).total_seconds())):
+                break
+            for _ in range(self.max_retries + 1):
+                if not self.run_once() or self._stop.wait(self.retry_interval):
+                    break
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="forecast-prefetch", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def stats(self) -> dict:
+        data = dict(self._stats)
+        data["running"] = bool(self._thread and self._thread.is_alive())
+        data["next_publication"] = next_publication().isoformat(timespec="seconds")
+        return data
@@ -1,80 +1,175 @@
-import requests
-import pandas as pd
-from datetime import datetime, timedelta
-import openai
-import os
-import requests
-import pandas as pd
-from datetime import datetime, timedelta
+from datetime import timedelta
 import openai
 import os
+import threading
+from ant_chat_gpt.common.cache import LRUCache, make_key
+from ant_chat_gpt.common.http_client import get_session
+from weather.forecast_cache import ForecastCache, ForecastPrefetcher, now_kst
 # from dotenv import load_dotenv # Removed
 
 # load_dotenv() # Removed
 
+SKY_MAP = {'1': '맑음', '3': '구름 많음', '4': '흐림'}
+PTY_MAP = {'0': '강수 없음', '1': '비', '2': '비/눈', '3': '눈', '4': '소나기'}
+
+# 예보를 받을 수 없을 때 돌려줄 안내 문구
+UNAVAILABLE_COMMENT = "지금은 날씨 예보를 가져올 수 없어요. 잠시 후 다시 확인해 주세요."
+
+# 요약에 쓰는 예보 항목 (기온, 하늘상태, 강수형태, 강수확률)
+SUMMARY_CATEGORIES = ('TMP', 'SKY', 'PTY', 'POP')
+
+
+def pivot_forecast(items, fcst_date=None):
+    """
+    기상청 예보 item 목록을 한 번만 훑어 {fcstTime: {category: fcstValue}}로 모읍니다.
+    fcst_date를 주면 그 날짜(YYYYMMDD)의 예보만 남깁니다.
+    """
+    pivot = {}
+    for item in items:
+        if fcst_date is not None and item.get('fcstDate') != fcst_date:
+            continue
+        category = item.get('category')
+        if category not in SUMMARY_CATEGORIES or not item.get('fcstTime'):
+            continue
+        slot = pivot.setdefault(item.get('fcstTime'), {})
+        # 같은 시각/항목이 여러 번 오면 처음 값 사용
+        slot.setdefault(category, item.get('fcstValue'))
+    return pivot
+
+
+def summarize_forecast(pivot):
+    """pivot_forecast() 결과를 시각 순 요약 문장 목록으로 변환 (항목이 빠진 시각은 건너뜀)"""
+    lines = []
+    for time in sorted(pivot):
+        values = pivot[time]
+        if any(c not in values for c in SUMMARY_CATEGORIES):
+            continue
+        line = f"{int(time[:2])}시에는 기온 {values['TMP']}도, {SKY_MAP.get(values['SKY'], '알 수 없음')}, "
+        line += f"{PTY_MAP.get(values['PTY'], '알 수 없음')} (강수확률 {values['POP']}%)입니다."
+        lines.append(line)
+    return lines
+
+
 class WeatherCommentator:
-    def __init__(self, model="gpt-4o-mini"):
+    FORECAST_URL = "http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getVilageFcst"
+
+    # 프롬프트를 바꾸면 버전을 올려서 이전 조언 캐시를 무효화
+    ADVICE_PROMPT_VERSION = 1
+    TITLE_PROMPT_VERSION = 1
+
+    def __init__(self, model="gpt-4o-mini", nx=55, ny=127, forecast_cache=None, advice_cache=None):
         self.model = model
         # Hardcoded keys for debugging - NOT FOR PRODUCTION
-        self.kma_key = "YOUR_KMA_API_KEY_HERE" # Replace with your actual KMA API Key
-        
+        self.kma_key = os.getenv("KMA_API_KEY", "YOUR_KMA_API_KEY_HERE") # Replace with your actual KMA API Key
+        self.openai_key = os.getenv("OPENAI_API_KEY")
+        self.nx = nx
+        self.ny = ny
+        # (nx, ny, base_date, base_time) 단위 예보 캐시 - 다음 발표 시각에 만료
+        # 조회 실패 시 직전 발표분은 WEATHER_FORECAST_MAX_STALE(초)까지만 대신 사용
+        self.forecast_cache = forecast_cache or ForecastCache(
+            self.fetch_forecast_items, max_stale=float(os.getenv("WEATHER_FORECAST_MAX_STALE", "10800")))
+        self.prefetcher = None
+        # 같은 예보 요약(같은 격자, 같은 발표분)이면 조언/제목을 다시 생성하지 않음
+        self.advice_cache = advice_cache if advice_cache is not None else LRUCache(
+            max_size=256, ttl=float(os.getenv("WEATHER_ADVICE_TTL", "21600")))
+        self._memo_lock = threading.Lock()
+        self._memo_inflight = {}
+        self._memo_stats = {"requests": 0, "llm_calls": 0}
+
         # # Removed ValueError checks
         self.client = openai.OpenAI(api_key=self.openai_key)
 
-    def fetch_tomorrow_weather(self):
-        """기상청 API로 내일 날씨 예보 데이터를 가져옵니다."""
-        base_date = datetime.today().strftime("%Y%m%d")
-        url = "http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getVilageFcst"
-
+    def fetch_forecast_items(self, nx, ny, base_date, base_time):
+        """기상청 API에서 한 발표분(base_date, base_time)의 격자 예보 item 목록을 가져옵니다."""
         params = {
             'serviceKey': self.kma_key,
-            'numOfRows': '700',
+            'numOfRows': '1000',
             'pageNo': '1',
             'dataType': 'JSON',
             'base_date': base_date,
-            'base_time': '0800',
-            'nx': '55',
-            'ny': '127'
+            'base_time': base_time,
+            'nx': str(nx),
+            'ny': str(ny)
         }
 
-        response = requests.get(url, params=params)
+        # 공용 keep-alive 세션 (apis.data.go.kr 연결 재사용, 재시도, 기본 timeout)
+        response = get_session().get(self.FORECAST_URL, params=params)
         response.raise_for_status()
         data = response.json()
-        items = data['response']['body']['items']['item']
-        df = pd.DataFrame(items)
+        return data['response']['body']['items']['item']
+
+    def fetch_tomorrow_weather(self):
+        """
+        기상청 API로 내일 날씨 예보 item 목록을 가져옵니다. (발표분 단위로 캐시)
+        예보를 받을 수 없으면 None.
+        """
+        items = self.forecast_cache.get(self.nx, self.ny)
+        if items is None:
+            return None
 
         # 내일 날씨 기준 필터링
-        tomorrow = datetime.today() + timedelta(days=1)
+        tomorrow = now_kst() + timedelta(days=1)
         tomorrow_str = tomorrow.strftime("%Y%m%d")
-        df_tomorrow = df[df['fcstDate'] == tomorrow_str]
-        return df_tomorrow.reset_index(drop=True)
-
-    def summarize_weather(self, df):
-        """기상청 예보 데이터프레임을 요약 텍스트로 변환합니다."""
-        grouped = df.groupby('fcstTime')
-        summary_lines = []
-
-        sky_map = {'1': '맑음', '3': '구름 많음', '4': '흐림'}
-        pty_map = {'0': '강수 없음', '1': '비', '2': '비/눈', '3': '눈', '4': '소나기'}
-
-        for time, group in grouped:
-            try:
-                time_kor = f"{int(time[:2])}시"
-                tmp = group[group['category'] == 'TMP']['fcstValue'].values[0]
-                sky = group[group['category'] == 'SKY']['fcstValue'].values[0]
-                pty = group[group['category'] == 'PTY']['fcstValue'].values[0]
-                pop = group[group['category'] == 'POP']['fcstValue'].values[0]
-
-                line = f"{time_kor}에는 기온 {tmp}도, {sky_map.get(sky, '알 수 없음')}, "
-                line += f"{pty_map.get(pty, '알 수 없음')} (강수확률 {pop}%)입니다."
-                summary_lines.append(line)
-            except IndexError:
-                continue
-
-        return "내일의 주요 날씨 요약:\n" + "\n".join(summary_lines)
+        return [item for item in items if item.get('fcstDate') == tomorrow_str]
+
+    def start_prefetcher(self, **kwargs):
+        """최근 조회된 격자를 발표 직후마다 미리 받아 두는 백그라운드 스레드 시작"""
+        if self.prefetcher is None:
+            self.prefetcher = ForecastPrefetcher(self.forecast_cache, **kwargs)
+        return self.prefetcher.start()
+
+    def get_forecast_stats(self):
+        """예보 캐시/선조회 지표"""
+        data = {"cache": self.forecast_cache.stats()}
+        if self.prefetcher is not None:
+            data["prefetcher"] = self.prefetcher.stats()
+        return data
+
+    def summarize_weather(self, items):
+        """기상청 예보 item 목록을 한 번 훑어 요약 텍스트로 변환합니다."""
+        if hasattr(items, 'to_dict'):
+            # 예전처럼 DataFrame을 넘겨도 동작하도록
+            items = items.to_dict('records')
+        lines = summarize_forecast(pivot_forecast(items))
+        return "내일의 주요 날씨 요약:\n" + "\n".join(lines)
+
+    def _memoized(self, template, version, text, compute):
+        """
+        (모델, 프롬프트 버전, 입력 텍스트 해시) 단위로 GPT 결과를 재사용합니다.
+        같은 키를 동시에 요청하면 한 번만 생성하고 나머지는 그 결과를 씁니다.
+        compute()가 None을 돌려주면 캐시하지 않습니다.
+        """
+        key = make_key(self.model, template, version, text, "")
+        with self._memo_lock:
+            self._memo_stats["requests"] += 1
+        cached = self.advice_cache.get(key)
+        if cached is not None:
+            return cached
+
+        with self._memo_lock:
+            key_lock = self._memo_inflight.setdefault(key, threading.Lock())
+        try:
+            with key_lock:
+                cached = self.advice_cache.get(key)
+                if cached is not None:
+                    return cached
+                with self._memo_lock:
+                    self._memo_stats["llm_calls"] += 1
+                value = compute()
+                if value is not None:
+                    self.advice_cache.set(key, value)
+                return value
+        finally:
+            with self._memo_lock:
+                if self._memo_inflight.get(key) is key_lock:
+                    del self._memo_inflight[key]
 
     def generate_advice(self, summary_text):
-        """요약된 날씨 정보를 기반으로 GPT가 간단한 조언을 생성합니다."""
+        """요약된 날씨 정보를 기반으로 GPT가 간단한 조언을 생성합니다. (요약별로 캐시)"""
+        return self._memoized("weather_advice", self.ADVICE_PROMPT_VERSION, summary_text,
+                              lambda: self._generate_advice(summary_text))
+
+    def _generate_advice(self, summary_text):
         prompt = f"""
         다음은 내일의 날씨 예보 요약입니다:\n\n{summary_text}\n\n
         이 정보를 기반으로 사용자에게 간단한 한마디 조언을 해줘.
@@ -93,8 +188,11 @@ class WeatherCommentator:
 
     def generate_comment(self, date_str=None):
         """전체 프로세스를 실행하여 내일 날씨 조언을 반환합니다."""
-        df = self.fetch_tomorrow_weather()
-        summary = self.summarize_weather(df)
+        items = self.fetch_tomorrow_weather()
+        if items is None:
+            # 오래된 예보로 조언을 만들지 않음 (GPT도 호출하지 않음)
+            return UNAVAILABLE_COMMENT
+        summary = self.summarize_weather(items)
         advice = self.generate_advice(summary)
         return advice
 
@@ -102,6 +200,12 @@ class WeatherCommentator:
         if not content:
             return "날씨 정보"
 
+        title = self._memoized("weather_title", self.TITLE_PROMPT_VERSION, content,
+                               lambda: self._generate_title(content))
+        return title or "날씨 정보"
+
+    def _generate_title(self, content):
+        """실패하면 None (기본 제목은 캐시하지 않음)"""
         prompt = f'''
 다음은 AI가 생성한 날씨 조언입니다. 이 조언에 대한 2-3단어의 간결한 제목을 만들어주세요. 제목만 반환하고, 따옴표는 제거해주세요.
 예를 들어, "우산 챙기세요" 라는 조언에는 "비 소식" 또는 "우산 준비" 같은 제목이 좋습니다.
@@ -120,8 +224,16 @@ class WeatherCommentator:
                 temperature=0.5
             )
             title = response.choices[0].message.content.strip().replace('"', '')
-            return title if title else "날씨 정보"
+            return title or None
 
         except Exception as e:
             print(f"⚠️ Weather title generation failed: {str(e)}")
-            return "날씨 정보"
+            return None
+
+    def get_advice_stats(self):
+        """조언/제목 캐시 지표 (요청 수 대비 실제 GPT 호출 수)"""
+        with self._memo_lock:
+            data = dict(self._memo_stats)
+        data["llm_calls_saved"] = data["requests"] - data["llm_calls"]
+        data["cache"] = self.advice_cache.stats()
+        return data